@@ -0,0 +1,99 @@
+"""
+Format benchmark: file size, write time and load time per storage backend.
+
+Each backend encodes the same records and writes them atomically to a
+temporary file, then the file is read back and decoded. The JSON rows
+use the default indented format; "json-compact" disables indentation
+to show how much of the difference is whitespace alone.
+
+Usage:
+    python benchmarks/backends.py --records 10000 100000 1000000
+"""
+
+import argparse
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from pydantic_storage._services import BinaryBackend, JsonBackend
+from pydantic_storage._utils import atomic_write
+from pydantic_storage.abstractions import BaseBackend
+from pydantic_storage.models import FileData, FileMetaData, Storage
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    email: str
+    age: int
+    active: bool
+
+
+BACKENDS: dict[str, Any] = {
+    "json": JsonBackend,
+    "json-compact": partial(JsonBackend, indent=None),
+    "binary": BinaryBackend,
+}
+
+
+def make_data(records: int) -> FileData[User]:
+    return FileData[User](
+        metadata=FileMetaData(
+            title="Users",
+            description="Backend benchmark",
+            storage=Storage(type="file", encryption="none"),
+        ),
+        records={
+            i: User(
+                id=i,
+                name=f"user{i}",
+                email=f"user{i}@example.com",
+                age=i % 90,
+                active=i % 2 == 0,
+            )
+            for i in range(1, records + 1)
+        },
+    )
+
+
+def measure(
+    backend: BaseBackend[User], data: FileData[User], path: Path
+) -> tuple[int, float, float]:
+    start = time.perf_counter()
+    atomic_write(path, backend.encode(data), "none")
+    write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    backend.decode(path.read_bytes())
+    load = time.perf_counter() - start
+    return path.stat().st_size, write, load
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--records", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'records':>9} {'backend':<13} {'size MiB':>9} {'write s':>8} {'load s':>8}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for records in args.records:
+            data = make_data(records)
+            for name, backend_class in BACKENDS.items():
+                backend = backend_class(User)
+                size, write, load = measure(backend, data, Path(directory) / name)
+                print(
+                    f"{records:>9} {name:<13} {size / 2**20:>9.2f}"
+                    f" {write:>8.3f} {load:>8.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Cold-open benchmark: time to open an existing store, by file size.
+
+A store is written once per size and backend, then opened again. Opening
+reads and validates the metadata only, so it takes the same time
+whatever the number of records; the records are loaded by the first
+query. The "load+rewrite" column times what opening used to do: parse
+every record and write the whole file back to bump its timestamp.
+
+Usage:
+    python benchmarks/cold_open.py --records 10000 100000 1000000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from pydantic_storage._services import BinaryBackend, FileStorage, JsonBackend
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    email: str
+    age: int
+    active: bool
+
+
+METADATA = {"version": "1.0.0", "title": "Users", "description": "Benchmark"}
+
+
+def open_storage(path: Path, backend: type) -> FileStorage[User]:
+    return FileStorage[User](str(path), User, METADATA, backend=backend)
+
+
+def write_store(path: Path, backend: type, records: int) -> None:
+    with open_storage(path, backend) as storage:
+        storage.manager.write(
+            {
+                i: User(
+                    id=i,
+                    name=f"user{i}",
+                    email=f"user{i}@example.com",
+                    age=i % 90,
+                    active=i % 2 == 0,
+                )
+                for i in range(1, records + 1)
+            }
+        )
+
+
+def measure(path: Path, backend: type) -> tuple[float, float, float]:
+    start = time.perf_counter()
+    storage = open_storage(path, backend)
+    opened = time.perf_counter() - start
+
+    start = time.perf_counter()
+    storage.get(name="user1")
+    first_query = time.perf_counter() - start
+
+    start = time.perf_counter()
+    manager = storage.manager
+    manager.save(manager.load())
+    rewrite = time.perf_counter() - start
+    storage.close()
+    return opened, first_query, rewrite
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--records", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'backend':<8} {'records':>9} {'MB':>7} {'open ms':>8}"
+        f" {'1st query s':>11} {'load+rewrite s':>14}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for name, backend in [("json", JsonBackend), ("binary", BinaryBackend)]:
+            for records in args.records:
+                path = Path(directory) / f"{name}-{records}"
+                write_store(path, backend, records)
+                size = path.stat().st_size / 2**20
+                opened, first_query, rewrite = measure(path, backend)
+                print(
+                    f"{name:<8} {records:>9} {size:>7.1f} {opened * 1000:>8.2f}"
+                    f" {first_query:>11.2f} {rewrite:>14.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
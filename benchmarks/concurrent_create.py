@@ -0,0 +1,104 @@
+"""
+Stress benchmark: several processes insert into one FileStorage at once.
+
+Every worker opens its own FileStorage on the same file and creates
+records in small batches. At the end the file must hold exactly
+``processes * records`` records with distinct ids, i.e. no insert was
+lost to a concurrent read-modify-write.
+
+Usage:
+    python benchmarks/concurrent_create.py --processes 8 --records 200
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from pydantic_storage._services import FileStorage
+from pydantic_storage.types import StorageMode
+
+
+class User(BaseModel):
+    worker: int
+    seq: int
+    email: str
+
+
+def open_storage(file_path: str, mode: StorageMode) -> FileStorage[User]:
+    return FileStorage[User](
+        file_path=file_path,
+        model_class=User,
+        metadata={
+            "version": "1.0.0",
+            "title": "Concurrent users",
+            "description": "Concurrent create benchmark",
+        },
+        mode=mode,
+        durability="none",
+        lock_timeout=None,
+    )
+
+
+def insert(
+    file_path: str,
+    mode: StorageMode,
+    worker: int,
+    records: int,
+    batch: int,
+) -> None:
+    storage = open_storage(file_path, mode)
+    for start in range(0, records, batch):
+        storage.create(
+            [
+                User(worker=worker, seq=seq, email=f"w{worker}-{seq}@example.com")
+                for seq in range(start, min(start + batch, records))
+            ]
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--records", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument("--mode", choices=["snapshot", "wal"], default="snapshot")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = str(Path(directory) / "users.json")
+        open_storage(file_path, args.mode)
+
+        started = time.perf_counter()
+        workers = [
+            multiprocessing.Process(
+                target=insert,
+                args=(file_path, args.mode, worker, args.records, args.batch),
+            )
+            for worker in range(args.processes)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+        records = open_storage(file_path, args.mode).manager.read().records
+        expected = args.processes * args.records
+        inserted = {(user.worker, user.seq) for user in records.values()}
+
+        print(f"mode:      {args.mode}")
+        print(f"processes: {args.processes}")
+        print(f"expected:  {expected}")
+        print(f"stored:    {len(records)} ({len(inserted)} distinct)")
+        print(f"elapsed:   {elapsed:.2f}s ({expected / elapsed:.0f} inserts/s)")
+        if len(records) != expected or len(inserted) != expected:
+            raise SystemExit("FAILED: records were lost or duplicated")
+        print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Memory benchmark: resident size of loaded records, models versus compact rows.
+
+A file of records is written once per backend, then loaded with the
+default representation (a dict of models) and with compact_records (a
+tuple of field values per record). tracemalloc reports the memory the
+loaded records hold on to and the peak reached while loading; the load
+and a full scan are timed as well, since compact records build a model
+for every record a scan looks at.
+
+Usage:
+    python benchmarks/memory.py --records 1000000
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from pydantic_storage._services import BinaryBackend, FileManager, JsonBackend
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    email: str
+    age: int
+    active: bool
+
+
+METADATA = {"version": "1.0.0", "title": "Users", "description": "Benchmark"}
+
+
+def write_file(path: Path, backend: type, records: int) -> None:
+    with FileManager[User](str(path), User, METADATA, backend=backend) as manager:
+        manager.write(
+            {
+                i: User(
+                    id=i,
+                    name=f"user{i}",
+                    email=f"user{i}@example.com",
+                    age=i % 90,
+                    active=i % 2 == 0,
+                )
+                for i in range(1, records + 1)
+            }
+        )
+
+
+def measure(path: Path, backend: type, compact: bool) -> tuple[int, int, float, float]:
+    manager = FileManager[User](
+        str(path), User, METADATA, backend=backend, compact_records=compact
+    )
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = manager.read()
+    load = time.perf_counter() - start
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    sum(1 for record in data.records.values() if record.age == 42)
+    scan = time.perf_counter() - start
+    manager.close()
+    return held, peak, load, scan
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'backend':<8} {'records':<8} {'held MB':>8} {'B/record':>9}"
+        f" {'peak MB':>8} {'load s':>7} {'scan s':>7}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for name, backend in [("json", JsonBackend), ("binary", BinaryBackend)]:
+            path = Path(directory) / name
+            write_file(path, backend, args.records)
+            for compact in [False, True]:
+                held, peak, load, scan = measure(path, backend, compact)
+                print(
+                    f"{name:<8} {'compact' if compact else 'models':<8}"
+                    f" {held / 2**20:>8.1f} {held / args.records:>9.0f}"
+                    f" {peak / 2**20:>8.1f} {load:>7.2f} {scan:>7.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
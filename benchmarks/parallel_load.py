@@ -0,0 +1,95 @@
+"""
+Parallel benchmark: load and filter time by number of validation workers.
+
+A file of records is written once per backend, then loaded and filtered
+with the cache off, first serially and then with each worker count.
+Filtering validates and matches chunks on the workers and only sends
+the matches back. Loads are split across workers on free-threaded
+builds only, since processes would pickle every record back; with the
+GIL the load column stays serial.
+
+Usage:
+    python benchmarks/parallel_load.py --records 1000000 --workers 2 4 8
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from pydantic_storage._services import BinaryBackend, FileManager, JsonBackend, Query
+from pydantic_storage._utils import gil_enabled
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    email: str
+    age: int
+    active: bool
+
+
+METADATA = {"version": "1.0.0", "title": "Users", "description": "Benchmark"}
+
+
+def write_file(path: Path, backend: type, records: int) -> None:
+    with FileManager[User](str(path), User, METADATA, backend=backend) as manager:
+        manager.write(
+            {
+                i: User(
+                    id=i,
+                    name=f"user{i}",
+                    email=f"user{i}@example.com",
+                    age=i % 90,
+                    active=i % 2 == 0,
+                )
+                for i in range(1, records + 1)
+            }
+        )
+
+
+def measure(path: Path, backend: type, workers: int | None) -> tuple[float, float]:
+    query: Query[User] = Query({"age": 42, "active": True})
+    with FileManager[User](
+        str(path), User, METADATA, cache=False, backend=backend, workers=workers
+    ) as manager:
+        # Start the pool outside the measurement
+        if workers:
+            manager.scan_parallel(query.matches)
+
+        start = time.perf_counter()
+        manager.read()
+        load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if workers:
+            manager.scan_parallel(query.matches)
+        else:
+            [record for _, record in manager.iter_records() if query.matches(record)]
+        scan = time.perf_counter() - start
+    return load, scan
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    args = parser.parse_args()
+
+    pool = "processes" if gil_enabled() else "threads"
+    print(f"{os.cpu_count()} cores, workers are {pool}")
+    print(f"{'backend':<8} {'workers':>8} {'load s':>8} {'filter s':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, backend in [("json", JsonBackend), ("binary", BinaryBackend)]:
+            path = Path(directory) / name
+            write_file(path, backend, args.records)
+            for workers in [None, *args.workers]:
+                load, scan = measure(path, backend, workers)
+                print(f"{name:<8} {workers or 'serial':>8} {load:>8.3f} {scan:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
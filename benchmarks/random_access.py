@@ -0,0 +1,82 @@
+"""
+Random access benchmark: reading single records by id from a large file.
+
+A binary storage file is written once, then records are fetched by id
+with the cache off. The offset index is built on the first lookup; later
+lookups binary-search the memory-mapped index and validate only the
+record asked for. The "full load" row decodes the whole file instead,
+which is what every uncached read had to do before.
+
+Usage:
+    python benchmarks/random_access.py --records 100000 1000000 --reads 1000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from pydantic_storage._services import BinaryBackend, FileManager
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    email: str
+    age: int
+    active: bool
+
+
+METADATA = {"version": "1.0.0", "title": "Users", "description": "Benchmark"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--records", type=int, nargs="+", default=[100_000, 1_000_000]
+    )
+    parser.add_argument("--reads", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'records':>9} {'full load s':>12} {'index build s':>14} {'read us':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for records in args.records:
+            path = Path(directory) / f"users-{records}.bin"
+            with FileManager[User](
+                str(path), User, METADATA, cache=False, backend=BinaryBackend
+            ) as manager:
+                manager.write(
+                    {
+                        i: User(
+                            id=i,
+                            name=f"user{i}",
+                            email=f"user{i}@example.com",
+                            age=i % 90,
+                            active=i % 2 == 0,
+                        )
+                        for i in range(1, records + 1)
+                    }
+                )
+
+                start = time.perf_counter()
+                manager.read()
+                full_load = time.perf_counter() - start
+
+                start = time.perf_counter()
+                manager.read_record(1)
+                build = time.perf_counter() - start
+
+                ids = random.sample(range(1, records + 1), min(args.reads, records))
+                start = time.perf_counter()
+                for record_id in ids:
+                    manager.read_record(record_id)
+                read = (time.perf_counter() - start) / len(ids)
+
+            print(f"{records:>9} {full_load:>12.3f} {build:>14.3f} {read * 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Benchmark suite: FileStorage operations across data sizes, backends and caching.
+
+For every backend, cache setting and number of records, a store is
+filled with bulk creates and each operation is timed on it: create
+(single and bulk), get, filter, exists, count, update, delete, clear
+and cold open. Every operation runs --repeat times; a run calls it as
+often as fits in --budget seconds, at least once, and reports the time
+per call. Arguments are prepared outside the timed calls.
+
+Results are printed as a table and, with --output, written as JSON keyed
+by "operation/backend/cache/records". Passing a file written earlier as
+--baseline compares the medians against it and exits with status 1 if
+any operation got slower than --tolerance allows.
+
+Usage:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --records 1000 10000 --baseline results.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+import pydantic
+from pydantic import BaseModel
+
+from pydantic_storage._services import BinaryBackend, FileStorage, JsonBackend
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    email: str
+    age: int
+    active: bool
+
+
+METADATA = {"version": "1.0.0", "title": "Users", "description": "Benchmark"}
+
+BACKENDS: dict[str, type] = {"json": JsonBackend, "binary": BinaryBackend}
+
+OPERATIONS = [
+    "create_bulk",
+    "create",
+    "get",
+    "filter",
+    "exists",
+    "count",
+    "update",
+    "delete",
+    "clear",
+    "cold_open",
+]
+
+# Setup returns the argument of each timed call; run makes one call
+Setup = Callable[[int], Sequence[Any]]
+Run = Callable[[Any], object]
+
+
+def make_users(start: int, count: int) -> list[User]:
+    return [
+        User(
+            id=i,
+            name=f"user{i % 100}",
+            email=f"user{i}@example.com",
+            age=i % 90,
+            active=i % 2 == 0,
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def time_runs(setup: Setup, run: Run, repeat: int, budget: float) -> list[float]:
+    """Return the seconds per call of each run."""
+    [argument] = setup(1)
+    start = time.perf_counter()
+    run(argument)
+    single = time.perf_counter() - start
+    number = max(1, min(1000, int(budget / max(single, 1e-9))))
+
+    runs: list[float] = []
+    for _ in range(repeat):
+        arguments = setup(number)
+        start = time.perf_counter()
+        for argument in arguments:
+            run(argument)
+        runs.append((time.perf_counter() - start) / len(arguments))
+    return runs
+
+
+class Bench:
+    """The operations of one store, set up for timing."""
+
+    def __init__(
+        self, directory: Path, backend: type, cache: bool, records: int
+    ) -> None:
+        self.directory = directory
+        self.backend = backend
+        self.cache = cache
+        self.records = records
+        self.random = random.Random(records)
+        self.path = directory / "users"
+        self.storage = self.open(self.path)
+        self.storage.create(make_users(1, records))
+        self.next_user = records + 1
+
+    def open(self, path: Path) -> FileStorage[User]:
+        return FileStorage[User](
+            str(path),
+            User,
+            METADATA,
+            unique_fields=["email"],
+            cache=self.cache,
+            backend=self.backend,
+        )
+
+    def new_users(self, count: int) -> list[User]:
+        users = make_users(self.next_user, count)
+        self.next_user += count
+        return users
+
+    def stored_ids(self, count: int) -> list[int]:
+        ids = list(self.storage.manager.read().records)
+        return [self.random.choice(ids) for _ in range(count)]
+
+    def operations(self) -> dict[str, tuple[Setup, Run]]:
+        storage = self.storage
+        fresh: list[FileStorage[User]] = []
+
+        def empty_stores(count: int) -> list[FileStorage[User]]:
+            for store in fresh:
+                store.manager.delete()
+            fresh[:] = [
+                self.open(self.directory / f"fresh-{i}-{self.next_user}")
+                for i in range(count)
+            ]
+            return fresh
+
+        def full_stores(count: int) -> list[FileStorage[User]]:
+            stores = empty_stores(count)
+            for store in stores:
+                store.create(self.new_users(self.records))
+            return stores
+
+        def deletable(count: int) -> list[str]:
+            users = self.new_users(count)
+            storage.create(users)
+            return [user.email for user in users]
+
+        def updatable(count: int) -> list[User]:
+            records = storage.manager.read().records
+            return [records[i] for i in self.stored_ids(count)]
+
+        users = self.new_users(self.records)
+        return {
+            "create_bulk": (
+                lambda count: [(store, users) for store in empty_stores(count)],
+                lambda item: item[0].create(item[1]),
+            ),
+            "create": (
+                lambda count: self.new_users(count),
+                lambda user: storage.create([user]),
+            ),
+            "get": (
+                lambda count: [f"user{i}@example.com" for i in self.stored_ids(count)],
+                lambda email: storage.get(email=email),
+            ),
+            "filter": (
+                lambda count: [self.random.randrange(90) for _ in range(count)],
+                lambda age: storage.filter(age=age),
+            ),
+            "exists": (
+                lambda count: [self.random.randrange(100) for _ in range(count)],
+                lambda number: storage.exists(name=f"user{number}"),
+            ),
+            "count": (lambda count: [None] * count, lambda _: storage.count()),
+            "update": (
+                updatable,
+                lambda user: storage.update_by_id(user.id, age=(user.age + 1) % 90),
+            ),
+            "delete": (deletable, lambda email: storage.delete(email=email)),
+            "clear": (full_stores, lambda store: store.clear()),
+            "cold_open": (
+                lambda count: [None] * count,
+                lambda _: self.open(self.path).close(),
+            ),
+        }
+
+    def close(self) -> None:
+        self.storage.close()
+
+
+def run_suite(args: argparse.Namespace) -> dict[str, dict[str, Any]]:
+    results: dict[str, dict[str, Any]] = {}
+    for backend_name in args.backends:
+        for cache in args.cache:
+            for records in args.records:
+                with tempfile.TemporaryDirectory() as directory:
+                    bench = Bench(
+                        Path(directory), BACKENDS[backend_name], cache == "on", records
+                    )
+                    operations = bench.operations()
+                    for operation in args.operations:
+                        setup, run = operations[operation]
+                        runs = time_runs(setup, run, args.repeat, args.budget)
+                        key = f"{operation}/{backend_name}/cache-{cache}/{records}"
+                        results[key] = {
+                            "operation": operation,
+                            "backend": backend_name,
+                            "cache": cache == "on",
+                            "records": records,
+                            "median": statistics.median(runs),
+                            "min": min(runs),
+                            "runs": runs,
+                        }
+                        report(key, results[key], args.baseline_results)
+                    bench.close()
+    return results
+
+
+def report(
+    key: str, result: dict[str, Any], baseline: dict[str, dict[str, Any]]
+) -> None:
+    line = (
+        f"{result['operation']:<12} {result['backend']:<7}"
+        f" {'on' if result['cache'] else 'off':<6} {result['records']:>8}"
+        f" {result['median'] * 1e6:>13.1f} {result['min'] * 1e6:>13.1f}"
+    )
+    if key in baseline:
+        line += f" {result['median'] / baseline[key]['median']:>8.2f}x"
+    print(line, flush=True)
+
+
+def regressions(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    tolerance: float,
+) -> list[str]:
+    """Return the keys whose median grew by more than tolerance."""
+    return [
+        key
+        for key, result in results.items()
+        if key in baseline
+        and result["median"] > baseline[key]["median"] * (1 + tolerance)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--records", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument(
+        "--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS)
+    )
+    parser.add_argument(
+        "--cache", nargs="+", choices=["on", "off"], default=["on", "off"]
+    )
+    parser.add_argument(
+        "--operations", nargs="+", choices=OPERATIONS, default=OPERATIONS
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=0.1, help="seconds per run")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    args.baseline_results = {}
+    if args.baseline is not None:
+        args.baseline_results = json.loads(args.baseline.read_text())["results"]
+
+    print(
+        f"{'operation':<12} {'backend':<7} {'cache':<6} {'records':>8}"
+        f" {'median us/op':>13} {'min us/op':>13}"
+        + (f" {'vs base':>9}" if args.baseline is not None else "")
+    )
+    results = run_suite(args)
+
+    if args.output is not None:
+        document = {
+            "environment": {
+                "python": sys.version.split()[0],
+                "implementation": platform.python_implementation(),
+                "machine": platform.machine(),
+                "system": platform.system(),
+                "pydantic": pydantic.VERSION,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+            "results": results,
+        }
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+
+    if args.baseline is not None:
+        slower = regressions(results, args.baseline_results, args.tolerance)
+        for key in slower:
+            ratio = results[key]["median"] / args.baseline_results[key]["median"]
+            print(f"regression: {key} is {ratio:.2f}x the baseline")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
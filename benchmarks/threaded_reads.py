@@ -0,0 +1,104 @@
+"""
+Throughput benchmark: read QPS of one shared FileStorage as threads scale.
+
+A single FileStorage instance is shared by every thread. Each thread
+issues get() lookups against it for a fixed duration while an optional
+writer thread keeps updating records, so readers contend with writes.
+
+Usage:
+    python benchmarks/threaded_reads.py --records 10000 --threads 1 2 4 8
+"""
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from pydantic_storage._services import FileStorage
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    email: str
+
+
+def open_storage(file_path: str) -> FileStorage[User]:
+    return FileStorage[User](
+        file_path=file_path,
+        model_class=User,
+        metadata={
+            "version": "1.0.0",
+            "title": "Threaded users",
+            "description": "Threaded read benchmark",
+        },
+        unique_fields=["email"],
+        durability="none",
+    )
+
+
+def measure(
+    storage: FileStorage[User],
+    records: int,
+    threads: int,
+    seconds: float,
+    write: bool,
+) -> float:
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def reader(slot: int) -> None:
+        rng = random.Random(slot)
+        while not stop.is_set():
+            storage.get(email=f"user{rng.randrange(records)}@example.com")
+            counts[slot] += 1
+
+    def writer() -> None:
+        rng = random.Random(-1)
+        while not stop.is_set():
+            user = storage.get(email=f"user{rng.randrange(records)}@example.com")
+            if user is not None:
+                storage.update(user, name=f"renamed{rng.randrange(records)}")
+
+    workers = [threading.Thread(target=reader, args=(slot,)) for slot in range(threads)]
+    if write:
+        workers.append(threading.Thread(target=writer))
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--write", action="store_true", help="run a concurrent writer")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage = open_storage(str(Path(directory) / "users.json"))
+        storage.create(
+            [
+                User(id=i, name=f"user{i}", email=f"user{i}@example.com")
+                for i in range(args.records)
+            ]
+        )
+
+        print(f"records: {args.records}  writer: {'on' if args.write else 'off'}")
+        print(f"{'threads':>8} {'read QPS':>12}")
+        for threads in args.threads:
+            qps = measure(storage, args.records, threads, args.seconds, args.write)
+            print(f"{threads:>8} {qps:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
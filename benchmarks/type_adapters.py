@@ -0,0 +1,87 @@
+"""
+Micro-benchmark: per-query cost of building TypeAdapters versus reusing them.
+
+Compares the old pattern, where every query built a TypeAdapter for each
+keyword and every read built one for FileData, with the shared adapters
+now returned by type_adapter(). It also times a real get() on a small
+store, so the overhead can be seen next to the work of a query.
+
+Usage:
+    python benchmarks/type_adapters.py --iterations 2000
+"""
+
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+
+from pydantic import BaseModel, TypeAdapter
+
+from pydantic_storage._services import FileStorage
+from pydantic_storage._utils import type_adapter
+from pydantic_storage.models import FileData
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    email: str
+
+
+def per_call(label: str, seconds: float, iterations: int) -> None:
+    print(f"{label:<36} {seconds / iterations * 1e6:>10.2f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    print(f"{'case':<36} {'per call':>13}")
+    per_call(
+        "validate kwarg, new adapter",
+        timeit.timeit(lambda: TypeAdapter(str).validate_python("a@b.c"), number=n),
+        n,
+    )
+    per_call(
+        "validate kwarg, cached adapter",
+        timeit.timeit(lambda: type_adapter(str).validate_python("a@b.c"), number=n),
+        n,
+    )
+    per_call(
+        "FileData adapter, new",
+        timeit.timeit(lambda: TypeAdapter(FileData[User]), number=n),
+        n,
+    )
+    per_call(
+        "FileData adapter, cached",
+        timeit.timeit(lambda: type_adapter(FileData[User]), number=n),
+        n,
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        with FileStorage[User](
+            file_path=str(Path(directory) / "users.json"),
+            model_class=User,
+            metadata={"version": "1.0.0", "title": "Users", "description": ""},
+            unique_fields=["email"],
+            durability="none",
+        ) as storage:
+            storage.create(
+                [
+                    User(id=i, name=f"user{i}", email=f"user{i}@example.com")
+                    for i in range(100)
+                ]
+            )
+            per_call(
+                "get(email=...) end to end",
+                timeit.timeit(
+                    lambda: storage.get(email="user50@example.com"), number=n
+                ),
+                n,
+            )
+
+
+if __name__ == "__main__":
+    main()
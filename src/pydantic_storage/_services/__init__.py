@@ -1,4 +1,29 @@
+from ._backends._binary_backend import BinaryBackend
+from ._backends._json_backend import JsonBackend
+from ._indexes._hash_index import HashIndex, RecordIndex
+from ._indexes._offset_index import OffsetIndex
 from ._managers._file_manager import FileManager
+from ._managers._log_file_manager import LogFileManager
+from ._queries._compiler import QueryCompiler
+from ._queries._query import Lookup, Query
+from ._storages._async_file_storage import AsyncFileStorage
 from ._storages._file_storage import FileStorage
+from ._storages._sharded_file_storage import ShardedFileStorage
+from ._storages._sqlite_storage import SqliteStorage
 
-__all__ = ["FileManager", "FileStorage"]
+__all__ = [
+    "AsyncFileStorage",
+    "BinaryBackend",
+    "FileManager",
+    "FileStorage",
+    "HashIndex",
+    "JsonBackend",
+    "LogFileManager",
+    "Lookup",
+    "OffsetIndex",
+    "Query",
+    "QueryCompiler",
+    "RecordIndex",
+    "ShardedFileStorage",
+    "SqliteStorage",
+]
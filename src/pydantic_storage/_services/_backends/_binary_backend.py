@@ -0,0 +1,154 @@
+import struct
+from collections.abc import Iterator
+from itertools import chain
+from typing import Any, BinaryIO, ClassVar
+
+from pydantic import TypeAdapter
+
+from pydantic_storage._utils import FragmentCache, type_adapter
+from pydantic_storage.abstractions import BaseBackend
+from pydantic_storage.models import FileData, FileMetaData
+from pydantic_storage.types import RecordsDict, T
+
+MAGIC = b"PSTB\x01"
+
+# Metadata length, then per record its id and blob length
+METADATA_HEADER = struct.Struct("<I")
+RECORD_HEADER = struct.Struct("<qI")
+
+
+class BinaryBackend(BaseBackend[T]):
+    """
+    Stores records as length-prefixed blobs.
+
+    The file starts with a magic tag and the length-prefixed metadata,
+    followed by one frame per record: its id, the length of its blob and
+    the blob, a compact JSON encoding of the record. Nothing is indented
+    or quoted twice, and a reader can skip from frame to frame without
+    parsing the records in between.
+    """
+
+    random_access: ClassVar[bool] = True
+
+    def __init__(self, model_class: type[T]) -> None:
+        """Initialize the backend for the given model."""
+        super().__init__(model_class)
+        self.metadata_adapter: TypeAdapter[FileMetaData] = type_adapter(FileMetaData)
+
+        # Records are framed one by one, so call the model's compiled
+        # serializer and validator directly and skip the adapter wrappers
+        self._to_json = model_class.__pydantic_serializer__.to_json
+        self._validate_json = model_class.__pydantic_validator__.validate_json
+
+    def encode(self, data: FileData[T]) -> bytes:
+        """Serialize metadata and records into frames."""
+        metadata = self.metadata_adapter.dump_json(data.metadata)
+        parts: list[bytes] = [MAGIC, METADATA_HEADER.pack(len(metadata)), metadata]
+        to_json = self._to_json
+        for record_id, record in data.records.items():
+            blob = to_json(record)
+            parts.append(RECORD_HEADER.pack(record_id, len(blob)))
+            parts.append(blob)
+        return b"".join(parts)
+
+    def iter_encode(
+        self, data: FileData[T], fragments: FragmentCache[T] | None = None
+    ) -> Iterator[bytes]:
+        """Serialize metadata and records as chunks, reusing unchanged frames."""
+        if fragments is None:
+            return super().iter_encode(data)
+        metadata = self.metadata_adapter.dump_json(data.metadata)
+        header = MAGIC + METADATA_HEADER.pack(len(metadata)) + metadata
+        return chain((header,), fragments.fragments(data.records, self._frame))
+
+    def _frame(self, record_id: int, record: T) -> bytes:
+        """Encode one record as its frame"""
+        blob = self._to_json(record)
+        return RECORD_HEADER.pack(record_id, len(blob)) + blob
+
+    def decode(self, raw: bytes) -> FileData[T]:
+        """Parse the frames back into file data."""
+        metadata, offset = self._read_metadata(raw)
+        validate_json = self._validate_json
+        records: RecordsDict[T] = {}
+        end = len(raw)
+        while offset < end:
+            record_id, size = RECORD_HEADER.unpack_from(raw, offset)
+            offset += RECORD_HEADER.size
+            if offset + size > end:
+                raise ValueError("Truncated record in binary storage file.")
+            records[record_id] = validate_json(raw[offset : offset + size])
+            offset += size
+
+        # Both parts were validated above, so skip validating them again
+        return FileData[self.model_class].model_construct(
+            metadata=metadata, records=records
+        )
+
+    def split_records(self, raw: bytes) -> tuple[FileMetaData, list[tuple[int, Any]]]:
+        """Cut the frames apart without validating their blobs."""
+        metadata, _ = self._read_metadata(raw)
+        return metadata, [
+            (record_id, raw[offset : offset + size])
+            for record_id, offset, size in self.record_spans(raw)
+        ]
+
+    def record_spans(self, buffer: bytes) -> Iterator[tuple[int, int, int]]:
+        """Walk the frame headers, yielding where each blob is stored."""
+        self._check_magic(buffer)
+        (size,) = METADATA_HEADER.unpack_from(buffer, len(MAGIC))
+        offset = len(MAGIC) + METADATA_HEADER.size + size
+        end = len(buffer)
+        while offset < end:
+            record_id, size = RECORD_HEADER.unpack_from(buffer, offset)
+            offset += RECORD_HEADER.size
+            if offset + size > end:
+                raise ValueError("Truncated record in binary storage file.")
+            yield record_id, offset, size
+            offset += size
+
+    def validate_records(self, payloads: list[tuple[int, Any]]) -> list[tuple[int, T]]:
+        """Validate the blobs cut out by split_records."""
+        validate_json = self._validate_json
+        return [(record_id, validate_json(blob)) for record_id, blob in payloads]
+
+    def iter_records(self, stream: BinaryIO) -> Iterator[tuple[int, T]]:
+        """Read frames from the stream, validating one record at a time."""
+        header = stream.read(len(MAGIC) + METADATA_HEADER.size)
+        if not header:
+            return
+        self._check_magic(header)
+        (size,) = METADATA_HEADER.unpack_from(header, len(MAGIC))
+        stream.seek(size, 1)
+
+        validate_json = self._validate_json
+        while frame := stream.read(RECORD_HEADER.size):
+            if len(frame) < RECORD_HEADER.size:
+                raise ValueError("Truncated record in binary storage file.")
+            record_id, size = RECORD_HEADER.unpack(frame)
+            blob = stream.read(size)
+            if len(blob) < size:
+                raise ValueError("Truncated record in binary storage file.")
+            yield record_id, validate_json(blob)
+
+    def read_metadata(self, stream: BinaryIO) -> FileMetaData:
+        """Read the header and the metadata frame only."""
+        header = stream.read(len(MAGIC) + METADATA_HEADER.size)
+        self._check_magic(header)
+        if len(header) < len(MAGIC) + METADATA_HEADER.size:
+            raise ValueError("Truncated binary storage file.")
+        (size,) = METADATA_HEADER.unpack_from(header, len(MAGIC))
+        return self.metadata_adapter.validate_json(stream.read(size))
+
+    def _read_metadata(self, raw: bytes) -> tuple[FileMetaData, int]:
+        """Parse the header and metadata; return them and the first frame offset."""
+        self._check_magic(raw)
+        (size,) = METADATA_HEADER.unpack_from(raw, len(MAGIC))
+        offset = len(MAGIC) + METADATA_HEADER.size
+        metadata = self.metadata_adapter.validate_json(raw[offset : offset + size])
+        return metadata, offset + size
+
+    @staticmethod
+    def _check_magic(header: bytes) -> None:
+        if header[: len(MAGIC)] != MAGIC:
+            raise ValueError("Not a binary storage file.")
@@ -0,0 +1,139 @@
+import io
+import json
+from collections.abc import Iterator
+from itertools import chain, starmap
+from typing import Any, BinaryIO
+
+from pydantic import TypeAdapter
+
+from pydantic_storage._utils import (
+    FragmentCache,
+    iter_object_items,
+    read_member,
+    type_adapter,
+)
+from pydantic_storage.abstractions import BaseBackend
+from pydantic_storage.models import FileData, FileMetaData
+from pydantic_storage.types import T
+
+
+class JsonBackend(BaseBackend[T]):
+    """Stores the file data as one JSON document."""
+
+    def __init__(self, model_class: type[T], indent: int | None = 2) -> None:
+        """Initialize the backend; indent=None writes compact JSON."""
+        super().__init__(model_class)
+        self.indent: int | None = indent
+        self.adapter: TypeAdapter[FileData[T]] = type_adapter(FileData[model_class])
+        self.record_adapter: TypeAdapter[T] = type_adapter(model_class)
+        self.metadata_adapter: TypeAdapter[FileMetaData] = type_adapter(FileMetaData)
+        self.chunk_adapter: TypeAdapter[dict[int, T]] = type_adapter(
+            dict[int, model_class]  # type: ignore[valid-type]
+        )
+
+        # Each entry of the records object starts on its own line, indented
+        # twice, as nested lines of its record are
+        self._newline: bytes = b""
+        self._key_separator: bytes = b":"
+        self._closing: bytes = b"}}\n"
+        if indent is not None:
+            self._newline = b"\n" + b" " * (2 * indent)
+            self._key_separator = b": "
+            self._closing = b"\n" + b" " * indent + b"}\n}\n"
+
+        # Entries are encoded one by one, so skip the adapter wrapper
+        self._to_json = model_class.__pydantic_serializer__.to_json
+
+    def encode(self, data: FileData[T]) -> bytes:
+        """Serialize the file data as JSON with a trailing newline."""
+        if not isinstance(data.records, dict):
+            # Compact records build each model as its entry is encoded
+            entries = starmap(self._entry, data.records.items())
+            return b"".join(self._document(data, entries))
+        return f"{data.model_dump_json(indent=self.indent)}\n".encode()
+
+    def iter_encode(
+        self, data: FileData[T], fragments: FragmentCache[T] | None = None
+    ) -> Iterator[bytes]:
+        """
+        Serialize the file data as chunks, one per record.
+
+        The output is the document encode() writes. With fragments, the
+        entries of unchanged records are reused, which leaves encoding
+        the changed records and the metadata as the work of a write.
+        """
+        if fragments is None:
+            return super().iter_encode(data)
+        return self._document(data, fragments.fragments(data.records, self._entry))
+
+    def _entry(self, record_id: int, record: T) -> bytes:
+        """Encode a record as an entry of the records object, comma first"""
+        dumped = self._to_json(record, indent=self.indent)
+        return b',%s"%d"%s%s' % (
+            self._newline,
+            record_id,
+            self._key_separator,
+            dumped.replace(b"\n", self._newline),
+        )
+
+    def _document(
+        self, data: FileData[T], entries: Iterator[bytes]
+    ) -> Iterator[bytes]:
+        """
+        Splice record entries into the document of the data without them.
+
+        The result is the document model_dump_json writes, records held
+        in any mapping.
+        """
+        head = data.model_copy(update={"records": {}}).model_dump_json(
+            indent=self.indent
+        )
+        first = next(entries, None)
+        if first is None:
+            return iter((f"{head}\n".encode(),))
+
+        # The first entry replaces the empty object that ends the head
+        opening = head[: head.rindex("{}")].encode()
+        return chain((b"%s{%s" % (opening, first[1:]),), entries, (self._closing,))
+
+    def decode(self, raw: bytes) -> FileData[T]:
+        """Parse and validate a JSON document."""
+        return self.adapter.validate_json(raw)
+
+    def iter_records(self, stream: BinaryIO) -> Iterator[tuple[int, T]]:
+        """Stream the records object, validating one record at a time."""
+        text = io.TextIOWrapper(stream, encoding="utf-8")
+        try:
+            for record_id, raw in iter_object_items(text, "records"):
+                yield int(record_id), self.record_adapter.validate_json(raw)
+        finally:
+            # Hand the stream back open instead of closing it with the wrapper
+            text.detach()
+
+    def read_metadata(self, stream: BinaryIO) -> FileMetaData:
+        """Read the metadata object, which comes before the records."""
+        text = io.TextIOWrapper(stream, encoding="utf-8")
+        try:
+            raw = read_member(text, "metadata")
+        finally:
+            text.detach()
+        if raw is None:
+            raise ValueError("No metadata in JSON storage file.")
+        return self.metadata_adapter.validate_json(raw)
+
+    def split_records(self, raw: bytes) -> tuple[FileMetaData, list[tuple[int, Any]]]:
+        """Parse the document with the json module, validating only the metadata."""
+        document = json.loads(raw)
+        metadata = self.metadata_adapter.validate_python(document["metadata"])
+        return metadata, list(document.get("records", {}).items())
+
+    def validate_records(self, payloads: list[tuple[int, Any]]) -> list[tuple[int, T]]:
+        """
+        Validate parsed records in JSON mode.
+
+        The chunk is dumped back to JSON first, so records are validated
+        exactly as decode validates them, for instance datetimes in
+        strict models.
+        """
+        records = self.chunk_adapter.validate_json(json.dumps(dict(payloads)))
+        return list(records.items())
@@ -0,0 +1,73 @@
+import json
+from collections.abc import Hashable
+from typing import Any, Generic
+
+from pydantic_core import to_jsonable_python
+
+from pydantic_storage.types import RecordsDict, T
+
+
+def index_key(value: Any) -> Hashable:
+    """Return a hashable key for a field value"""
+    try:
+        hash(value)
+    except TypeError:
+        # Lists, dicts and non-frozen models are keyed by their JSON form
+        return json.dumps(to_jsonable_python(value), sort_keys=True)
+    return value
+
+
+class HashIndex(Generic[T]):
+    """An in-memory index mapping field values to record ids."""
+
+    def __init__(self, field: str, unique: bool = False) -> None:
+        """Initialize an empty index over the given field."""
+        self.field: str = field
+        self.unique: bool = unique
+        self._entries: dict[Hashable, set[int]] = {}
+
+    def value_of(self, record: T) -> Hashable:
+        """Return the index key of a record"""
+        return index_key(getattr(record, self.field))
+
+    def build(self, records: RecordsDict[T]) -> None:
+        """Rebuild the index from scratch"""
+        entries: dict[Hashable, set[int]] = {}
+        for record_id, record in records.items():
+            entries.setdefault(self.value_of(record), set()).add(record_id)
+
+        # Swap in the finished index so concurrent readers never see a partial one
+        self._entries = entries
+
+    def add(self, record_id: int, record: T) -> None:
+        """Add a record to the index"""
+        self._entries.setdefault(self.value_of(record), set()).add(record_id)
+
+    def remove(self, record_id: int, record: T) -> None:
+        """Remove a record from the index"""
+        key = self.value_of(record)
+        ids = self._entries.get(key)
+        if ids is not None:
+            ids.discard(record_id)
+            if not ids:
+                del self._entries[key]
+
+    def lookup(self, value: Any) -> set[int]:
+        """Return the ids of records whose field equals value"""
+        return self._entries.get(index_key(value), set())
+
+    def lookup_record(self, record: T) -> set[int]:
+        """Return the ids of records sharing the index key of record"""
+        return self._entries.get(self.value_of(record), set())
+
+
+class RecordIndex(HashIndex[T]):
+    """An index over the full serialized content of each record."""
+
+    def __init__(self) -> None:
+        """Initialize an empty record index."""
+        super().__init__(field="__record__")
+
+    def value_of(self, record: T) -> Hashable:
+        """Return a hash of the serialized record"""
+        return hash(record.model_dump_json())
@@ -0,0 +1,180 @@
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from pydantic_storage._utils import atomic_write
+from pydantic_storage.types import Durability
+
+MAGIC = b"PSTI\x01"
+
+# Size, mtime and inode of the data file the index was built from
+HEADER = struct.Struct("<qqq")
+
+# One entry per record, sorted by id: the id, offset and length of its blob
+ENTRY = struct.Struct("<qQI")
+ENTRY_ID = struct.Struct("<q")
+
+ENTRIES_START = len(MAGIC) + HEADER.size
+
+# (id, offset, length) of every record blob in a data file
+Spans = Callable[[bytes], Iterable[tuple[int, int, int]]]
+
+
+class OffsetIndex:
+    """
+    A sidecar file mapping record ids to the byte range of their blobs.
+
+    Entries have a fixed size and are sorted by id, so a lookup is a
+    binary search over the memory-mapped index that reads a handful of
+    entries whatever the number of records. The header holds the
+    signature of the data file the index was built from; an index that
+    no longer matches is rebuilt from the data file's frame headers,
+    without validating any record.
+    """
+
+    def __init__(
+        self,
+        index_path: Path,
+        data_path: Path,
+        spans: Spans,
+        durability: Durability = "flush",
+    ) -> None:
+        """
+        Initialize the index of a data file.
+
+        Args:
+            index_path (Path): The sidecar file holding the index.
+            data_path (Path): The data file the index points into.
+            spans (Spans): Lists the (id, offset, length) of every record
+                blob in the contents of the data file.
+            durability (Durability): How the index file is written.
+
+        """
+        self.index_path: Path = index_path
+        self.data_path: Path = data_path
+        self.spans: Spans = spans
+        self.durability: Durability = durability
+        self._lock = threading.Lock()
+
+        # Signature, data map and index map of the last file mapped
+        self._maps: tuple[tuple[int, ...], mmap.mmap, mmap.mmap] | None = None
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> tuple[int, ...]:
+        return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+    def build(self, raw: bytes | None = None) -> None:
+        """
+        Index data just written to the data file; callers hold the lock.
+
+        Without raw, the data file is mapped and indexed from disk, for
+        data that was streamed to it rather than held in memory.
+        """
+        if raw is not None:
+            self._write(self.spans(raw), self._signature(self.data_path.stat()))
+            return
+        with self.data_path.open("rb") as file:
+            signature = self._signature(os.fstat(file.fileno()))
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                self._write(self.spans(data), signature)  # type: ignore[arg-type]
+
+    def _write(
+        self, spans: Iterable[tuple[int, int, int]], signature: tuple[int, ...]
+    ) -> None:
+        entries = b"".join(ENTRY.pack(*span) for span in sorted(spans))
+        atomic_write(
+            self.index_path,
+            MAGIC + HEADER.pack(*signature) + entries,
+            self.durability,
+        )
+
+    def _map(self) -> tuple[mmap.mmap, mmap.mmap] | None:
+        """Map the data file and a matching index, rebuilding a stale one."""
+        try:
+            signature = self._signature(self.data_path.stat())
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if self._maps is not None and self._maps[0] == signature:
+                return self._maps[1], self._maps[2]
+
+            with self.data_path.open("rb") as file:
+                # The signature of the file actually mapped, not of the path
+                signature = self._signature(os.fstat(file.fileno()))
+                if not signature[0]:
+                    return None
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            index = self._open_index(signature)
+            if index is None:
+                self._write(self.spans(data), signature)  # type: ignore[arg-type]
+                index = self._open_index(signature)
+            if index is None:
+                return None
+
+            # Maps that are replaced close once no reader holds them anymore
+            self._maps = (signature, data, index)
+            return data, index
+
+    def _open_index(self, signature: tuple[int, ...]) -> mmap.mmap | None:
+        """Map the index file if it was built from the given data file."""
+        try:
+            with self.index_path.open("rb") as file:
+                index = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        if (
+            len(index) < ENTRIES_START
+            or index[: len(MAGIC)] != MAGIC
+            or HEADER.unpack_from(index, len(MAGIC)) != signature
+        ):
+            return None
+        return index
+
+    def blob(self, record_id: int) -> bytes | None:
+        """
+        Return the stored blob of a record.
+
+        Args:
+            record_id (int): The id of the record.
+
+        Returns:
+            bytes | None: The blob, or None if no record has that id.
+
+        """
+        maps = self._map()
+        if maps is None:
+            return None
+        data, index = maps
+
+        low, high = 0, (len(index) - ENTRIES_START) // ENTRY.size
+        while low < high:
+            middle = (low + high) // 2
+            position = ENTRIES_START + middle * ENTRY.size
+            (entry_id,) = ENTRY_ID.unpack_from(index, position)
+            if entry_id < record_id:
+                low = middle + 1
+            else:
+                high = middle
+        if ENTRIES_START + low * ENTRY.size >= len(index):
+            return None
+
+        entry_id, offset, length = ENTRY.unpack_from(
+            index, ENTRIES_START + low * ENTRY.size
+        )
+        if entry_id != record_id:
+            return None
+        return data[offset : offset + length]
+
+    def close(self) -> None:
+        """Drop the mapped files; they are mapped again on the next lookup."""
+        with self._lock:
+            self._maps = None
+
+    def unlink(self) -> None:
+        """Remove the index file."""
+        self.close()
+        self.index_path.unlink(missing_ok=True)
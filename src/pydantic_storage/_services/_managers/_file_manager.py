@@ -1,11 +1,43 @@
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 from datetime import datetime
+from itertools import chain, repeat
 from pathlib import Path
-
-from pydantic import TypeAdapter
-
-from pydantic_storage.abstractions import BaseFileManager
-from pydantic_storage.models import FileData, Timestamp, now_utc
-from pydantic_storage.types import BaseMetaDataDict, FileDataDict, RecordsDict, T
+from types import TracebackType
+from typing import Any, Self
+
+from pydantic_storage._services._backends._json_backend import JsonBackend
+from pydantic_storage._services._indexes._hash_index import HashIndex
+from pydantic_storage._services._indexes._offset_index import OffsetIndex
+from pydantic_storage._utils import (
+    CompactRecords,
+    FileLock,
+    FragmentCache,
+    ReadWriteLock,
+    StorageMetrics,
+    atomic_write,
+    changed_records,
+    chunked,
+    gil_enabled,
+    snapshot_items,
+    validate_chunk,
+    worker_pool,
+)
+from pydantic_storage.abstractions import BaseBackend, BaseFileManager
+from pydantic_storage.exceptions import DuplicateEntryError
+from pydantic_storage.models import FileData, FileMetaData, Timestamp, now_utc
+from pydantic_storage.types import (
+    BaseMetaDataDict,
+    Durability,
+    FileDataDict,
+    RecordsDict,
+    T,
+)
+
+# Records validated at a time by loads that do not decode the whole file
+LOAD_CHUNK_SIZE = 10_000
 
 
 class FileManager(BaseFileManager[T]):
@@ -16,16 +48,371 @@ class FileManager(BaseFileManager[T]):
         file_path: str,
         model_class: type[T],
         metadata: BaseMetaDataDict,
+        cache: bool = True,
+        durability: Durability = "flush",
+        lock_timeout: float | None = 10.0,
+        lock_backoff: float = 0.001,
+        backend: type[BaseBackend[Any]] = JsonBackend,
+        workers: int | None = None,
+        flush_every: int | None = None,
+        flush_interval: float | None = None,
+        compact_records: bool = False,
+        metrics: StorageMetrics | None = None,
+        unique_fields: list[str] | None = None,
     ) -> None:
-        """Call parent initializer"""
+        """
+        Call parent initializer.
+
+        workers opts in to validating uncached scans on a pool of that
+        many processes, or threads on free-threaded builds. Loads only
+        use the pool on free-threaded builds: a process would have to
+        pickle every validated record back, which costs more than
+        validating it here.
+
+        flush_every and flush_interval turn on write-behind: mutations
+        are staged in memory and stored by a background flush once that
+        many have been made or that many seconds after the first one.
+        Readers in this process see the staged records; other processes
+        only see them once they are flushed. A flush that finds the file
+        changed by another process renumbers the records it creates and
+        checks unique_fields against what the other process stored.
+
+        compact_records keeps the records in memory as tuples of field
+        values instead of models, several times smaller for large files.
+        Models are built without validation whenever a record is
+        accessed, so scans pay for building every record they look at.
+
+        metrics, when given, counts the bytes read and written, cache
+        hits and misses, loads, rewrites and appends, and times reading,
+        decoding, encoding and writing the file.
+        """
         super().__init__(file_path, model_class, metadata)
+        self.durability: Durability = durability
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1.")
+        if flush_every is not None and flush_every < 1:
+            raise ValueError("flush_every must be at least 1.")
+        if flush_interval is not None and flush_interval <= 0:
+            raise ValueError("flush_interval must be positive.")
+        self.workers: int | None = workers
+        self.parallel_load: bool = workers is not None and not gil_enabled()
+        self._pool: Executor | None = None
+        self._pool_lock = threading.Lock()
+        self.compact_records: bool = compact_records
+        self.metrics: StorageMetrics | None = metrics
+        if compact_records:
+            # Check the model can be stored compactly before anything is read
+            CompactRecords(model_class)
+
+        # The on-disk format; JSON unless another backend is given
+        self.backend: BaseBackend[T] = backend(model_class)
+
+        # Sidecar id -> blob offsets, for backends that can read single records
+        self.offsets: OffsetIndex | None = None
+        if self.backend.random_access:
+            self.offsets = OffsetIndex(
+                self.file_path.with_name(f"{self.file_path.name}.idx"),
+                self.file_path,
+                self.backend.record_spans,
+                durability,
+            )
+
+        # Reader/writer lock shared by the threads using this manager
+        self.rw_lock: ReadWriteLock = ReadWriteLock()
+        self._load_lock = threading.Lock()
+
+        # Advisory lock shared with every process using the same file
+        self.lock: FileLock = FileLock(
+            self.file_path.with_name(f"{self.file_path.name}.lock"),
+            timeout=lock_timeout,
+            backoff=lock_backoff,
+        )
+
+        # In-memory copy of the file, keyed by the file signature it was read at
+        self.cache_enabled: bool = cache
+        self._cached_data: FileData[T] | None = None
+        self._cached_signature: tuple[int, ...] | None = None
+
+        # Encoded records reused by the next save; only cached records stay
+        # the same objects between writes, and compact ones are kept small
+        self.fragments: FragmentCache[T] | None = None
+        if cache and not compact_records:
+            self.fragments = FragmentCache()
+
+        # Data staged by an open batch() and whether anything changed in it
+        self._batch_data: FileData[T] | None = None
+        self._batch_dirty: bool = False
+
+        # Write-behind keeps a batch open between calls: the data and file
+        # signature it started from, the number of mutations staged since
+        # and the timer of the pending background flush
+        self.flush_every: int | None = flush_every
+        self.flush_interval: float | None = flush_interval
+        self.write_behind: bool = flush_every is not None or flush_interval is not None
+        self.unique_fields: list[str] = unique_fields or []
+        self._deferred: tuple[FileData[T], tuple[int, ...] | None] | None = None
+        self._deferred_count: int = 0
+        self._flush_timer: threading.Timer | None = None
+        # A conflict a background flush dropped its batch for, raised by
+        # the next flush() or close()
+        self._flush_error: DuplicateEntryError | None = None
+
+        # The lock file lives next to the data file
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.locked():
+            # Create empty file
+            if not self.exists():
+                self.create()
+
+            # Write a new store; only check the metadata of an existing one
+            if self.is_file_size_zero():
+                self.file_initializer()
+            else:
+                self.read_metadata()
+
+    @contextmanager
+    def locked(self, shared: bool = False) -> Iterator[None]:
+        """
+        Hold the thread and inter-process locks for the duration of the block.
+
+        Wrap a whole read-modify-write cycle in an exclusive lock so no
+        other thread or process can write between the read and the write.
+        Shared holders run concurrently and are served from the cache.
+
+        Args:
+            shared (bool): Take a shared (reader) lock instead of an
+                exclusive (writer) one.
+
+        Raises:
+            LockTimeoutError: If the lock is not acquired within the
+                configured timeout.
+
+        """
+        thread_lock = self.rw_lock.read() if shared else self.rw_lock.write()
+        file_lock = self.lock.shared() if shared else self.lock.exclusive()
+        with thread_lock, file_lock:
+            yield
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Stage writes and removes in memory and store them with one write.
+
+        The exclusive lock is held for the whole block. Reads inside it see
+        the staged records, and on exit everything is written at once. If
+        the block or the final write raises, the staged changes are
+        dropped and the data is left as it was. Nested batches join the
+        outermost one.
+
+        Raises:
+            LockTimeoutError: If the lock is not acquired within the
+                configured timeout.
+
+        """
+        with self.locked():
+            # A transaction rolls back to stored data, not to write-behind state
+            self._flush_deferred()
+            if self._batch_data is not None:
+                yield
+                return
+
+            stored_data: FileData[T] = self.read()
+            records, metadata = stored_data.records, stored_data.metadata
+            stored_data.records = records.copy()
+            stored_data.metadata = metadata.model_copy()
+            self._batch_data = stored_data
+            self._batch_dirty = False
+            try:
+                yield
+                if self._batch_dirty:
+                    original: FileData[T] = FileData[self.model_class].model_construct(
+                        metadata=metadata, records=records
+                    )
+                    self.flush_batch(stored_data, original)
+            except BaseException:
+                stored_data.records = records
+                stored_data.metadata = metadata
+                raise
+            finally:
+                self._batch_data = None
+
+    def flush_batch(self, stored_data: FileData[T], original: FileData[T]) -> None:
+        """
+        Store the records staged by a batch; callers hold the lock.
+
+        Args:
+            stored_data (FileData[T]): The data holding the staged records.
+            original (FileData[T]): The data as it was before the batch
+                started.
+
+        Returns:
+            None
+
+        """
+        self.save(stored_data)
+
+    def _staged_data(self) -> FileData[T] | None:
+        """
+        Return the data mutations are staged in; callers hold the lock.
+
+        That is the data of an open batch or, with write-behind, of the
+        deferred batch, which is opened on the first mutation. None means
+        mutations are stored right away.
+        """
+        if self._batch_data is None and self.write_behind:
+            stored_data: FileData[T] = self.read()
+            original: FileData[T] = FileData[self.model_class].model_construct(
+                metadata=stored_data.metadata, records=stored_data.records
+            )
+            self._batch_data = FileData[self.model_class].model_construct(
+                metadata=stored_data.metadata.model_copy(),
+                records=stored_data.records.copy(),
+            )
+            self._deferred = (original, self.signature())
+            self._deferred_count = 0
+        return self._batch_data
+
+    def _staged_change(self) -> None:
+        """Record a staged mutation and schedule its write-behind flush"""
+        self._batch_dirty = True
+        if self._deferred is None:
+            return
+        self._deferred_count += 1
+        if self.flush_every is not None and self._deferred_count >= self.flush_every:
+            self._schedule_flush(0)
+        elif self.flush_interval is not None:
+            self._schedule_flush(self.flush_interval)
+
+    def _schedule_flush(self, delay: float) -> None:
+        """Flush in the background after delay, unless a flush is already due"""
+        if self._flush_timer is not None:
+            if delay:
+                return
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(delay, self._flush_in_background)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        except DuplicateEntryError as error:
+            # The conflicting batch was dropped; report it to the caller
+            self._flush_error = error
+        except Exception:
+            # The changes stay staged; the next mutation, flush() or close()
+            # tries again and the latter two raise if it still fails
+            if self._flush_timer is threading.current_thread():
+                self._flush_timer = None
+
+    def flush(self) -> None:
+        """
+        Store the mutations write-behind has staged.
+
+        Raises:
+            DuplicateEntryError: If this flush, or a background one since
+                the last call, dropped a batch whose records clashed on a
+                unique field with records another process stored.
+            LockTimeoutError: If the lock is not acquired within the
+                configured timeout.
 
-        # Create empty file
-        if not self.exists():
-            self.create()
+        Returns:
+            None
 
-        # Initialize file with default content
-        self.file_initializer()
+        """
+        with self.locked():
+            error, self._flush_error = self._flush_error, None
+            self._flush_deferred()
+            if error is not None:
+                raise error
+
+    def _flush_deferred(self) -> None:
+        """
+        Store the deferred batch, if any; callers hold the lock.
+
+        If another process wrote the file since the batch started, the
+        records the batch changed are applied to what it stored. If they
+        clash with it on a unique field, the batch is dropped; if the
+        write fails, the changes stay staged.
+        """
+        if self._deferred is None:
+            return
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        staged_data = self._batch_data
+        assert staged_data is not None
+        original, signature = self._deferred
+        self._batch_data = None
+        try:
+            stored_data = staged_data
+            if self.signature() != signature:
+                current_data: FileData[T] = self.read()
+                stored_data = self._rebase(staged_data, original, current_data)
+                original = current_data
+            self.flush_batch(stored_data, original)
+        except DuplicateEntryError:
+            self._deferred = None
+            self._deferred_count = 0
+            raise
+        except BaseException:
+            self._batch_data = staged_data
+            raise
+        self._deferred = None
+        self._deferred_count = 0
+
+    def _rebase(
+        self, staged_data: FileData[T], original: FileData[T], current: FileData[T]
+    ) -> FileData[T]:
+        """
+        Return current with the changes staged against original applied.
+
+        Ids the batch handed out may have been used by the other process
+        meanwhile, so the records it created are moved past the current
+        sequence, keeping their order.
+
+        Raises:
+            DuplicateEntryError: If a changed record clashes on a unique
+                field with a stored one.
+
+        """
+        records: RecordsDict[T] = current.records.copy()
+        for record_id in original.records.keys() - staged_data.records.keys():
+            records.pop(record_id, None)
+
+        first_new_id = original.metadata.last_id + 1
+        shift = max(current.metadata.last_id + 1 - first_new_id, 0)
+        changed: dict[int, T] = {}
+        for record_id, record in changed_records(original.records, staged_data.records):
+            if record_id >= first_new_id:
+                record_id += shift
+            changed[record_id] = record
+            records[record_id] = record
+
+        for field in self.unique_fields:
+            index: HashIndex[T] = HashIndex(field, unique=True)
+            index.build(records)
+            for record_id, record in changed.items():
+                if index.lookup_record(record) - {record_id}:
+                    raise DuplicateEntryError([field])
+
+        metadata = current.metadata.model_copy()
+        self.advance_sequence(metadata, [staged_data.metadata.last_id + shift])
+        return FileData[self.model_class].model_construct(
+            metadata=metadata, records=records
+        )
+
+    def _phase(self, name: str) -> AbstractContextManager[None]:
+        """Time a phase of the work when metrics are on"""
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.phase(name)
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        """Add to a counter when metrics are on"""
+        if self.metrics is not None:
+            self.metrics.count(counter, amount)
 
     def exists(self) -> bool:
         """
@@ -41,8 +428,45 @@ class FileManager(BaseFileManager[T]):
         """To Check file size is zero or not"""
         return self.file_path.stat().st_size == 0
 
+    def signature(self) -> tuple[int, ...] | None:
+        """
+        Return the (mtime, size, inode) signature of the file.
+
+        Returns:
+            tuple[int, ...] | None: The signature, or None if the file
+            does not exist.
+
+        """
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def invalidate_cache(self) -> None:
+        """Drop the cached file data so the next read goes to disk"""
+        self._cached_data = None
+        self._cached_signature = None
+
+    def read_metadata(self) -> FileMetaData:
+        """
+        Read and validate the stored metadata without loading the records.
+
+        Opening a store only calls this, so nothing is loaded or written
+        until the records are first used; the configured metadata and
+        timestamps are applied by the next write.
+
+        Returns:
+            FileMetaData: The metadata of the file.
+
+        """
+        with self.locked(shared=True), self.file_path.open("rb") as stream:
+            metadata = self.backend.read_metadata(stream)
+            self._count("bytes_read", stream.tell())
+            return metadata
+
     def file_initializer(self) -> None:
-        """Initialize file with default content"""
+        """Write the initial document to a new, empty file"""
 
         # Create default file data structure with it's values
         file_meta_data_dict: FileDataDict[T] = {
@@ -63,17 +487,11 @@ class FileManager(BaseFileManager[T]):
         # Validate all provided data as for model
         current_data: FileData[T] = FileData(**file_meta_data_dict)  # type: ignore
 
-        # Get Stored Data and Update timestamps
-        if not self.is_file_size_zero():
-            stored_data: FileData[T] = self.read()
-            current_data.metadata.timestamps = self.update_timestamps(
-                timestamps=stored_data.metadata.timestamps
-            )
-
-        # Write Json string to stored file.
-        self.file_path.write_text(
-            f"{current_data.model_dump_json(indent=2)}\n",
-        )
+        # Write the encoded data to the stored file.
+        raw = self.backend.encode(current_data)
+        atomic_write(self.file_path, raw, self.durability)
+        self._count("bytes_written", len(raw))
+        self.invalidate_cache()
 
     def create(self) -> None:
         """
@@ -94,13 +512,291 @@ class FileManager(BaseFileManager[T]):
         """
         Read data from a JSON file and return it.
 
+        The parsed data is cached and served from memory until the file
+        signature changes, i.e. until another process rewrites the file.
+        With the cache on, the returned data and its records are shared
+        with every other reader: treat them as read-only and change
+        records through write() and remove() only.
+
         Returns:
             FileDict[T]: The data read from the JSON file.
 
         """
-        file_data_text: str = self.file_path.read_text(encoding="utf-8")
-        adapter: TypeAdapter[FileData[T]] = TypeAdapter(FileData[self.model_class])
-        return adapter.validate_json(file_data_text)
+        with self.locked(shared=True):
+            # Only the thread running a batch can get here while it is open
+            if self._batch_data is not None:
+                return self._batch_data
+
+            cached_data = self._fresh_cache()
+            if cached_data is not None:
+                self._count("cache_hits")
+                return cached_data
+
+            # Only one reader reloads; the others wait and reuse its result
+            with self._load_lock:
+                cached_data = self._fresh_cache()
+                if cached_data is not None:
+                    self._count("cache_hits")
+                    return cached_data
+
+                if self.cache_enabled:
+                    self._count("cache_misses")
+                signature = self.signature()
+                file_data: FileData[T] = self.load()
+                if self.cache_enabled:
+                    self._cached_data = file_data
+                    self._cached_signature = signature
+                return file_data
+
+    def _fresh_cache(self) -> FileData[T] | None:
+        """Return the cached data if the file has not changed since"""
+        if not self.cache_enabled or self._cached_data is None:
+            return None
+        if self.signature() != self._cached_signature:
+            return None
+        return self._cached_data
+
+    def load(self) -> FileData[T]:
+        """
+        Parse the file from disk, bypassing the cache.
+
+        Files written before the id sequence existed get it from their
+        highest record id. Compact records are validated a chunk at a
+        time from backends that cut records apart cheaply, so only one
+        chunk of models is held while loading; JSON would be parsed
+        twice, so it is decoded whole and turned into rows afterwards.
+
+        Returns:
+            FileData[T]: The data decoded by the backend.
+
+        """
+        with self._phase("read_file"):
+            raw = self.file_path.read_bytes()
+        self._count("bytes_read", len(raw))
+        self._count("loads")
+
+        # Fragments were encoded from the records this load replaces
+        if self.fragments is not None:
+            self.fragments.clear()
+        with self._phase("decode"):
+            file_data = self._decode(raw)
+        self.advance_sequence(file_data.metadata, file_data.records)
+        return file_data
+
+    def _decode(self, raw: bytes) -> FileData[T]:
+        """Decode and validate the contents of the file"""
+        file_data: FileData[T]
+        chunked_load = self.compact_records and self.backend.random_access
+        if self.parallel_load or chunked_load:
+            metadata, payloads = self.backend.split_records(raw)
+            validated: Iterable[tuple[int, T]]
+            if self.parallel_load:
+                validated = chain.from_iterable(self._validate_parallel(payloads))
+            else:
+                validate_records = self.backend.validate_records
+                validated = chain.from_iterable(
+                    validate_records(payloads[start : start + LOAD_CHUNK_SIZE])
+                    for start in range(0, len(payloads), LOAD_CHUNK_SIZE)
+                )
+            records: RecordsDict[T] = (
+                CompactRecords(self.model_class, validated)  # type: ignore[assignment]
+                if self.compact_records
+                else dict(validated)
+            )
+            file_data = FileData[self.model_class].model_construct(
+                metadata=metadata, records=records
+            )
+        else:
+            file_data = self.backend.decode(raw)
+            if self.compact_records:
+                file_data.records = CompactRecords(  # type: ignore[assignment]
+                    self.model_class, file_data.records.items()
+                )
+        return file_data
+
+    @property
+    def holds_records(self) -> bool:
+        """Whether reads are served from records kept in memory"""
+        return self.cache_enabled or self._batch_data is not None
+
+    def iter_records(self) -> Iterator[tuple[int, T]]:
+        """
+        Yield stored records one at a time.
+
+        With the cache off the records are parsed from the file as they
+        are yielded, so memory stays bounded by the largest record and a
+        caller that stops early never parses the rest. Writes replace the
+        file atomically, so the open file remains a consistent snapshot
+        without holding the lock while the caller iterates. With the
+        cache on, or inside a batch, the records in memory are used.
+
+        Yields:
+            tuple[int, T]: The id and the record.
+
+        """
+        with self.locked(shared=True):
+            if self.holds_records:
+                records: RecordsDict[T] | None = self.read().records
+            else:
+                records = None
+                stream = self.file_path.open("rb")
+
+        if records is not None:
+            # Copy the items, since a writer may change the dict meanwhile
+            yield from snapshot_items(records)
+            return
+
+        with stream:
+            try:
+                yield from self.backend.iter_records(stream)
+            finally:
+                self._count("bytes_read", stream.tell())
+
+    def read_record(self, record_id: int) -> T | None:
+        """
+        Return one record by id without loading the others.
+
+        Cached or batched data is looked up in memory. Otherwise, with a
+        backend that supports random access, the record's blob is found
+        through the offset index in the memory-mapped file and only that
+        record is validated; the index is built on first use and kept up
+        to date by later writes. Other backends stream the file.
+
+        Args:
+            record_id (int): The id of the record.
+
+        Returns:
+            T | None: The record, or None if there is no such id.
+
+        """
+        with self.locked(shared=True):
+            if self._batch_data is not None:
+                return self._batch_data.records.get(record_id)
+            cached_data = self._fresh_cache()
+            if cached_data is not None:
+                self._count("cache_hits")
+                return cached_data.records.get(record_id)
+            if self.offsets is not None:
+                blob = self.offsets.blob(record_id)
+                if blob is None:
+                    return None
+                self._count("bytes_read", len(blob))
+                [(_, record)] = self.backend.validate_records([(record_id, blob)])
+                return record
+            if self.cache_enabled:
+                return self.read().records.get(record_id)
+
+        for current_id, record in self.iter_records():
+            if current_id == record_id:
+                return record
+        return None
+
+    def pool(self) -> Executor:
+        """Return the worker pool, starting it on first use"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = worker_pool(self.workers or 1)
+            return self._pool
+
+    def _validate_parallel(
+        self,
+        payloads: list[tuple[int, Any]],
+        predicate: Callable[[T], bool] | None = None,
+    ) -> Iterator[list[tuple[int, T]]]:
+        """Validate record payloads chunk by chunk on the worker pool"""
+        # A few chunks per worker keep them busy when chunks differ in cost
+        chunks = chunked(payloads, (self.workers or 1) * 4)
+        return self.pool().map(
+            validate_chunk,
+            repeat(type(self.backend)),
+            repeat(self.model_class),
+            chunks,
+            repeat(predicate),
+        )
+
+    def scan_parallel(self, predicate: Callable[[T], bool]) -> list[tuple[int, T]]:
+        """
+        Return the records accepted by predicate, validated on the pool.
+
+        The file is split into chunks that the workers validate and
+        filter, so only the matches are sent back. The predicate must be
+        picklable, such as the matches method of a Query. Without
+        workers, with the cache on or inside a batch the records are
+        already parsed or cheaper to stream, and are filtered here.
+
+        Args:
+            predicate (Callable[[T], bool]): The filter to apply.
+
+        Returns:
+            list[tuple[int, T]]: The ids and records that matched.
+
+        """
+        with self.locked(shared=True):
+            if self.workers and not self.cache_enabled and self._batch_data is None:
+                raw: bytes | None = self.file_path.read_bytes()
+            else:
+                raw = None
+        if raw is None:
+            return [item for item in self.iter_records() if predicate(item[1])]
+
+        self._count("bytes_read", len(raw))
+        _, payloads = self.backend.split_records(raw)
+        return list(chain.from_iterable(self._validate_parallel(payloads, predicate)))
+
+    @staticmethod
+    def advance_sequence(metadata: FileMetaData, ids: Iterable[int]) -> None:
+        """Raise the id sequence so that it covers the given ids"""
+        metadata.last_id = max(metadata.last_id, max(ids, default=0))
+
+    def next_id(self) -> int:
+        """
+        Return the id the next record will get, without reserving it.
+
+        The sequence is kept in the metadata, so this is O(1) once the
+        data is loaded, and ids of deleted records are never handed out
+        again.
+
+        Returns:
+            int: The next free id.
+
+        """
+        with self.locked(shared=True):
+            return self.read().metadata.last_id + 1
+
+    def reserve_ids(self, count: int) -> range:
+        """
+        Reserve a block of ids that no other writer will hand out.
+
+        The reservation is stored right away, so reserve ids in blocks
+        rather than one at a time.
+
+        Args:
+            count (int): The number of ids to reserve.
+
+        Raises:
+            ValueError: If count is negative.
+
+        Returns:
+            range: The reserved ids.
+
+        """
+        if count < 0:
+            raise ValueError("count must not be negative.")
+        with self.locked():
+            stored_data: FileData[T] = self.read()
+            start = stored_data.metadata.last_id + 1
+            if count:
+                self.store_sequence(stored_data, start + count - 1)
+            return range(start, start + count)
+
+    def store_sequence(self, stored_data: FileData[T], last_id: int) -> None:
+        """Raise and store the id sequence; callers hold the lock"""
+        staged_data = self._staged_data()
+        if staged_data is not None:
+            self.advance_sequence(staged_data.metadata, [last_id])
+            self._staged_change()
+            return
+        self.save(stored_data, last_id=last_id)
 
     def write(self, data: RecordsDict[T]) -> None:
         """
@@ -116,20 +812,115 @@ class FileManager(BaseFileManager[T]):
             None
 
         """
-        stored_data: FileData[T] = self.read()
+        with self.locked():
+            staged_data = self._staged_data()
+            if staged_data is not None:
+                staged_data.records.update(data)
+                self.advance_sequence(staged_data.metadata, data)
+                self._staged_change()
+                return
+
+            stored_data: FileData[T] = self.read()
+            records: RecordsDict[T] = stored_data.records.copy()
+            records.update(data)
+            self.save(stored_data, records)
+
+    def remove(self, ids: Iterable[int]) -> None:
+        """
+        Remove records from the JSON file by id.
+
+        Args:
+            ids (Iterable[int]): The ids of the records to remove.
+
+        Returns:
+            None
+
+        """
+        removed: set[int] = set(ids)
+        with self.locked():
+            staged_data = self._staged_data()
+            if staged_data is not None:
+                for record_id in removed:
+                    staged_data.records.pop(record_id, None)
+                self._staged_change()
+                return
+
+            stored_data: FileData[T] = self.read()
+            records: RecordsDict[T] = stored_data.records.copy()
+            for record_id in removed:
+                records.pop(record_id, None)
+            self.save(stored_data, records)
+
+    def touch_metadata(self, stored_data: FileData[T]) -> None:
+        """Apply the configured metadata and bump the update timestamp"""
         stored_data.metadata.version = self.metadata["version"]
         stored_data.metadata.title = self.metadata["title"]
         stored_data.metadata.description = self.metadata["description"]
         stored_data.metadata.timestamps = self.update_timestamps(
             stored_data.metadata.timestamps
         )
-        stored_data.records = {**stored_data.records, **data}
 
-        # Convert pydantic model to json string
-        json_data: str = stored_data.model_dump_json(indent=2)
+    def save(
+        self,
+        stored_data: FileData[T],
+        records: RecordsDict[T] | None = None,
+        last_id: int = 0,
+    ) -> None:
+        """
+        Rewrite the whole file from the given data.
+
+        The new document is built on a copy, and stored_data (usually the
+        cached data) only takes the new records and metadata once the
+        write succeeded, so a failed write leaves the cache untouched.
+
+        With the cache on, the encoding of every record is kept, and
+        records that are still the objects they were when last written
+        are not encoded again. The document is then streamed to disk
+        record by record instead of being built in memory first.
+
+        Args:
+            stored_data (FileData[T]): The current file data.
+            records (RecordsDict[T] | None): The records to store instead
+                of the current ones.
+            last_id (int): A value the id sequence is raised to.
+
+        Returns:
+            None
 
-        # Write Json string to stored file.
-        self.file_path.write_text(f"{json_data}\n")
+        """
+        new_data: FileData[T] = stored_data.model_copy(
+            update={
+                "metadata": stored_data.metadata.model_copy(),
+                "records": stored_data.records if records is None else records,
+            }
+        )
+        self.advance_sequence(new_data.metadata, [last_id, *new_data.records])
+        self.touch_metadata(new_data)
+
+        # Atomically replace the stored file with the encoded data.
+        raw: bytes | None = None
+        with self._phase("encode"):
+            if self.fragments is None:
+                raw = self.backend.encode(new_data)
+                chunks: bytes | Iterator[bytes] = raw
+            else:
+                chunks = self.backend.iter_encode(new_data, self.fragments)
+        with self._phase("write_file"):
+            size = atomic_write(self.file_path, chunks, self.durability)
+        self._count("bytes_written", size)
+        self._count("rewrites")
+
+        # Keep an offset index that is in use current; unused ones are not
+        # built. Streamed data is indexed from the file just written.
+        if self.offsets is not None and self.offsets.index_path.exists():
+            self.offsets.build(raw)
+
+        # Keep the cache in step with what was just written
+        stored_data.metadata = new_data.metadata
+        stored_data.records = new_data.records
+        if self.cache_enabled:
+            self._cached_data = stored_data
+            self._cached_signature = self.signature()
 
     def update_timestamps(self, timestamps: Timestamp | None) -> Timestamp:
         """Return updated timestamp"""
@@ -153,5 +944,47 @@ class FileManager(BaseFileManager[T]):
             None
 
         """
+        with self.locked():
+            self.unlink_files()
+            self.invalidate_cache()
+            self.lock.lock_path.unlink(missing_ok=True)
+        self.close()
+
+    def unlink_files(self) -> None:
+        """Remove the data files of this manager; callers hold the lock"""
         if self.exists() and self.file_path.is_file():
             self.file_path.unlink()
+        if self.offsets is not None:
+            self.offsets.unlink()
+
+    def close(self) -> None:
+        """
+        Release the resources held by the manager.
+
+        Stores the mutations write-behind has staged, then closes the
+        sidecar lock file and stops the worker pool. The manager reopens
+        both on next use, so closing is safe to repeat.
+
+        Returns:
+            None
+
+        """
+        self.flush()
+        self.lock.close()
+        if self.offsets is not None:
+            self.offsets.close()
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
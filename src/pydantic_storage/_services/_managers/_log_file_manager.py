@@ -0,0 +1,360 @@
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from pydantic import TypeAdapter, ValidationError
+
+from pydantic_storage._services._backends._json_backend import JsonBackend
+from pydantic_storage._services._managers._file_manager import FileManager
+from pydantic_storage._utils import (
+    StorageMetrics,
+    append_bytes,
+    changed_records,
+    fsync_directory,
+    snapshot_items,
+    type_adapter,
+)
+from pydantic_storage.abstractions import BaseBackend
+from pydantic_storage.models import FileData, LogEntry
+from pydantic_storage.types import BaseMetaDataDict, Durability, RecordsDict, T
+
+
+class LogFileManager(FileManager[T]):
+    """
+    A file manager that appends mutations to a write-ahead log.
+
+    Every write or remove is appended as one JSON line to a ``.wal`` file
+    next to the snapshot. Reads replay the log over the snapshot, and the
+    log is folded into a fresh snapshot once it grows past the compaction
+    threshold.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        model_class: type[T],
+        metadata: BaseMetaDataDict,
+        cache: bool = True,
+        durability: Durability = "flush",
+        lock_timeout: float | None = 10.0,
+        lock_backoff: float = 0.001,
+        compact_ratio: float = 1.0,
+        compact_min_bytes: int = 1024 * 1024,
+        backend: type[BaseBackend[Any]] = JsonBackend,
+        workers: int | None = None,
+        flush_every: int | None = None,
+        flush_interval: float | None = None,
+        compact_records: bool = False,
+        metrics: StorageMetrics | None = None,
+        unique_fields: list[str] | None = None,
+    ) -> None:
+        """Initialize the log next to the snapshot file"""
+        snapshot_path = Path(file_path)
+        self.log_path: Path = snapshot_path.with_name(f"{snapshot_path.name}.wal")
+        self.compact_ratio: float = compact_ratio
+        self.compact_min_bytes: int = compact_min_bytes
+        self._entry_adapter: TypeAdapter[LogEntry[T]] = type_adapter(
+            LogEntry[model_class]
+        )
+        super().__init__(
+            file_path,
+            model_class,
+            metadata,
+            cache=cache,
+            durability=durability,
+            lock_timeout=lock_timeout,
+            lock_backoff=lock_backoff,
+            backend=backend,
+            workers=workers,
+            flush_every=flush_every,
+            flush_interval=flush_interval,
+            compact_records=compact_records,
+            metrics=metrics,
+            unique_fields=unique_fields,
+        )
+
+    def signature(self) -> tuple[int, ...] | None:
+        """Return the combined signature of the snapshot and the log"""
+        snapshot_signature = super().signature()
+        if snapshot_signature is None:
+            return None
+        try:
+            stat = self.log_path.stat()
+        except FileNotFoundError:
+            return snapshot_signature
+        return (*snapshot_signature, stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def log_size(self) -> int:
+        """Return the size of the log in bytes"""
+        try:
+            return self.log_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def load(self) -> FileData[T]:
+        """
+        Parse the snapshot and replay the log over it.
+
+        A trailing line that fails to parse is treated as a torn append
+        from an interrupted write and ignored.
+
+        Returns:
+            FileData[T]: The current data of the store.
+
+        """
+        stored_data: FileData[T] = super().load()
+        if not self.log_path.exists():
+            return stored_data
+
+        with self._phase("read_file"):
+            log = self.log_path.read_bytes()
+        self._count("bytes_read", len(log))
+        with self._phase("decode"):
+            self.replay(log.splitlines(), stored_data)
+        return stored_data
+
+    def replay(self, lines: list[bytes], stored_data: FileData[T]) -> None:
+        """Apply the log lines to the snapshot data, skipping a torn tail"""
+        for number, line in enumerate(lines, start=1):
+            try:
+                entry: LogEntry[T] = self._entry_adapter.validate_json(line)
+            except ValidationError:
+                if number == len(lines):
+                    break
+                raise
+            self.apply(entry, stored_data.records)
+            self.advance_sequence(stored_data.metadata, [entry.id])
+
+    def iter_records(self) -> Iterator[tuple[int, T]]:
+        """
+        Yield stored records one at a time.
+
+        The log can change where and whether any snapshot record appears,
+        so records are not streamed from the snapshot: the replayed data
+        is read and its items are yielded.
+
+        Yields:
+            tuple[int, T]: The id and the record.
+
+        """
+        with self.locked(shared=True):
+            items = snapshot_items(self.read().records)
+        yield from items
+
+    def read_record(self, record_id: int) -> T | None:
+        """
+        Return one record by id.
+
+        Until the log has entries the snapshot alone is current and the
+        record is read as FileManager does; afterwards it is looked up in
+        the replayed data.
+
+        Args:
+            record_id (int): The id of the record.
+
+        Returns:
+            T | None: The record, or None if there is no such id.
+
+        """
+        with self.locked(shared=True):
+            if self._batch_data is None and not self.log_size():
+                return super().read_record(record_id)
+            return self.read().records.get(record_id)
+
+    def scan_parallel(self, predicate: Callable[[T], bool]) -> list[tuple[int, T]]:
+        """
+        Return the records accepted by predicate.
+
+        The log has to be replayed over the snapshot first, so the
+        replayed records are filtered here; the load itself still runs on
+        the worker pool.
+
+        Args:
+            predicate (Callable[[T], bool]): The filter to apply.
+
+        Returns:
+            list[tuple[int, T]]: The ids and records that matched.
+
+        """
+        return [item for item in self.iter_records() if predicate(item[1])]
+
+    def apply(self, entry: LogEntry[T], records: RecordsDict[T]) -> None:
+        """Apply one log entry to a records map"""
+        if entry.op == "put" and entry.record is not None:
+            records[entry.id] = entry.record
+        elif entry.op == "del":
+            records.pop(entry.id, None)
+
+    def write(self, data: RecordsDict[T]) -> None:
+        """
+        Append the given records to the log.
+
+        Args:
+            data (RecordsDict[T]): The records to insert or replace.
+
+        Returns:
+            None
+
+        """
+        with self.locked():
+            if self._staged_data() is not None:
+                super().write(data)
+                return
+
+            entries: list[LogEntry[T]] = [
+                LogEntry[self.model_class](op="put", id=record_id, record=record)
+                for record_id, record in data.items()
+            ]
+            stored_data: FileData[T] = self.read()
+            self.append(entries, stored_data)
+
+    def flush_batch(self, stored_data: FileData[T], original: FileData[T]) -> None:
+        """Append the difference a batch made to the records as log entries"""
+        staged: RecordsDict[T] = stored_data.records
+        entries: list[LogEntry[T]] = [
+            LogEntry[self.model_class](op="del", id=record_id)
+            for record_id in original.records
+            if record_id not in staged
+        ]
+        entries.extend(
+            LogEntry[self.model_class](op="put", id=record_id, record=record)
+            for record_id, record in changed_records(original.records, staged)
+        )
+        # Keep ids reserved in the batch that no entry above accounts for
+        last_id = stored_data.metadata.last_id
+        highest = max((entry.id for entry in entries), default=0)
+        if last_id > max(highest, original.metadata.last_id):
+            entries.append(LogEntry[self.model_class](op="reserve", id=last_id))
+        self.append(entries, stored_data)
+
+    def store_sequence(self, stored_data: FileData[T], last_id: int) -> None:
+        """Log the raised id sequence instead of rewriting the snapshot"""
+        if self._staged_data() is not None:
+            super().store_sequence(stored_data, last_id)
+            return
+        entry = LogEntry[self.model_class](op="reserve", id=last_id)
+        self.append([entry], stored_data)
+
+    def remove(self, ids: Iterable[int]) -> None:
+        """
+        Append deletions of the given ids to the log.
+
+        Args:
+            ids (Iterable[int]): The ids of the records to remove.
+
+        Returns:
+            None
+
+        """
+        with self.locked():
+            if self._staged_data() is not None:
+                super().remove(ids)
+                return
+
+            stored_data: FileData[T] = self.read()
+            entries: list[LogEntry[T]] = [
+                LogEntry[self.model_class](op="del", id=record_id)
+                for record_id in dict.fromkeys(ids)
+                if record_id in stored_data.records
+            ]
+            self.append(entries, stored_data)
+
+    def append(self, entries: list[LogEntry[T]], stored_data: FileData[T]) -> None:
+        """
+        Append entries to the log, compacting it when it grows too large.
+
+        The entries are applied to stored_data only after they reached
+        the log, so a failed append leaves the cache untouched. Callers
+        must hold the exclusive lock.
+        """
+        if not entries:
+            return
+
+        self.truncate_torn_tail()
+        with self._phase("encode"):
+            lines = b"".join(
+                self._entry_adapter.dump_json(entry) + b"\n"
+                for entry in entries
+            )
+        with self._phase("write_file"):
+            append_bytes(self.log_path, lines, self.durability)
+        self._count("bytes_written", len(lines))
+        self._count("appends")
+
+        for entry in entries:
+            self.apply(entry, stored_data.records)
+        self.advance_sequence(stored_data.metadata, (entry.id for entry in entries))
+        self.touch_metadata(stored_data)
+
+        if self.cache_enabled:
+            self._cached_data = stored_data
+            self._cached_signature = self.signature()
+
+        if self.should_compact():
+            self.compact()
+
+    def truncate_torn_tail(self) -> None:
+        """
+        Cut an incomplete trailing line off the log.
+
+        An interrupted append leaves a line without its newline. Load
+        skips it, but a later append would be glued onto it and lost
+        with it, so the log is cut back to its last complete line first.
+        Callers must hold the exclusive lock.
+
+        Returns:
+            None
+
+        """
+        size = self.log_size()
+        if size == 0:
+            return
+
+        with self.log_path.open("rb+") as log:
+            log.seek(-1, 2)
+            if log.read(1) == b"\n":
+                return
+
+            # Scan backwards chunk by chunk for the last newline
+            end = size
+            chunk_size = 64 * 1024
+            while end > 0:
+                start = max(0, end - chunk_size)
+                log.seek(start)
+                newline = log.read(end - start).rfind(b"\n")
+                if newline != -1:
+                    log.truncate(start + newline + 1)
+                    return
+                end = start
+            log.truncate(0)
+
+    def should_compact(self) -> bool:
+        """Check whether the log has outgrown the snapshot"""
+        snapshot_size = self.file_path.stat().st_size
+        threshold = max(self.compact_min_bytes, self.compact_ratio * snapshot_size)
+        return self.log_size() > threshold
+
+    def compact(self) -> None:
+        """
+        Fold the log into a fresh snapshot and truncate it.
+
+        Replaying a log over a snapshot that already contains its entries
+        is idempotent, so a crash between the two steps loses nothing.
+
+        Returns:
+            None
+
+        """
+        with self.locked():
+            stored_data: FileData[T] = self.read()
+            self.save(stored_data)
+            self.log_path.unlink(missing_ok=True)
+            if self.durability == "fsync":
+                fsync_directory(self.log_path.parent)
+            if self.cache_enabled:
+                self._cached_signature = self.signature()
+
+    def unlink_files(self) -> None:
+        """Remove the snapshot and its log; callers hold the lock"""
+        super().unlink_files()
+        self.log_path.unlink(missing_ok=True)
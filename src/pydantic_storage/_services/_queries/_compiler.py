@@ -0,0 +1,65 @@
+from typing import Any, Generic
+
+from pydantic import TypeAdapter, ValidationError
+
+from pydantic_storage._services._queries._query import (
+    STRING_LOOKUPS,
+    TYPED_LOOKUPS,
+    Query,
+)
+from pydantic_storage._utils import type_adapter
+from pydantic_storage.types import T
+
+
+class QueryCompiler(Generic[T]):
+    """Validates keyword arguments against a model and compiles queries."""
+
+    def __init__(self, model_class: type[T]) -> None:
+        """Build one validator per field, reused by every query."""
+        self.model_class: type[T] = model_class
+        self.field_adapters: dict[str, TypeAdapter[Any]] = {
+            name: type_adapter(field_info.annotation)
+            for name, field_info in model_class.model_fields.items()
+        }
+
+    def validate(self, kwargs: dict[str, Any]) -> None:
+        """Check that every keyword names a field and fits its type."""
+        for key, value in kwargs.items():
+            adapter = self.field_adapters.get(key)
+            if adapter is None:
+                raise ValidationError(
+                    f"Field '{key}' is not a valid field of the model."
+                )
+
+            # Safe validation using the field's cached TypeAdapter
+            try:
+                adapter.validate_python(value)
+            except Exception as _:
+                annotation = self.model_class.model_fields[key].annotation
+                raise ValidationError(
+                    f"Value for field '{key}' must be of type {annotation}, got {value!r}"
+                )
+
+    def compile(self, kwargs: dict[str, Any], **options: Any) -> Query[T]:
+        """Compile and validate lookups such as ``age__gt=18`` into a query."""
+        query: Query[T] = Query(kwargs, **options)
+        for lookup in query.lookups:
+            if lookup.op in TYPED_LOOKUPS:
+                self.validate({lookup.field: lookup.value})
+            elif lookup.op == "in":
+                for value in lookup.value:
+                    self.validate({lookup.field: value})
+            elif lookup.field not in self.field_adapters:
+                raise ValidationError(
+                    f"Field '{lookup.field}' is not a valid field of the model."
+                )
+            elif lookup.op in STRING_LOOKUPS and not isinstance(lookup.value, str):
+                raise ValueError(
+                    f"Value for lookup '{lookup.field}__{lookup.op}' must be a"
+                    f" string, got {lookup.value!r}"
+                )
+
+        unknown = sorted(query.fields - self.field_adapters.keys())
+        if unknown:
+            raise ValueError(f"Cannot query unknown field '{unknown[0]}'.")
+        return query
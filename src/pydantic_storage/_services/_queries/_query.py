@@ -0,0 +1,195 @@
+import operator
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from itertools import islice
+from typing import Any, Generic
+
+from pydantic_storage._services._indexes._hash_index import HashIndex
+from pydantic_storage.types import T
+
+
+def _compare(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    """Wrap an ordering comparison so that None or mismatched types never match"""
+
+    def lookup(actual: Any, expected: Any) -> bool:
+        try:
+            return actual is not None and compare(actual, expected)
+        except TypeError:
+            return False
+
+    return lookup
+
+
+def _contains(actual: Any, expected: Any) -> bool:
+    try:
+        return actual is not None and expected in actual
+    except TypeError:
+        return False
+
+
+def _icontains(actual: Any, expected: Any) -> bool:
+    return isinstance(actual, str) and expected.lower() in actual.lower()
+
+
+def _startswith(actual: Any, expected: Any) -> bool:
+    return isinstance(actual, str) and actual.startswith(expected)
+
+
+def _endswith(actual: Any, expected: Any) -> bool:
+    return isinstance(actual, str) and actual.endswith(expected)
+
+
+LOOKUPS: dict[str, Callable[[Any, Any], bool]] = {
+    "exact": operator.eq,
+    "ne": operator.ne,
+    "gt": _compare(operator.gt),
+    "gte": _compare(operator.ge),
+    "lt": _compare(operator.lt),
+    "lte": _compare(operator.le),
+    "in": lambda actual, expected: actual in expected,
+    "contains": _contains,
+    "icontains": _icontains,
+    "startswith": _startswith,
+    "endswith": _endswith,
+    "isnull": lambda actual, expected: (actual is None) == bool(expected),
+}
+
+# Lookups whose value is compared against the field value itself
+TYPED_LOOKUPS: frozenset[str] = frozenset({"exact", "ne", "gt", "gte", "lt", "lte"})
+
+# Lookups whose value must be a string
+STRING_LOOKUPS: frozenset[str] = frozenset({"icontains", "startswith", "endswith"})
+
+
+class Lookup:
+    """One ``field__op=value`` condition of a query."""
+
+    def __init__(self, key: str, value: Any) -> None:
+        """Split a keyword such as ``age__gt`` into field and operator."""
+        field, _, op = key.rpartition("__")
+        if not field or op not in LOOKUPS:
+            field, op = key, "exact"
+        if op == "in":
+            value = list(value)
+        self.field: str = field
+        self.op: str = op
+        self.value: Any = value
+        self._compare: Callable[[Any, Any], bool] = LOOKUPS[op]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Rebuilt from its keyword so the comparison is never pickled
+        return (Lookup, (f"{self.field}__{self.op}", self.value))
+
+    def matches(self, record: Any) -> bool:
+        """Check whether a record satisfies the condition"""
+        return self._compare(getattr(record, self.field), self.value)
+
+    def candidate_ids(self, index: HashIndex[Any]) -> set[int] | None:
+        """Return the ids an index narrows this lookup to, if it can"""
+        if self.op == "exact":
+            return index.lookup(self.value)
+        if self.op == "in":
+            return set().union(*(index.lookup(value) for value in self.value))
+        return None
+
+
+class Query(Generic[T]):
+    """
+    A filter compiled once from Django-style keyword lookups.
+
+    Keywords take the form ``field`` or ``field__op`` where op is one of
+    exact, ne, gt, gte, lt, lte, in, contains, icontains, startswith,
+    endswith or isnull. Matching records can be ordered (prefix a field
+    with ``-`` to sort descending), paged with offset and limit, and
+    projected onto a subset of fields with only.
+    """
+
+    def __init__(
+        self,
+        kwargs: Mapping[str, Any],
+        order_by: str | list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        only: list[str] | None = None,
+    ) -> None:
+        """Compile the lookups and result options."""
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative.")
+        if offset < 0:
+            raise ValueError("offset must not be negative.")
+        self.lookups: list[Lookup] = [
+            Lookup(key, value) for key, value in kwargs.items()
+        ]
+        if isinstance(order_by, str):
+            order_by = [order_by]
+        self.order_by: list[str] = order_by or []
+        self.limit: int | None = limit
+        self.offset: int = offset
+        self.only: list[str] | None = only
+
+    @property
+    def fields(self) -> set[str]:
+        """Return every field the query refers to"""
+        fields = {lookup.field for lookup in self.lookups}
+        fields.update(field.removeprefix("-") for field in self.order_by)
+        fields.update(self.only or [])
+        return fields
+
+    def matches(self, record: T) -> bool:
+        """Check whether a record satisfies every lookup"""
+        return all(lookup.matches(record) for lookup in self.lookups)
+
+    def candidate_ids(self, indexes: Mapping[str, HashIndex[T]]) -> set[int] | None:
+        """
+        Plan the query against the available indexes.
+
+        Returns:
+            set[int] | None: The ids the indexed lookups narrow the query
+                to, or None if no index can be used and a scan is needed.
+
+        """
+        candidates: set[int] | None = None
+        for lookup in self.lookups:
+            index = indexes.get(lookup.field)
+            if index is None:
+                continue
+            ids = lookup.candidate_ids(index)
+            if ids is None:
+                continue
+            candidates = ids if candidates is None else candidates & ids
+        return candidates
+
+    def results(self, matches: Iterator[T]) -> list[T]:
+        """
+        Order and page the records that matched the lookups.
+
+        Without an ordering the matches are consumed lazily and the scan
+        behind them stops as soon as the page is full.
+        """
+        if self.order_by:
+            ordered = list(matches)
+            # Stable sorts applied from the last key to the first
+            for field in reversed(self.order_by):
+                name = field.removeprefix("-")
+                descending = field.startswith("-")
+                ordered.sort(
+                    key=lambda record: self._sort_key(
+                        getattr(record, name), descending
+                    ),
+                    reverse=descending,
+                )
+            matches = iter(ordered)
+
+        stop = None if self.limit is None else self.offset + self.limit
+        return list(islice(matches, self.offset, stop))
+
+    def project(self, records: Iterable[T]) -> list[dict[str, Any]]:
+        """Reduce records to the fields listed in only"""
+        return [
+            {field: getattr(record, field) for field in self.only or []}
+            for record in records
+        ]
+
+    @staticmethod
+    def _sort_key(value: Any, descending: bool) -> tuple[bool, Any]:
+        """Sort None after every other value in either direction"""
+        return ((value is None) != descending, value)
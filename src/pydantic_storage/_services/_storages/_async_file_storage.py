@@ -0,0 +1,227 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from types import TracebackType
+from typing import Any, Self
+
+from pydantic_storage._services._storages._file_storage import FileStorage
+from pydantic_storage.abstractions import BaseAsyncFileStorage, BaseBackend
+from pydantic_storage.types import Durability, StorageMode
+from pydantic_storage.types._generic_types import T
+from pydantic_storage.types._model_dict_types import BaseMetaDataDict
+
+# A queued mutation and the future its caller is waiting on
+PendingWrite = tuple[Callable[[], Any], asyncio.Future[Any]]
+
+# Outcome of one queued mutation: (succeeded, result or exception)
+Outcome = tuple[bool, Any]
+
+
+class AsyncFileStorage(BaseAsyncFileStorage[T]):
+    def __init__(
+        self,
+        file_path: str,
+        model_class: type[T],
+        metadata: BaseMetaDataDict,
+        unique_fields: list[str] | None = None,
+        cache: bool = True,
+        indexed_fields: list[str] | None = None,
+        mode: StorageMode = "snapshot",
+        durability: Durability = "flush",
+        lock_timeout: float | None = 10.0,
+        lock_backoff: float = 0.001,
+        max_workers: int | None = None,
+        backend: type[BaseBackend[Any]] | None = None,
+    ) -> None:
+        """
+        Initialize the AsyncFileStorage.
+
+        Every call is run on a thread pool, so file I/O and validation
+        never block the event loop. Mutations issued in the same loop tick
+        are coalesced: they run one after another inside a single batch
+        and reach the disk with one write. Each caller still gets its own
+        result or exception.
+
+        The remaining arguments are passed to the wrapped FileStorage;
+        max_workers sizes the thread pool.
+        """
+        super().__init__(file_path, model_class, metadata, unique_fields)
+        self.storage: FileStorage[T] = FileStorage(
+            file_path,
+            model_class,
+            metadata,
+            unique_fields=unique_fields,
+            cache=cache,
+            indexed_fields=indexed_fields,
+            mode=mode,
+            durability=durability,
+            lock_timeout=lock_timeout,
+            lock_backoff=lock_backoff,
+            backend=backend,
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="pydantic-storage",
+        )
+        self._pending: list[PendingWrite] = []
+        self._flush_task: asyncio.Task[None] | None = None
+
+    async def aclose(self) -> None:
+        """Wait for queued writes, then stop the pool and release the lock."""
+        if self._flush_task is not None:
+            await self._flush_task
+        self._executor.shutdown(wait=True)
+        self.storage.close()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking storage call on the thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    async def _write(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Queue a mutation for the next coalesced flush and wait for it."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        self._pending.append((partial(func, *args, **kwargs), future))
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush())
+        return await future
+
+    async def _flush(self) -> None:
+        """Store queued mutations batch by batch until the queue is empty."""
+        loop = asyncio.get_running_loop()
+        writes: list[PendingWrite] = []
+        try:
+            # Yield once so every write issued in this tick joins the batch
+            await asyncio.sleep(0)
+            while self._pending:
+                writes, self._pending = self._pending, []
+                outcomes: list[Outcome] = await loop.run_in_executor(
+                    self._executor,
+                    self._run_batch,
+                    [call for call, _ in writes],
+                )
+                for (_, future), (succeeded, value) in zip(writes, outcomes):
+                    if future.done():
+                        continue
+                    if succeeded:
+                        future.set_result(value)
+                    else:
+                        future.set_exception(value)
+                writes = []
+        finally:
+            # Never leave a caller waiting if the flush itself was cancelled
+            for _, future in [*writes, *self._pending]:
+                if not future.done():
+                    future.cancel()
+            self._pending = []
+            self._flush_task = None
+
+    def _run_batch(self, calls: list[Callable[[], Any]]) -> list[Outcome]:
+        """
+        Run mutations inside one storage batch; called on the thread pool.
+
+        A mutation that raises does not stop the others. If the final
+        write fails, nothing was stored, so every mutation that had
+        succeeded reports that error instead of its result.
+        """
+        outcomes: list[Outcome] = []
+        try:
+            with self.storage.transaction():
+                for call in calls:
+                    try:
+                        outcomes.append((True, call()))
+                    except Exception as error:
+                        outcomes.append((False, error))
+        except Exception as error:
+            return [
+                (False, error if succeeded else value)
+                for succeeded, value in outcomes
+            ]
+        return outcomes
+
+    async def all(self) -> list[T]:
+        """Retrieve all items from the storage."""
+        return await self._run(self.storage.all)
+
+    async def get(self, **kwargs: Any) -> T | None:
+        """Retrieve an item based on key-value pairs."""
+        return await self._run(self.storage.get, **kwargs)
+
+    async def get_by_id(self, record_id: int) -> T | None:
+        """Retrieve an item by its record id."""
+        return await self._run(self.storage.get_by_id, record_id)
+
+    async def first(self) -> T | None:
+        """Retrieve the first item from the storage."""
+        return await self._run(self.storage.first)
+
+    async def last(self) -> T | None:
+        """Retrieve the last item from the storage."""
+        return await self._run(self.storage.last)
+
+    async def count(self) -> int:
+        """Count the number of items in the storage."""
+        return await self._run(self.storage.count)
+
+    async def exists(self, **kwargs: Any) -> bool:
+        """Check if an item exists by key and value."""
+        return await self._run(self.storage.exists, **kwargs)
+
+    async def next_id(self) -> int:
+        """Return next id as for previous records."""
+        return await self._run(self.storage.next_id)
+
+    async def reserve_ids(self, count: int) -> range:
+        """Reserve a block of ids, coalesced with writes from the same tick."""
+        return await self._write(self.storage.reserve_ids, count)
+
+    async def create(self, items: list[T]) -> list[T]:
+        """Create new items, coalesced with writes from the same tick."""
+        return await self._write(self.storage.create, items)
+
+    async def update(self, items: T, **kwargs: Any) -> T:
+        """Update item with provided kwargs."""
+        return await self._write(self.storage.update, items, **kwargs)
+
+    async def update_by_id(self, record_id: int, **kwargs: Any) -> T | None:
+        """Update the item with the given record id."""
+        return await self._write(self.storage.update_by_id, record_id, **kwargs)
+
+    async def update_where(self, changes: dict[str, Any], **kwargs: Any) -> list[T]:
+        """Apply changes to every item matching key-value pairs."""
+        return await self._write(self.storage.update_where, changes, **kwargs)
+
+    async def filter(self, **kwargs: Any) -> list[T]:
+        """Filter items based on kwargs."""
+        return await self._run(self.storage.filter, **kwargs)
+
+    async def delete(self, **kwargs: Any) -> list[T] | None:
+        """Delete an item by key and value."""
+        return await self._write(self.storage.delete, **kwargs)
+
+    async def delete_by_id(self, record_id: int) -> T | None:
+        """Delete the item with the given record id."""
+        return await self._write(self.storage.delete_by_id, record_id)
+
+    async def delete_where(self, **kwargs: Any) -> list[T]:
+        """Delete every item matching key-value pairs."""
+        return await self._write(self.storage.delete_where, **kwargs)
+
+    async def clear(self) -> bool:
+        """Clear all items from the storage."""
+        return await self._write(self.storage.clear)
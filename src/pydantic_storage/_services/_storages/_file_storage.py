@@ -1,147 +1,637 @@
-from typing import Any
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from types import TracebackType
+from typing import Any, Self, overload
 
-from pydantic import TypeAdapter, ValidationError
-from pydantic.fields import FieldInfo
+from pydantic import ValidationError
 
-from pydantic_storage._services import FileManager
-from pydantic_storage.abstractions import BaseFileStorage
+from pydantic_storage._services import (
+    FileManager,
+    HashIndex,
+    JsonBackend,
+    LogFileManager,
+    Query,
+    QueryCompiler,
+    RecordIndex,
+)
+from pydantic_storage._utils import JsonlTarget, StorageMetrics, measured
+from pydantic_storage.abstractions import BaseBackend, BaseFileStorage
+from pydantic_storage.exceptions import DuplicateEntryError
+from pydantic_storage.models import FileData
+from pydantic_storage.types import Durability, RecordsDict, StorageMode
 from pydantic_storage.types._generic_types import T
 from pydantic_storage.types._model_dict_types import BaseMetaDataDict
 
 
 class FileStorage(BaseFileStorage[T]):
+    # The on-disk format used when no backend is passed
+    default_backend: type[BaseBackend[Any]] = JsonBackend
+
     def __init__(
         self,
         file_path: str,
         model_class: type[T],
         metadata: BaseMetaDataDict,
         unique_fields: list[str] | None = None,
+        cache: bool = True,
+        indexed_fields: list[str] | None = None,
+        mode: StorageMode = "snapshot",
+        durability: Durability = "flush",
+        lock_timeout: float | None = 10.0,
+        lock_backoff: float = 0.001,
+        compact_ratio: float = 1.0,
+        compact_min_bytes: int = 1024 * 1024,
+        backend: type[BaseBackend[Any]] | None = None,
+        workers: int | None = None,
+        flush_every: int | None = None,
+        flush_interval: float | None = None,
+        compact_records: bool = False,
+        metrics: StorageMetrics | None = None,
     ) -> None:
-        """Initialize the JsonFileStorage."""
+        """
+        Initialize the JsonFileStorage.
+
+        With mode="snapshot" every mutation rewrites the whole file. With
+        mode="wal" mutations are appended to a log next to the file, which
+        is compacted into the snapshot once it exceeds compact_min_bytes
+        and compact_ratio times the snapshot size.
+
+        Writes always replace the file atomically; durability chooses how
+        much syncing is done: "none", "flush" (hand the data to the OS) or
+        "fsync" (sync file and directory to disk, slowest and safest).
+
+        Mutations hold an advisory lock on a sidecar ``.lock`` file, so
+        several processes can share one store. lock_timeout bounds the
+        wait (None blocks forever) and lock_backoff is the first delay
+        between attempts.
+
+        backend chooses the file format, JsonBackend by default. The
+        BinaryBackend stores length-prefixed records, which are smaller
+        and faster to load than indented JSON.
+
+        workers opts in to CPU-parallel validation on that many processes
+        (threads on free-threaded builds). With the cache off, filter()
+        has the file validated and matched in chunks on the pool, and
+        only the matches come back. On free-threaded builds loads are
+        split across the threads too.
+
+        flush_every and flush_interval turn on write-behind batching:
+        mutations are staged in memory and stored together by a
+        background flush after that many mutations or that many seconds.
+        A crash loses what was not flushed yet, and other processes only
+        see the changes once they are; flush() and close() store them.
+
+        compact_records keeps the loaded records as tuples of field values
+        and builds models, without validating them again, as they are
+        accessed. Memory per record drops several times over, at the cost
+        of building a model for every record a scan looks at.
+
+        metrics opts in to instrumentation: every operation is timed and
+        the bytes read and written, cache hits and misses, loads and
+        full-file rewrites it caused are counted on the given
+        StorageMetrics, which can be exported as a dict or passed to
+        listeners. Iterators and transactions are not timed as
+        operations; what they read and write still adds to the totals.
+        """
         super().__init__(file_path, model_class, metadata, unique_fields)
-        self.manager = FileManager(file_path, model_class, metadata)
+        backend = backend or self.default_backend
+        self.metrics: StorageMetrics | None = metrics
+        self.manager: FileManager[T]
+        if mode == "wal":
+            self.manager = LogFileManager(
+                file_path,
+                model_class,
+                metadata,
+                cache=cache,
+                durability=durability,
+                lock_timeout=lock_timeout,
+                lock_backoff=lock_backoff,
+                compact_ratio=compact_ratio,
+                compact_min_bytes=compact_min_bytes,
+                backend=backend,
+                workers=workers,
+                flush_every=flush_every,
+                flush_interval=flush_interval,
+                compact_records=compact_records,
+                metrics=metrics,
+                unique_fields=self.unique_fields,
+            )
+        else:
+            self.manager = FileManager(
+                file_path,
+                model_class,
+                metadata,
+                cache=cache,
+                durability=durability,
+                lock_timeout=lock_timeout,
+                lock_backoff=lock_backoff,
+                backend=backend,
+                workers=workers,
+                flush_every=flush_every,
+                flush_interval=flush_interval,
+                compact_records=compact_records,
+                metrics=metrics,
+                unique_fields=self.unique_fields,
+            )
+
+        # Hash indexes cover unique fields plus any extra declared fields
+        fields = list(dict.fromkeys([*self.unique_fields, *(indexed_fields or [])]))
+        for field in fields:
+            if field not in model_class.model_fields:
+                raise ValueError(f"Cannot index unknown field '{field}'.")
+        self.indexes: dict[str, HashIndex[T]] = {
+            field: HashIndex(field, unique=field in self.unique_fields)
+            for field in fields
+        }
+        self.record_index: RecordIndex[T] = RecordIndex()
+        self._indexed_data: FileData[T] | None = None
+        self._record_index_built: bool = False
+        self._index_lock = threading.Lock()
+
+        # Validates query keywords with one cached validator per field
+        self.queries: QueryCompiler[T] = QueryCompiler(model_class)
+
+    def invalidate_cache(self) -> None:
+        """Force the next read to reload records from disk."""
+        self.manager.invalidate_cache()
+
+    @measured
+    def flush(self) -> None:
+        """Store the mutations staged by write-behind batching."""
+        self.manager.flush()
+
+    def close(self) -> None:
+        """Store staged mutations and release the file lock held by the manager."""
+        self.manager.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Run the block as one unit of work, stored with a single write.
+
+        Creates, updates and deletes inside the block are staged in memory
+        and written atomically when it exits; reads inside it see them.
+        If the block raises, none of them are stored. The exclusive lock
+        is held throughout, and mutations staged by write-behind are
+        flushed before the block starts.
+        """
+        try:
+            with self.manager.batch():
+                yield
+        except BaseException:
+            # The staged records were dropped, so the indexes are stale
+            self._indexed_data = None
+            raise
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group mutations into one write; the same as transaction()."""
+        with self.transaction():
+            yield
+
+    def _records(self, build_indexes: bool | None = None) -> RecordsDict[T]:
+        """
+        Return stored records, (re)building indexes if the file was reloaded.
+
+        Without the cache every read returns freshly parsed data, so field
+        indexes are only built when build_indexes asks for them (the write
+        path needs them for unique checks) rather than on every lookup.
+        """
+        data = self.manager.read()
+        if build_indexes is None:
+            build_indexes = self.manager.cache_enabled
+        if build_indexes and data is not self._indexed_data:
+            with self._index_lock:
+                if data is not self._indexed_data:
+                    for index in self.indexes.values():
+                        index.build(data.records)
+                    self._record_index_built = False
+                    self._indexed_data = data
+        return data.records
+
+    def _indexes_current(self, records: RecordsDict[T]) -> bool:
+        """Check whether the field indexes describe the given records."""
+        return self._indexed_data is not None and self._indexed_data.records is records
+
+    def _ensure_record_index(self, records: RecordsDict[T]) -> None:
+        """Build the full-record index, which only create() needs."""
+        if not self._record_index_built:
+            self.record_index.build(records)
+            self._record_index_built = True
+
+    def _active_indexes(self) -> list[HashIndex[T]]:
+        indexes = list(self.indexes.values())
+        if self._record_index_built:
+            indexes.append(self.record_index)
+        return indexes
+
+    def _index_record(self, record_id: int, record: T) -> None:
+        for index in self._active_indexes():
+            index.add(record_id, record)
+
+    def _unindex_record(self, record_id: int, record: T) -> None:
+        for index in self._active_indexes():
+            index.remove(record_id, record)
+
+    def _check_unique(self, record: T, record_id: int | None = None) -> None:
+        """Raise DuplicateEntryError if record clashes on a unique field."""
+        for field in self.unique_fields:
+            if self.indexes[field].lookup_record(record) - {record_id}:
+                raise DuplicateEntryError([field])
+
+    def _is_duplicate(
+        self,
+        item: T,
+        records: RecordsDict[T],
+        pending: RecordsDict[T],
+    ) -> bool:
+        """Check whether an identical record is stored or pending creation."""
+        for record_id in self.record_index.lookup_record(item):
+            record = pending[record_id] if record_id in pending else records[record_id]
+            if record == item:
+                return True
+        return False
+
+    def _lookup(
+        self, query: Query[T], records: RecordsDict[T] | None = None
+    ) -> Iterator[tuple[int, T]]:
+        """
+        Yield (id, record) pairs matching a query, using indexes if possible.
+
+        Writers pass the records they loaded, so nothing is read twice.
+        """
+        candidates: Iterator[tuple[int, T]]
+        if records is None and not self.manager.cache_enabled:
+            # Nothing is kept in memory, so stream instead of loading it all
+            candidates = self.manager.iter_records()
+        else:
+            if records is None:
+                records = self._records()
+            ids = None
+            if self._indexes_current(records):
+                ids = query.candidate_ids(self.indexes)
+            if ids is not None:
+                candidates = ((i, records[i]) for i in sorted(ids))
+            else:
+                candidates = iter(records.items())
+
+        for record_id, record in candidates:
+            if query.matches(record):
+                yield record_id, record
+
+    @measured
     def all(self) -> list[T]:
         """Retrieve all items from the storage."""
-        records = self.manager.read().records
-        return list(records.values())
+        with self.manager.locked(shared=True):
+            records = self.manager.read().records
+            return list(records.values())
 
-    def __validate_kwargs(self, kwargs: dict[str, Any]) -> None:
-        field_list: dict[str, FieldInfo] = self.model_class.model_fields
-        for key, value in kwargs.items():
-            if key not in field_list:
-                raise ValidationError(
-                    f"Field '{key}' is not a valid field of the model."
-                )
+    def iter(self) -> Iterator[T]:
+        """Yield items one at a time without building a list of them."""
+        for _, record in self.manager.iter_records():
+            yield record
 
-            field_info = field_list[key]
-            annotation = field_info.annotation
-
-            # Safe validation using Pydantic TypeAdapter
-            try:
-                TypeAdapter(annotation).validate_python(value)
-            except Exception as _:
-                raise ValidationError(
-                    f"Value for field '{key}' must be of type {annotation}, got {value!r}"
-                )
+    def iter_filter(self, **kwargs: Any) -> Iterator[T]:
+        """Yield items matching kwargs one at a time."""
+        query = self.queries.compile(kwargs)
+        if not self.manager.cache_enabled:
+            yield from (record for _, record in self._lookup(query))
+            return
+        with self.manager.locked(shared=True):
+            matches = [record for _, record in self._lookup(query)]
+        yield from matches
 
+    @measured
     def get(self, **kwargs: Any) -> T | None:
         """Retrieve an items baased on key-value pairs."""
-        self.__validate_kwargs(kwargs)
-        for record in self.all():
-            if all(getattr(record, k) == v for k, v in kwargs.items()):
+        query = self.queries.compile(kwargs)
+        with self.manager.locked(shared=True):
+            for _, record in self._lookup(query):
                 return record
         return None
 
+    @measured
+    def get_by_id(self, record_id: int) -> T | None:
+        """
+        Retrieve an item by its record id.
+
+        Answered from memory when the records are cached. Otherwise the
+        BinaryBackend reads just this record through its offset index,
+        however large the file is.
+        """
+        return self.manager.read_record(record_id)
+
+    @measured
     def first(self) -> T | None:
         """Retrieve the first item from the storage."""
-        records = self.all()
-        if len(records) > 0:
-            return records[0]
-        return None
+        return next(self.iter(), None)
 
+    @measured
     def last(self) -> T | None:
         """Retrieve the last item from the storage."""
-        records = self.all()
-        if len(records) > 0:
-            return records[-1]
-        return None
+        with self.manager.locked(shared=True):
+            if self.manager.holds_records:
+                records = self.manager.read().records
+                last_id = next(reversed(records), None)
+                return None if last_id is None else records[last_id]
 
+        # Nothing is kept in memory, so stream instead of loading it all
+        record: T | None = None
+        for record in self.iter():
+            pass
+        return record
+
+    @measured
     def count(self) -> int:
         """Count the number of items in the storage."""
-        return len(self.all())
+        with self.manager.locked(shared=True):
+            if self.manager.holds_records:
+                return len(self.manager.read().records)
+        return sum(1 for _ in self.manager.iter_records())
 
+    @measured
     def exists(self, **kwargs: Any) -> bool:
         """Check if an item exists by key and value."""
-        self.__validate_kwargs(kwargs)
-        for record in self.all():
-            if all(getattr(record, k) == v for k, v in kwargs.items()):
+        query = self.queries.compile(kwargs)
+        with self.manager.locked(shared=True):
+            for _ in self._lookup(query):
                 return True
         return False
 
+    @measured
     def next_id(self) -> int:
-        """Return next id as for previous recods"""
-        previous_recod = self.count()
-        return previous_recod + 1
+        """Return the next id from the persisted sequence in O(1)."""
+        return self.manager.next_id()
+
+    @measured
+    def reserve_ids(self, count: int) -> range:
+        """Reserve a block of ids that will never be handed out again."""
+        return self.manager.reserve_ids(count)
 
+    @measured
     def create(self, items: list[T]) -> list[T]:
-        """Create a new item in the storage."""
-        created_records: list[T] = []
+        """Create new items in the storage with a single write."""
+        return self._create(items)
+
+    def _create(self, items: list[T], check_duplicates: bool = True) -> list[T]:
+        """
+        Create items, skipping those identical to a stored or earlier one.
+
+        Without check_duplicates the caller vouches there are none, so the
+        index of whole records is neither built nor consulted; unique
+        fields are checked either way.
+        """
         for item in items:
             if not isinstance(item, self.model_class):
                 raise ValidationError(
                     f"Item must be an instance of {self.model_class.__name__}, got {type(item).__name__}"
                 )
-            if not self.exists(**item.model_dump()):
-                self.manager.write(
-                    {self.next_id(): item},
-                )
-                created_records.append(item)
-        return created_records
 
+        with self.manager.locked():
+            # Load once and check duplicates against the in-memory indexes
+            records = self._records(build_indexes=True)
+            if check_duplicates:
+                self._ensure_record_index(records)
+
+            next_id = self.next_id()
+            new_records: dict[int, T] = {}
+            try:
+                for item in items:
+                    if check_duplicates and self._is_duplicate(
+                        item, records, new_records
+                    ):
+                        continue
+                    self._check_unique(item)
+                    new_records[next_id] = item
+                    self._index_record(next_id, item)
+                    next_id += 1
+
+                if new_records:
+                    self.manager.write(new_records)
+            except BaseException:
+                # Nothing was stored, so drop what was indexed for this batch
+                for record_id, record in new_records.items():
+                    self._unindex_record(record_id, record)
+                raise
+            return list(new_records.values())
+
+    @measured
+    def export_jsonl(self, target: JsonlTarget) -> int:
+        """Write every item as one line of JSON, in storage order."""
+        return super().export_jsonl(target)
+
+    @measured
+    def import_jsonl(
+        self,
+        source: JsonlTarget,
+        chunk_size: int = 10_000,
+        check_duplicates: bool = True,
+    ) -> int:
+        """
+        Create the items read from JSON Lines in one transaction.
+
+        Lines are still validated and created a chunk at a time, but the
+        file is written once at the end, and not at all if a line fails
+        to validate or clashes on a unique field. check_duplicates=False
+        skips building and probing the index of whole records.
+        """
+        with self.transaction():
+            return super().import_jsonl(source, chunk_size, check_duplicates)
+
+    def _import_chunk(self, items: list[T], check_duplicates: bool) -> list[T]:
+        return self._create(items, check_duplicates)
+
+    @measured
     def update(self, items: T, **kwargs: Any) -> T:
         """Update item with provided kwargs"""
         if not isinstance(items, self.model_class):
             raise ValidationError(
                 f"Item must be an instance of {self.model_class.__name__}, got {type(items).__name__}"
             )
-        self.__validate_kwargs(kwargs)
-
-        records = self.all()
-        for i, record in enumerate(records):
-            if record == items:
-                for key, value in kwargs.items():
-                    setattr(record, key, value)
-                records[i] = record
-                self.manager.write({i + 1: record})
-                return record
-        raise ValidationError(f"Item {items} not found in storage for update.")
+        self.queries.validate(kwargs)
 
-    def filter(self, **kwargs: Any) -> list[T]:
-        """Filter items based on kwargs"""
-        self.__validate_kwargs(kwargs)
-        filtered_records: list[T] = []
-        for record in self.all():
-            if all(getattr(record, k) == v for k, v in kwargs.items()):
-                filtered_records.append(record)
-        return filtered_records
+        with self.manager.locked():
+            for record_id, record in self._records(build_indexes=True).items():
+                if record == items:
+                    return self._update_records([(record_id, record)], kwargs)[0]
+            raise ValidationError(f"Item {items} not found in storage for update.")
 
+    @measured
+    def update_by_id(self, record_id: int, **kwargs: Any) -> T | None:
+        """Update the item with the given record id; None if there is none."""
+        self.queries.validate(kwargs)
+        with self.manager.locked():
+            record = self._records(build_indexes=True).get(record_id)
+            if record is None:
+                return None
+            return self._update_records([(record_id, record)], kwargs)[0]
+
+    @measured
+    def update_where(self, changes: dict[str, Any], **kwargs: Any) -> list[T]:
+        """
+        Apply changes to every item matching the lookups in kwargs.
+
+        Matches are found through the indexes where possible and only the
+        records that actually change are written, all in one write.
+
+        Returns:
+            list[T]: The updated items, in storage order.
+
+        """
+        self.queries.validate(changes)
+        query = self.queries.compile(kwargs)
+        with self.manager.locked():
+            records = self._records(build_indexes=True)
+            matches = list(self._lookup(query, records))
+            return self._update_records(matches, changes)
+
+    def _update_records(
+        self, matches: list[tuple[int, T]], changes: dict[str, Any]
+    ) -> list[T]:
+        """
+        Apply changes to records and store the changed ones with one write.
+
+        Callers hold the lock and have built the indexes. If a unique
+        field clashes or the write fails, nothing is stored and the
+        indexes are restored.
+        """
+        updated_records: list[T] = []
+        changed: dict[int, T] = {}
+        try:
+            for record_id, record in matches:
+                # Copy on write: readers holding the old model never see it change
+                updated = record.model_copy(update=changes)
+                updated_records.append(updated)
+                if updated == record:
+                    continue
+                self._check_unique(updated, record_id)
+                self._unindex_record(record_id, record)
+                self._index_record(record_id, updated)
+                changed[record_id] = updated
+            if changed:
+                self.manager.write(changed)
+        except BaseException:
+            for record_id, record in matches:
+                if record_id in changed:
+                    self._unindex_record(record_id, changed[record_id])
+                    self._index_record(record_id, record)
+            raise
+        return updated_records
+
+    @overload
+    def filter(
+        self,
+        *,
+        order_by: str | list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        only: None = None,
+        **kwargs: Any,
+    ) -> list[T]: ...
+
+    @overload
+    def filter(
+        self,
+        *,
+        order_by: str | list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        only: list[str],
+        **kwargs: Any,
+    ) -> list[dict[str, Any]]: ...
+
+    @measured
+    def filter(
+        self,
+        *,
+        order_by: str | list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        only: list[str] | None = None,
+        **kwargs: Any,
+    ) -> list[T] | list[dict[str, Any]]:
+        """
+        Filter items with Django-style lookups.
+
+        Keywords are ``field=value`` or ``field__op=value`` with op one of
+        exact, ne, gt, gte, lt, lte, in, contains, icontains, startswith,
+        endswith or isnull. Equality and ``in`` lookups on indexed fields
+        are answered from the indexes. order_by sorts by one or more
+        fields (``-field`` for descending), offset and limit page the
+        result, and only returns dicts holding just the listed fields.
+        """
+        query = self.queries.compile(
+            kwargs, order_by=order_by, limit=limit, offset=offset, only=only
+        )
+        with self.manager.locked(shared=True):
+            matches: Iterable[tuple[int, T]]
+            if self.manager.workers and not self.manager.cache_enabled:
+                # Validate and match chunks on the pool instead of streaming
+                matches = self.manager.scan_parallel(query.matches)
+            else:
+                matches = self._lookup(query)
+            records = query.results(record for _, record in matches)
+        if only is not None:
+            return query.project(records)
+        return records
+
+    @measured
     def delete(self, **kwargs: Any) -> list[T] | None:
         """Delete an item by key and value."""
-        self.__validate_kwargs(kwargs)
-        deleted_record: list[T] = []
-        non_deleted_records: dict[int, T] = {}
-        for i, record in enumerate(self.all()):
-            if all(getattr(record, k) == v for k, v in kwargs.items()):
-                deleted_record.append(record)
-                del record
-                self.manager.write(non_deleted_records)
-                return deleted_record
-            else:
-                non_deleted_records[i + 1] = record
-        return None
+        query = self.queries.compile(kwargs)
+        with self.manager.locked():
+            for record_id, record in self._lookup(query):
+                self.manager.remove([record_id])
+                self._unindex_record(record_id, record)
+                return [record]
+            return None
+
+    @measured
+    def delete_by_id(self, record_id: int) -> T | None:
+        """Delete the item with the given record id and return it."""
+        with self.manager.locked():
+            record = self._records(build_indexes=True).get(record_id)
+            if record is None:
+                return None
+            self.manager.remove([record_id])
+            self._unindex_record(record_id, record)
+            return record
+
+    @measured
+    def delete_where(self, **kwargs: Any) -> list[T]:
+        """
+        Delete every item matching the lookups in kwargs with one write.
+
+        Returns:
+            list[T]: The deleted items, in storage order.
+
+        """
+        query = self.queries.compile(kwargs)
+        with self.manager.locked():
+            records = self._records(build_indexes=True)
+            matches = list(self._lookup(query, records))
+            if matches:
+                self.manager.remove([record_id for record_id, _ in matches])
+            for record_id, record in matches:
+                self._unindex_record(record_id, record)
+        return [record for _, record in matches]
 
+    @measured
     def clear(self) -> bool:
         """Clear all items from the storage."""
-        self.manager.write({})
+        with self.manager.locked():
+            self.manager.remove(list(self._records()))
+            self._indexed_data = None
         return True
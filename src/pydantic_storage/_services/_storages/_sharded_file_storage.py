@@ -0,0 +1,780 @@
+import threading
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from hashlib import blake2b
+from itertools import chain
+from operator import itemgetter
+from types import TracebackType
+from typing import Any, Generic, Self, TypeVar, overload
+
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import to_json
+
+from pydantic_storage._services import (
+    FileManager,
+    HashIndex,
+    JsonBackend,
+    LogFileManager,
+    Query,
+    QueryCompiler,
+    RecordIndex,
+)
+from pydantic_storage._utils import FileLock, ReadWriteLock, atomic_write, type_adapter
+from pydantic_storage.abstractions import BaseBackend, BaseFileStorage
+from pydantic_storage.exceptions import DuplicateEntryError
+from pydantic_storage.models import FileData, ShardManifest
+from pydantic_storage.types import Durability, RecordsDict, ShardPartition, StorageMode
+from pydantic_storage.types._generic_types import T
+from pydantic_storage.types._model_dict_types import BaseMetaDataDict
+
+R = TypeVar("R")
+S = TypeVar("S")
+
+# Shard count of hash partitions when none is given
+DEFAULT_SHARDS = 8
+
+
+class _Shard(Generic[T]):
+    """One shard file and the indexes kept over its records."""
+
+    def __init__(self, manager: FileManager[T], indexes: dict[str, HashIndex[T]]):
+        self.manager: FileManager[T] = manager
+        self.indexes: dict[str, HashIndex[T]] = indexes
+        self.record_index: RecordIndex[T] = RecordIndex()
+        self._indexed_data: FileData[T] | None = None
+        self._index_lock = threading.Lock()
+
+    def records(self) -> RecordsDict[T]:
+        """Return the records, rebuilding the indexes if the file was reloaded"""
+        data = self.manager.read()
+        if data is not self._indexed_data:
+            with self._index_lock:
+                if data is not self._indexed_data:
+                    for index in [*self.indexes.values(), self.record_index]:
+                        index.build(data.records)
+                    self._indexed_data = data
+        return data.records
+
+    def reset(self) -> None:
+        """Rebuild the indexes on the next read"""
+        self._indexed_data = None
+
+    def index(self, record_id: int, record: T) -> None:
+        for index in [*self.indexes.values(), self.record_index]:
+            index.add(record_id, record)
+
+    def unindex(self, record_id: int, record: T) -> None:
+        for index in [*self.indexes.values(), self.record_index]:
+            index.remove(record_id, record)
+
+    def lookup(
+        self, query: Query[T], records: RecordsDict[T] | None = None
+    ) -> Iterator[tuple[int, T]]:
+        """Yield (id, record) pairs of this shard matching a query"""
+        candidates: Iterator[tuple[int, T]]
+        if records is None and not self.manager.cache_enabled:
+            candidates = self.manager.iter_records()
+        else:
+            records = self.records() if records is None else records
+            ids = query.candidate_ids(self.indexes)
+            if ids is not None:
+                candidates = ((i, records[i]) for i in sorted(ids))
+            else:
+                candidates = iter(records.items())
+
+        for record_id, record in candidates:
+            if query.matches(record):
+                yield record_id, record
+
+    def first_match(self, query: Query[T]) -> tuple[int, T] | None:
+        """Return the first (id, record) pair matching a query"""
+        matches = self.lookup(query)
+        try:
+            return next(matches, None)
+        finally:
+            matches.close()
+
+
+class ShardedFileStorage(BaseFileStorage[T]):
+    # The on-disk format of the shards when no backend is passed
+    default_backend: type[BaseBackend[Any]] = JsonBackend
+
+    def __init__(
+        self,
+        file_path: str,
+        model_class: type[T],
+        metadata: BaseMetaDataDict,
+        unique_fields: list[str] | None = None,
+        shards: int | None = None,
+        shard_key: str | None = None,
+        partition: ShardPartition = "hash",
+        bounds: list[Any] | None = None,
+        cache: bool = True,
+        indexed_fields: list[str] | None = None,
+        mode: StorageMode = "snapshot",
+        durability: Durability = "flush",
+        lock_timeout: float | None = 10.0,
+        lock_backoff: float = 0.001,
+        max_workers: int | None = None,
+        backend: type[BaseBackend[Any]] | None = None,
+    ) -> None:
+        """
+        Initialize the ShardedFileStorage.
+
+        Records are spread over several files in the directory at
+        file_path, each managed by its own FileManager, so a write only
+        rewrites the shards it touches. With partition="hash" a record
+        goes to the shard picked by a stable hash of its shard_key field,
+        or of its record id when shard_key is None; there are 8 shards
+        unless shards says otherwise. With partition="range" the sorted
+        bounds split the keys, bound i being the first key of shard i + 1.
+
+        Lookups that pin the shard key (``key=value``, ``key__in`` and,
+        for range partitions, comparisons) only read the shards that can
+        hold a match. Other reads scan the shards in parallel on a thread
+        pool sized by max_workers.
+
+        The layout is written to a manifest.json in the directory when it
+        is first used; opening it with another layout raises ValueError.
+        The remaining arguments configure each shard as for FileStorage.
+        """
+        super().__init__(file_path, model_class, metadata, unique_fields)
+        backend = backend or self.default_backend
+        if shard_key is not None and shard_key not in model_class.model_fields:
+            raise ValueError(f"Cannot shard by unknown field '{shard_key}'.")
+        fields = list(dict.fromkeys([*self.unique_fields, *(indexed_fields or [])]))
+        for field in fields:
+            if field not in model_class.model_fields:
+                raise ValueError(f"Cannot index unknown field '{field}'.")
+
+        self.shard_key: str | None = shard_key
+        self.queries: QueryCompiler[T] = QueryCompiler(model_class)
+        self._key_adapter: TypeAdapter[Any] = (
+            type_adapter(int)
+            if shard_key is None
+            else self.queries.field_adapters[shard_key]
+        )
+
+        if partition == "range":
+            if not bounds:
+                raise ValueError("A range partition needs bounds.")
+            bounds = [self._key_adapter.validate_python(bound) for bound in bounds]
+            if bounds != sorted(bounds):
+                raise ValueError("Range bounds must be sorted.")
+            count = len(bounds) + 1
+            if shards is not None and shards != count:
+                raise ValueError("A range partition has one shard more than bounds.")
+        else:
+            count = DEFAULT_SHARDS if shards is None else shards
+        if count < 1:
+            raise ValueError("shards must be at least 1.")
+
+        # Held while ids are handed out and records checked across shards
+        self.file_path.mkdir(parents=True, exist_ok=True)
+        self.rw_lock: ReadWriteLock = ReadWriteLock()
+        self.lock: FileLock = FileLock(
+            self.file_path / "manifest.lock",
+            timeout=lock_timeout,
+            backoff=lock_backoff,
+        )
+
+        suffix = backend.__name__.removesuffix("Backend").lower()
+        with self.locked():
+            self.manifest: ShardManifest = self._open_manifest(
+                ShardManifest(
+                    shard_key=shard_key,
+                    partition=partition,
+                    bounds=bounds or [],
+                    backend=backend.__name__,
+                    shards=[f"shard-{number:04d}.{suffix}" for number in range(count)],
+                ),
+                durability,
+            )
+        self._bounds: list[Any] = bounds or []
+
+        manager_class = LogFileManager if mode == "wal" else FileManager
+        self.shards: list[_Shard[T]] = [
+            _Shard(
+                manager_class(
+                    str(self.file_path / name),
+                    model_class,
+                    metadata,
+                    cache=cache,
+                    durability=durability,
+                    lock_timeout=lock_timeout,
+                    lock_backoff=lock_backoff,
+                    backend=backend,
+                ),
+                {
+                    field: HashIndex(field, unique=field in self.unique_fields)
+                    for field in fields
+                },
+            )
+            for name in self.manifest.shards
+        ]
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="pydantic-storage",
+        )
+
+    def _open_manifest(
+        self, manifest: ShardManifest, durability: Durability
+    ) -> ShardManifest:
+        """Write the manifest of a new directory or check the stored one."""
+        manifest_path = self.file_path / "manifest.json"
+        if not manifest_path.exists():
+            atomic_write(
+                manifest_path,
+                manifest.model_dump_json(indent=2).encode(),
+                durability,
+            )
+            return manifest
+
+        stored = ShardManifest.model_validate_json(manifest_path.read_bytes())
+        if stored.model_dump(mode="json") != manifest.model_dump(mode="json"):
+            raise ValueError(
+                f"{manifest_path} describes another shard layout; "
+                "resharding an existing directory is not supported."
+            )
+        return stored
+
+    @contextmanager
+    def locked(self, shared: bool = False) -> Iterator[None]:
+        """
+        Hold the storage-wide thread and inter-process locks.
+
+        Writers hold the exclusive lock while they hand out ids and check
+        unique fields across shards; readers share it.
+
+        Raises:
+            LockTimeoutError: If the lock is not acquired within the
+                configured timeout.
+
+        """
+        thread_lock = self.rw_lock.read() if shared else self.rw_lock.write()
+        file_lock = self.lock.shared() if shared else self.lock.exclusive()
+        with thread_lock, file_lock:
+            yield
+
+    def invalidate_cache(self) -> None:
+        """Force the next read of every shard to reload it from disk."""
+        for shard in self.shards:
+            shard.manager.invalidate_cache()
+
+    def close(self) -> None:
+        """Stop the thread pool and release the locks of every shard."""
+        self._executor.shutdown(wait=True)
+        for shard in self.shards:
+            shard.manager.close()
+        self.lock.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _map(self, func: Callable[[S], R], items: list[S]) -> list[R]:
+        """Run func over shards on the thread pool when there are several."""
+        if len(items) < 2:
+            return [func(item) for item in items]
+        return list(self._executor.map(func, items))
+
+    def shard_of(self, key: Any) -> int:
+        """
+        Return the number of the shard holding records with the given key.
+
+        Args:
+            key (Any): A shard_key value, or a record id when records are
+                partitioned by id.
+
+        Raises:
+            ValueError: If a range partition cannot order the key.
+
+        Returns:
+            int: The index of the shard in the manifest.
+
+        """
+        if self.manifest.partition == "range":
+            try:
+                return bisect_right(self._bounds, key)
+            except TypeError:
+                raise ValueError(f"Cannot place shard key {key!r} in a range.")
+        digest = blake2b(to_json(key), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % len(self.shards)
+
+    def _key_of(self, record_id: int, record: T) -> Any:
+        if self.shard_key is None:
+            return record_id
+        return getattr(record, self.shard_key)
+
+    def _holders(self, item: T, field: str | None) -> list[int]:
+        """
+        Return the shards where a record clashing with item can be.
+
+        field is a unique field, or None for an identical record. Both
+        can only clash within the shard of item when item's shard key
+        decides them.
+        """
+        if self.shard_key is not None and field in (None, self.shard_key):
+            return [self.shard_of(getattr(item, self.shard_key))]
+        return list(range(len(self.shards)))
+
+    def _shards_for(self, query: Query[T]) -> list[_Shard[T]]:
+        """Return the shards that can hold records matching a query."""
+        return [self.shards[number] for number in self._numbers_for(query)]
+
+    def _numbers_for(self, query: Query[T]) -> list[int]:
+        """Return the numbers of the shards that can hold matches of a query."""
+        selected = set(range(len(self.shards)))
+        for lookup in query.lookups:
+            if lookup.field == self.shard_key:
+                selected &= self._shards_matching(lookup.op, lookup.value)
+        return sorted(selected)
+
+    def _numbers_of_id(self, record_id: int) -> list[int]:
+        """Return the numbers of the shards that can hold a record id."""
+        if self.shard_key is None:
+            return [self.shard_of(record_id)]
+        return list(range(len(self.shards)))
+
+    def _shards_matching(self, op: str, value: Any) -> set[int]:
+        """Return the shards a lookup on the shard key can match in."""
+        everything = set(range(len(self.shards)))
+        validate = self._key_adapter.validate_python
+        try:
+            if op == "exact":
+                return {self.shard_of(validate(value))}
+            if op == "in":
+                return {self.shard_of(validate(item)) for item in value}
+            if self.manifest.partition == "range" and op in ("gt", "gte"):
+                return set(range(self.shard_of(validate(value)), len(self.shards)))
+            if self.manifest.partition == "range" and op in ("lt", "lte"):
+                return set(range(self.shard_of(validate(value)) + 1))
+        except (TypeError, ValueError):
+            pass
+        return everything
+
+    def _load(
+        self,
+        items: Iterable[T],
+        loaded: dict[int, RecordsDict[T]] | None = None,
+    ) -> dict[int, RecordsDict[T]]:
+        """Read, in parallel, every shard the checks of items may look at."""
+        loaded = {} if loaded is None else loaded
+        wanted = {
+            number
+            for item in items
+            for field in [None, *self.unique_fields]
+            for number in self._holders(item, field)
+        }
+        missing = sorted(wanted - loaded.keys())
+        records = self._map(_Shard.records, [self.shards[i] for i in missing])
+        loaded.update(zip(missing, records))
+        return loaded
+
+    def _check_unique(self, record: T, record_id: int | None = None) -> None:
+        """Raise DuplicateEntryError if record clashes on a unique field."""
+        for field in self.unique_fields:
+            for number in self._holders(record, field):
+                index = self.shards[number].indexes[field]
+                if index.lookup_record(record) - {record_id}:
+                    raise DuplicateEntryError([field])
+
+    def _find(
+        self,
+        item: T,
+        loaded: dict[int, RecordsDict[T]],
+        pending: RecordsDict[T],
+    ) -> tuple[int, int, T] | None:
+        """Return the shard, id and record of a stored or pending copy of item."""
+        for number in self._holders(item, None):
+            records = loaded[number]
+            record_index = self.shards[number].record_index
+            for record_id in sorted(record_index.lookup_record(item)):
+                if record_id in pending:
+                    record = pending[record_id]
+                else:
+                    record = records[record_id]
+                if record == item:
+                    return number, record_id, record
+        return None
+
+    def all(self) -> list[T]:
+        """Retrieve all items from the storage, in id order."""
+        with self.locked(shared=True):
+            parts = self._map(
+                lambda shard: list(shard.manager.read().records.items()), self.shards
+            )
+        return [record for _, record in sorted(chain(*parts), key=itemgetter(0))]
+
+    def iter(self) -> Iterator[T]:
+        """Yield items one at a time, shard after shard."""
+        for shard in self.shards:
+            for _, record in shard.manager.iter_records():
+                yield record
+
+    def iter_filter(self, **kwargs: Any) -> Iterator[T]:
+        """Yield items matching kwargs one at a time, shard after shard."""
+        query = self.queries.compile(kwargs)
+        for shard in self._shards_for(query):
+            if not shard.manager.cache_enabled:
+                yield from (record for _, record in shard.lookup(query))
+                continue
+            with self.locked(shared=True):
+                matches = [record for _, record in shard.lookup(query)]
+            yield from matches
+
+    def _first_match(self, query: Query[T]) -> tuple[int, T, _Shard[T]] | None:
+        """Return the id, record and shard of the first match, shard by shard."""
+        shards = self._shards_for(query)
+        matches = self._map(lambda shard: shard.first_match(query), shards)
+        for match, shard in zip(matches, shards):
+            if match is not None:
+                return (*match, shard)
+        return None
+
+    def get(self, **kwargs: Any) -> T | None:
+        """Retrieve the first item, shard by shard, matching key-value pairs."""
+        query = self.queries.compile(kwargs)
+        with self.locked(shared=True):
+            match = self._first_match(query)
+        return None if match is None else match[1]
+
+    def get_by_id(self, record_id: int) -> T | None:
+        """Retrieve an item by its record id, from its shard if ids place records."""
+        with self.locked(shared=True):
+            records = self._map(
+                lambda number: self.shards[number].manager.read_record(record_id),
+                self._numbers_of_id(record_id),
+            )
+        return next((record for record in records if record is not None), None)
+
+    def _edge(self, pick: Callable[..., Any]) -> T | None:
+        """Return the record with the lowest or highest id across shards."""
+        with self.locked(shared=True):
+            edges = self._map(
+                lambda shard: pick(
+                    shard.manager.iter_records(), key=itemgetter(0), default=None
+                ),
+                self.shards,
+            )
+        edge = pick(
+            (edge for edge in edges if edge is not None),
+            key=itemgetter(0),
+            default=None,
+        )
+        return None if edge is None else edge[1]
+
+    def first(self) -> T | None:
+        """Retrieve the item with the lowest id."""
+        return self._edge(min)
+
+    def last(self) -> T | None:
+        """Retrieve the item with the highest id."""
+        return self._edge(max)
+
+    def count(self) -> int:
+        """Count the number of items in the storage."""
+        with self.locked(shared=True):
+            return sum(
+                self._map(
+                    lambda shard: sum(1 for _ in shard.manager.iter_records()),
+                    self.shards,
+                )
+            )
+
+    def exists(self, **kwargs: Any) -> bool:
+        """Check if an item exists by key and value."""
+        query = self.queries.compile(kwargs)
+        with self.locked(shared=True):
+            return self._first_match(query) is not None
+
+    def next_id(self) -> int:
+        """Return the next id, the highest sequence of any shard plus one."""
+        with self.locked(shared=True):
+            return max(self._map(lambda shard: shard.manager.next_id(), self.shards))
+
+    def reserve_ids(self, count: int) -> range:
+        """Reserve a block of ids; the reservation is kept by the first shard."""
+        if count < 0:
+            raise ValueError("count must not be negative.")
+        with self.locked():
+            start = self.next_id()
+            if count:
+                manager = self.shards[0].manager
+                with manager.locked():
+                    manager.store_sequence(manager.read(), start + count - 1)
+            return range(start, start + count)
+
+    def create(self, items: list[T]) -> list[T]:
+        """
+        Create new items, writing each touched shard once and in parallel.
+
+        The shards are written independently, so if one of the writes
+        fails the records bound for the other shards may still be stored.
+        """
+        for item in items:
+            if not isinstance(item, self.model_class):
+                raise ValidationError(
+                    f"Item must be an instance of {self.model_class.__name__}, got {type(item).__name__}"
+                )
+
+        with self.locked():
+            loaded = self._load(items)
+            next_id = self.next_id()
+            new_records: dict[int, T] = {}
+            placed: dict[int, RecordsDict[T]] = {}
+            try:
+                for item in items:
+                    if self._find(item, loaded, new_records) is not None:
+                        continue
+                    self._check_unique(item)
+                    number = self.shard_of(self._key_of(next_id, item))
+                    new_records[next_id] = item
+                    placed.setdefault(number, {})[next_id] = item
+                    self.shards[number].index(next_id, item)
+                    next_id += 1
+
+                self._map(
+                    lambda number: self.shards[number].manager.write(placed[number]),
+                    list(placed),
+                )
+            except BaseException:
+                # Reload the indexes of the touched shards from what was stored
+                for number in placed:
+                    self.shards[number].reset()
+                raise
+            return list(new_records.values())
+
+    def update(self, items: T, **kwargs: Any) -> T:
+        """Update item with provided kwargs, moving it if its shard key changed."""
+        if not isinstance(items, self.model_class):
+            raise ValidationError(
+                f"Item must be an instance of {self.model_class.__name__}, got {type(items).__name__}"
+            )
+        self.queries.validate(kwargs)
+
+        with self.locked():
+            loaded = self._load([items])
+            found = self._find(items, loaded, {})
+            if found is None:
+                raise ValidationError(f"Item {items} not found in storage for update.")
+            return self._update_records([found], kwargs, loaded)[0]
+
+    def update_by_id(self, record_id: int, **kwargs: Any) -> T | None:
+        """Update the item with the given record id; None if there is none."""
+        self.queries.validate(kwargs)
+        with self.locked():
+            found = self._find_by_id(record_id)
+            if found is None:
+                return None
+            number, record = found
+            return self._update_records([(number, record_id, record)], kwargs)[0]
+
+    def update_where(self, changes: dict[str, Any], **kwargs: Any) -> list[T]:
+        """
+        Apply changes to every item matching the lookups in kwargs.
+
+        Only the shards that can hold matches are read, and each shard
+        with changed records is written once.
+
+        Returns:
+            list[T]: The updated items, in id order.
+
+        """
+        self.queries.validate(changes)
+        query = self.queries.compile(kwargs)
+        with self.locked():
+            matches, loaded = self._matches(query)
+            return self._update_records(matches, changes, loaded)
+
+    def _find_by_id(self, record_id: int) -> tuple[int, T] | None:
+        """Return the shard number and record stored under a record id."""
+        numbers = self._numbers_of_id(record_id)
+        records = self._map(lambda number: self.shards[number].records(), numbers)
+        for number, shard_records in zip(numbers, records):
+            if record_id in shard_records:
+                return number, shard_records[record_id]
+        return None
+
+    def _matches(
+        self, query: Query[T]
+    ) -> tuple[list[tuple[int, int, T]], dict[int, RecordsDict[T]]]:
+        """Return the shard, id and record of every match, in id order."""
+        numbers = self._numbers_for(query)
+        records = self._map(lambda number: self.shards[number].records(), numbers)
+        loaded = dict(zip(numbers, records))
+        matches = [
+            (number, record_id, record)
+            for number in numbers
+            for record_id, record in self.shards[number].lookup(query, loaded[number])
+        ]
+        return sorted(matches, key=itemgetter(1)), loaded
+
+    def _update_records(
+        self,
+        matches: list[tuple[int, int, T]],
+        changes: dict[str, Any],
+        loaded: dict[int, RecordsDict[T]] | None = None,
+    ) -> list[T]:
+        """
+        Apply changes to records given by shard, id and record.
+
+        Callers hold the lock. A record whose shard key changes moves to
+        its new shard. Every shard with changes is written once, and the
+        shards are written in parallel; if a unique field clashes nothing
+        is written, if a write fails other shards may be stored.
+        """
+        updated_records: list[T] = []
+        written: dict[int, RecordsDict[T]] = {}
+        removed: dict[int, list[int]] = {}
+        try:
+            for number, record_id, record in matches:
+                # Copy on write: readers holding the old model never see it change
+                updated = record.model_copy(update=changes)
+                updated_records.append(updated)
+                if updated == record:
+                    continue
+                loaded = self._load([updated], loaded)
+                self._check_unique(updated, record_id)
+
+                target = self.shard_of(self._key_of(record_id, updated))
+                self.shards[number].unindex(record_id, record)
+                self.shards[target].index(record_id, updated)
+                written.setdefault(target, {})[record_id] = updated
+                if target != number:
+                    removed.setdefault(number, []).append(record_id)
+
+            def store(number: int) -> None:
+                manager = self.shards[number].manager
+                with manager.batch():
+                    if number in written:
+                        manager.write(written[number])
+                    if number in removed:
+                        manager.remove(removed[number])
+
+            self._map(store, sorted(written.keys() | removed.keys()))
+        except BaseException:
+            for number in written.keys() | removed.keys():
+                self.shards[number].reset()
+            raise
+        return updated_records
+
+    @overload
+    def filter(
+        self,
+        *,
+        order_by: str | list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        only: None = None,
+        **kwargs: Any,
+    ) -> list[T]: ...
+
+    @overload
+    def filter(
+        self,
+        *,
+        order_by: str | list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        only: list[str],
+        **kwargs: Any,
+    ) -> list[dict[str, Any]]: ...
+
+    def filter(
+        self,
+        *,
+        order_by: str | list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        only: list[str] | None = None,
+        **kwargs: Any,
+    ) -> list[T] | list[dict[str, Any]]:
+        """
+        Filter items with Django-style lookups, as FileStorage.filter does.
+
+        The shards that can hold matches are scanned in parallel and the
+        matches merged in id order before ordering and paging.
+        """
+        query = self.queries.compile(
+            kwargs, order_by=order_by, limit=limit, offset=offset, only=only
+        )
+        with self.locked(shared=True):
+            parts = self._map(
+                lambda shard: list(shard.lookup(query)), self._shards_for(query)
+            )
+        matches = sorted(chain(*parts), key=itemgetter(0))
+        records = query.results(record for _, record in matches)
+        if only is not None:
+            return query.project(records)
+        return records
+
+    def delete(self, **kwargs: Any) -> list[T] | None:
+        """Delete the first item, shard by shard, matching key and value."""
+        query = self.queries.compile(kwargs)
+        with self.locked():
+            match = self._first_match(query)
+            if match is None:
+                return None
+            record_id, record, shard = match
+            shard.manager.remove([record_id])
+            shard.unindex(record_id, record)
+            return [record]
+
+    def delete_by_id(self, record_id: int) -> T | None:
+        """Delete the item with the given record id and return it."""
+        with self.locked():
+            found = self._find_by_id(record_id)
+            if found is None:
+                return None
+            number, record = found
+            shard = self.shards[number]
+            shard.manager.remove([record_id])
+            shard.unindex(record_id, record)
+            return record
+
+    def delete_where(self, **kwargs: Any) -> list[T]:
+        """
+        Delete every item matching the lookups in kwargs.
+
+        Each shard holding matches is written once, in parallel.
+
+        Returns:
+            list[T]: The deleted items, in id order.
+
+        """
+        query = self.queries.compile(kwargs)
+        with self.locked():
+            matches, _ = self._matches(query)
+            removed: dict[int, list[tuple[int, T]]] = {}
+            for number, record_id, record in matches:
+                removed.setdefault(number, []).append((record_id, record))
+
+            def remove(number: int) -> None:
+                shard = self.shards[number]
+                shard.manager.remove([record_id for record_id, _ in removed[number]])
+                for record_id, record in removed[number]:
+                    shard.unindex(record_id, record)
+
+            self._map(remove, list(removed))
+        return [record for _, _, record in matches]
+
+    def clear(self) -> bool:
+        """Clear all items from the storage."""
+        with self.locked():
+
+            def clear_shard(shard: _Shard[T]) -> None:
+                shard.manager.remove(list(shard.manager.read().records))
+                shard.reset()
+
+            self._map(clear_shard, self.shards)
+        return True
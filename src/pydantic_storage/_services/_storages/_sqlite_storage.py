@@ -0,0 +1,529 @@
+import hashlib
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import TracebackType
+from typing import Any, Self, overload
+
+from pydantic import ValidationError
+from pydantic_core import to_jsonable_python
+
+from pydantic_storage._services._queries._compiler import QueryCompiler
+from pydantic_storage._services._queries._query import Query
+from pydantic_storage.abstractions import BaseFileStorage
+from pydantic_storage.exceptions import DuplicateEntryError, LockTimeoutError
+from pydantic_storage.models import FileMetaData, Storage, Timestamp, now_utc
+from pydantic_storage.types import Durability
+from pydantic_storage.types._generic_types import T
+from pydantic_storage.types._model_dict_types import BaseMetaDataDict
+
+# sqlite3 takes a finite busy timeout; this stands in for "wait forever"
+BLOCK_FOREVER: float = 365 * 24 * 3600.0
+
+SYNCHRONOUS: dict[Durability, str] = {"none": "OFF", "flush": "NORMAL", "fsync": "FULL"}
+
+# Statements are constant strings, so sqlite3 prepares each one only once
+# per connection and reuses it from its statement cache
+CREATE_METADATA = (
+    "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+)
+CREATE_RECORDS = (
+    "CREATE TABLE IF NOT EXISTS records "
+    "(id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL, "
+    "digest INTEGER NOT NULL)"
+)
+CREATE_DIGEST_INDEX = "CREATE INDEX IF NOT EXISTS records_digest ON records (digest)"
+SELECT_METADATA = "SELECT value FROM metadata WHERE key = 'metadata'"
+UPSERT_METADATA = "INSERT OR REPLACE INTO metadata (key, value) VALUES ('metadata', ?)"
+TOUCH_METADATA = (
+    "UPDATE metadata SET value = json_set(value, '$.timestamps.updated_at', ?) "
+    "WHERE key = 'metadata'"
+)
+SELECT_ALL = "SELECT data FROM records ORDER BY id"
+SELECT_FIRST = "SELECT data FROM records ORDER BY id LIMIT 1"
+SELECT_LAST = "SELECT data FROM records ORDER BY id DESC LIMIT 1"
+SELECT_COUNT = "SELECT count(*) FROM records"
+SELECT_BY_ID = "SELECT data FROM records WHERE id = ?"
+# AUTOINCREMENT keeps the highest id ever used in sqlite_sequence, so ids of
+# deleted records are never handed out again
+SELECT_NEXT_ID = (
+    "SELECT coalesce((SELECT seq FROM sqlite_sequence WHERE name = 'records'), 0) + 1"
+)
+UPDATE_SEQUENCE = "UPDATE sqlite_sequence SET seq = ? WHERE name = 'records'"
+INSERT_SEQUENCE = "INSERT INTO sqlite_sequence (name, seq) VALUES ('records', ?)"
+SELECT_BY_DIGEST = "SELECT id, data FROM records WHERE digest = ? ORDER BY id"
+INSERT_RECORD = "INSERT INTO records (id, data, digest) VALUES (?, ?, ?)"
+UPDATE_RECORD = "UPDATE records SET data = ?, digest = ? WHERE id = ?"
+DELETE_RECORD = "DELETE FROM records WHERE id = ?"
+DELETE_ALL = "DELETE FROM records"
+
+
+class SqliteStorage(BaseFileStorage[T]):
+    def __init__(
+        self,
+        file_path: str,
+        model_class: type[T],
+        metadata: BaseMetaDataDict,
+        unique_fields: list[str] | None = None,
+        indexed_fields: list[str] | None = None,
+        durability: Durability = "flush",
+        lock_timeout: float | None = 10.0,
+    ) -> None:
+        """
+        Initialize the SqliteStorage.
+
+        Records live in one SQLite table as JSON text, keyed by their id.
+        Unique and indexed fields get generated columns extracted from
+        the JSON with a (unique) index on each, so lookups on them take
+        O(log n) and writes touch single rows instead of the whole file.
+
+        The database runs in WAL mode, so readers never block the writer.
+        durability maps to the synchronous pragma: "none" (OFF), "flush"
+        (NORMAL) or "fsync" (FULL). lock_timeout bounds the wait for a
+        busy database (None blocks forever).
+        """
+        super().__init__(file_path, model_class, metadata, unique_fields)
+        fields = list(dict.fromkeys([*self.unique_fields, *(indexed_fields or [])]))
+        for field in fields:
+            if field not in model_class.model_fields:
+                raise ValueError(f"Cannot index unknown field '{field}'.")
+        self.indexed_fields: list[str] = fields
+        self.durability: Durability = durability
+        self.lock_timeout: float | None = lock_timeout
+        self.queries: QueryCompiler[T] = QueryCompiler(model_class)
+
+        self._to_json = model_class.__pydantic_serializer__.to_json
+        self._validate_json = model_class.__pydantic_validator__.validate_json
+
+        # One connection per thread; all are tracked so close() can reach them
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._initialize()
+
+    def close(self) -> None:
+        """Close the connections of every thread."""
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the connection of the calling thread, opening it if needed."""
+        connection: sqlite3.Connection | None = getattr(
+            self._local, "connection", None
+        )
+        if connection is None:
+            timeout = BLOCK_FOREVER if self.lock_timeout is None else self.lock_timeout
+            connection = sqlite3.connect(
+                self.file_path,
+                timeout=timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(f"PRAGMA synchronous={SYNCHRONOUS[self.durability]}")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the block in a write transaction, rolled back if it raises."""
+        connection = self._connection()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as error:
+            if "locked" not in str(error):
+                raise
+            raise LockTimeoutError(
+                str(self.file_path), self.lock_timeout or BLOCK_FOREVER
+            ) from error
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _initialize(self) -> None:
+        """Create the schema and write or refresh the metadata."""
+        with self._transaction() as connection:
+            connection.execute(CREATE_METADATA)
+            connection.execute(CREATE_RECORDS)
+            connection.execute(CREATE_DIGEST_INDEX)
+
+            columns = {
+                row[1] for row in connection.execute("PRAGMA table_xinfo(records)")
+            }
+            for field in self.indexed_fields:
+                column = self._column(field)
+                if column not in columns:
+                    connection.execute(
+                        f'ALTER TABLE records ADD COLUMN "{column}" GENERATED ALWAYS '
+                        f"AS (json_extract(data, '$.\"{field}\"')) VIRTUAL"
+                    )
+                unique = "UNIQUE " if field in self.unique_fields else ""
+                try:
+                    connection.execute(
+                        f'CREATE {unique}INDEX IF NOT EXISTS "records_{column}" '
+                        f'ON records ("{column}")'
+                    )
+                except sqlite3.IntegrityError as error:
+                    raise DuplicateEntryError([field]) from error
+
+            # Keep the creation time of an existing database
+            row = connection.execute(SELECT_METADATA).fetchone()
+            stored = None if row is None else FileMetaData.model_validate_json(row[0])
+            created_at = now_utc()
+            if stored is not None and stored.timestamps is not None:
+                created_at = stored.timestamps.created_at
+            metadata = FileMetaData(
+                **self.metadata,
+                storage=Storage(type="sqlite", encryption="none"),
+                timestamps=Timestamp(created_at=created_at),
+            )
+            connection.execute(UPSERT_METADATA, (metadata.model_dump_json(),))
+
+    @staticmethod
+    def _column(field: str) -> str:
+        return f"field_{field}"
+
+    def _encode(self, record: T) -> tuple[str, int]:
+        """Return the JSON text of a record and its content digest."""
+        data: bytes = self._to_json(record)
+        digest = hashlib.blake2b(data, digest_size=8).digest()
+        return data.decode(), int.from_bytes(digest, "big", signed=True)
+
+    def _decode(self, data: str) -> T:
+        return self._validate_json(data)
+
+    def _touch(self, connection: sqlite3.Connection) -> None:
+        """Move the updated_at timestamp forward inside a write transaction."""
+        connection.execute(TOUCH_METADATA, (now_utc().isoformat(),))
+
+    def _duplicate_error(self, error: sqlite3.IntegrityError) -> DuplicateEntryError:
+        """Translate a unique index violation into a DuplicateEntryError."""
+        # e.g. "UNIQUE constraint failed: records.field_email"
+        _, _, columns = str(error).partition(":")
+        fields = [
+            column.strip().removeprefix("records.").removeprefix("field_")
+            for column in columns.split(",")
+        ]
+        return DuplicateEntryError(fields)
+
+    @staticmethod
+    def _sql_value(value: Any) -> tuple[bool, Any]:
+        """Convert a lookup value to what json_extract returns, if possible."""
+        value = to_jsonable_python(value)
+        if isinstance(value, bool):
+            return True, int(value)
+        if value is None or isinstance(value, str | int | float):
+            return True, value
+        return False, None
+
+    def _where(self, query: Query[T]) -> tuple[str, list[Any]]:
+        """Push equality and ``in`` lookups on indexed fields down to SQL."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        for lookup in query.lookups:
+            if lookup.field not in self.indexed_fields:
+                continue
+            if lookup.op not in ("exact", "in"):
+                continue
+            values = [lookup.value] if lookup.op == "exact" else lookup.value
+            converted = [self._sql_value(value) for value in values]
+            if not all(ok for ok, _ in converted) or None in values:
+                continue
+            column = self._column(lookup.field)
+            placeholders = ", ".join("?" * len(converted))
+            clauses.append(f'"{column}" IN ({placeholders})')
+            params.extend(value for _, value in converted)
+        if not clauses:
+            return "", params
+        return " WHERE " + " AND ".join(clauses), params
+
+    def _lookup(
+        self,
+        query: Query[T],
+        connection: sqlite3.Connection | None = None,
+    ) -> Iterator[tuple[int, T]]:
+        """Yield (id, record) pairs matching a query, narrowed by the indexes."""
+        where, params = self._where(query)
+        connection = connection or self._connection()
+        rows = connection.execute(
+            f"SELECT id, data FROM records{where} ORDER BY id", params
+        )
+        for record_id, data in rows:
+            record = self._decode(data)
+            if query.matches(record):
+                yield record_id, record
+
+    def all(self) -> list[T]:
+        """Retrieve all items from the storage."""
+        rows = self._connection().execute(SELECT_ALL)
+        return [self._decode(data) for (data,) in rows]
+
+    def iter(self) -> Iterator[T]:
+        """Yield items one at a time without building a list of them."""
+        for (data,) in self._connection().execute(SELECT_ALL):
+            yield self._decode(data)
+
+    def iter_filter(self, **kwargs: Any) -> Iterator[T]:
+        """Yield items matching kwargs one at a time."""
+        query = self.queries.compile(kwargs)
+        for _, record in self._lookup(query):
+            yield record
+
+    def get(self, **kwargs: Any) -> T | None:
+        """Retrieve an item based on key-value pairs."""
+        query = self.queries.compile(kwargs)
+        for _, record in self._lookup(query):
+            return record
+        return None
+
+    def get_by_id(self, record_id: int) -> T | None:
+        """Retrieve an item by its record id through the primary key."""
+        row = self._connection().execute(SELECT_BY_ID, (record_id,)).fetchone()
+        return None if row is None else self._decode(row[0])
+
+    def first(self) -> T | None:
+        """Retrieve the first item from the storage."""
+        row = self._connection().execute(SELECT_FIRST).fetchone()
+        return None if row is None else self._decode(row[0])
+
+    def last(self) -> T | None:
+        """Retrieve the last item from the storage."""
+        row = self._connection().execute(SELECT_LAST).fetchone()
+        return None if row is None else self._decode(row[0])
+
+    def count(self) -> int:
+        """Count the number of items in the storage."""
+        return self._connection().execute(SELECT_COUNT).fetchone()[0]
+
+    def exists(self, **kwargs: Any) -> bool:
+        """Check if an item exists by key and value."""
+        return self.get(**kwargs) is not None
+
+    def next_id(self) -> int:
+        """Return the next id from the table's sequence."""
+        return self._connection().execute(SELECT_NEXT_ID).fetchone()[0]
+
+    def reserve_ids(self, count: int) -> range:
+        """Reserve a block of ids that will never be handed out again."""
+        if count < 0:
+            raise ValueError("count must not be negative.")
+        with self._transaction() as connection:
+            start: int = connection.execute(SELECT_NEXT_ID).fetchone()[0]
+            if count:
+                last_id = start + count - 1
+                if connection.execute(UPDATE_SEQUENCE, (last_id,)).rowcount == 0:
+                    connection.execute(INSERT_SEQUENCE, (last_id,))
+            return range(start, start + count)
+
+    def _find(
+        self,
+        connection: sqlite3.Connection,
+        item: T,
+        digest: int,
+    ) -> tuple[int, T] | None:
+        """Return the first stored record equal to item."""
+        for record_id, data in connection.execute(SELECT_BY_DIGEST, (digest,)):
+            record = self._decode(data)
+            if record == item:
+                return record_id, record
+        return None
+
+    def create(self, items: list[T]) -> list[T]:
+        """Create new items with one bulk insert."""
+        for item in items:
+            if not isinstance(item, self.model_class):
+                raise ValidationError(
+                    f"Item must be an instance of {self.model_class.__name__}, got {type(item).__name__}"
+                )
+
+        with self._transaction() as connection:
+            next_id: int = connection.execute(SELECT_NEXT_ID).fetchone()[0]
+            rows: list[tuple[int, str, int]] = []
+            created: list[T] = []
+            pending: dict[int, list[T]] = {}
+            for item in items:
+                data, digest = self._encode(item)
+                if item in pending.get(digest, []):
+                    continue
+                if self._find(connection, item, digest) is not None:
+                    continue
+                pending.setdefault(digest, []).append(item)
+                rows.append((next_id, data, digest))
+                created.append(item)
+                next_id += 1
+
+            if rows:
+                try:
+                    connection.executemany(INSERT_RECORD, rows)
+                except sqlite3.IntegrityError as error:
+                    raise self._duplicate_error(error) from error
+                self._touch(connection)
+            return created
+
+    def update(self, items: T, **kwargs: Any) -> T:
+        """Update item with provided kwargs"""
+        if not isinstance(items, self.model_class):
+            raise ValidationError(
+                f"Item must be an instance of {self.model_class.__name__}, got {type(items).__name__}"
+            )
+        self.queries.validate(kwargs)
+
+        with self._transaction() as connection:
+            found = self._find(connection, items, self._encode(items)[1])
+            if found is None:
+                raise ValidationError(f"Item {items} not found in storage for update.")
+            record_id, record = found
+            updated = record.model_copy(update=kwargs)
+            data, digest = self._encode(updated)
+            try:
+                connection.execute(UPDATE_RECORD, (data, digest, record_id))
+            except sqlite3.IntegrityError as error:
+                raise self._duplicate_error(error) from error
+            self._touch(connection)
+            return updated
+
+    def update_by_id(self, record_id: int, **kwargs: Any) -> T | None:
+        """Update the item with the given record id; None if there is none."""
+        self.queries.validate(kwargs)
+        with self._transaction() as connection:
+            row = connection.execute(SELECT_BY_ID, (record_id,)).fetchone()
+            if row is None:
+                return None
+            record = self._decode(row[0])
+            return self._update_rows(connection, [(record_id, record)], kwargs)[0]
+
+    def update_where(self, changes: dict[str, Any], **kwargs: Any) -> list[T]:
+        """Apply changes to every item matching kwargs in one transaction."""
+        self.queries.validate(changes)
+        query = self.queries.compile(kwargs)
+        with self._transaction() as connection:
+            matches = list(self._lookup(query, connection))
+            return self._update_rows(connection, matches, changes)
+
+    def _update_rows(
+        self,
+        connection: sqlite3.Connection,
+        matches: list[tuple[int, T]],
+        changes: dict[str, Any],
+    ) -> list[T]:
+        """Store changed copies of the matched records inside a transaction."""
+        updated_records: list[T] = []
+        rows: list[tuple[str, int, int]] = []
+        for record_id, record in matches:
+            updated = record.model_copy(update=changes)
+            updated_records.append(updated)
+            if updated != record:
+                rows.append((*self._encode(updated), record_id))
+        if rows:
+            try:
+                connection.executemany(UPDATE_RECORD, rows)
+            except sqlite3.IntegrityError as error:
+                raise self._duplicate_error(error) from error
+            self._touch(connection)
+        return updated_records
+
+    @overload
+    def filter(
+        self,
+        *,
+        order_by: str | list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        only: None = None,
+        **kwargs: Any,
+    ) -> list[T]: ...
+
+    @overload
+    def filter(
+        self,
+        *,
+        order_by: str | list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        only: list[str],
+        **kwargs: Any,
+    ) -> list[dict[str, Any]]: ...
+
+    def filter(
+        self,
+        *,
+        order_by: str | list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        only: list[str] | None = None,
+        **kwargs: Any,
+    ) -> list[T] | list[dict[str, Any]]:
+        """Filter items with the same lookups and options as FileStorage."""
+        query = self.queries.compile(
+            kwargs, order_by=order_by, limit=limit, offset=offset, only=only
+        )
+        records = query.results(record for _, record in self._lookup(query))
+        if only is not None:
+            return query.project(records)
+        return records
+
+    def delete(self, **kwargs: Any) -> list[T] | None:
+        """Delete an item by key and value."""
+        query = self.queries.compile(kwargs)
+        with self._transaction() as connection:
+            matches = self._lookup(query, connection)
+            match = next(matches, None)
+            # Finish the SELECT before writing through the same connection
+            matches.close()
+            if match is None:
+                return None
+            record_id, record = match
+            connection.execute(DELETE_RECORD, (record_id,))
+            self._touch(connection)
+            return [record]
+
+    def delete_by_id(self, record_id: int) -> T | None:
+        """Delete the item with the given record id and return it."""
+        with self._transaction() as connection:
+            row = connection.execute(SELECT_BY_ID, (record_id,)).fetchone()
+            if row is None:
+                return None
+            connection.execute(DELETE_RECORD, (record_id,))
+            self._touch(connection)
+            return self._decode(row[0])
+
+    def delete_where(self, **kwargs: Any) -> list[T]:
+        """Delete every item matching kwargs in one transaction."""
+        query = self.queries.compile(kwargs)
+        with self._transaction() as connection:
+            matches = list(self._lookup(query, connection))
+            if matches:
+                connection.executemany(
+                    DELETE_RECORD, [(record_id,) for record_id, _ in matches]
+                )
+                self._touch(connection)
+        return [record for _, record in matches]
+
+    def clear(self) -> bool:
+        """Clear all items from the storage."""
+        with self._transaction() as connection:
+            connection.execute(DELETE_ALL)
+            self._touch(connection)
+        return True
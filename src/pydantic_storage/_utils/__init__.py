@@ -0,0 +1,34 @@
+from ._atomic_write import append_bytes, atomic_write, fsync_directory
+from ._compact_records import CompactRecords, changed_records, snapshot_items
+from ._file_lock import FileLock
+from ._fragment_cache import FragmentCache
+from ._json_stream import iter_object_items, read_member
+from ._jsonl import JsonlTarget, read_jsonl, write_jsonl
+from ._metrics import StorageMetrics, measured
+from ._parallel import chunked, gil_enabled, validate_chunk, worker_pool
+from ._rw_lock import ReadWriteLock
+from ._type_adapter import type_adapter
+
+__all__ = [
+    "CompactRecords",
+    "FileLock",
+    "FragmentCache",
+    "JsonlTarget",
+    "ReadWriteLock",
+    "StorageMetrics",
+    "append_bytes",
+    "atomic_write",
+    "changed_records",
+    "chunked",
+    "fsync_directory",
+    "gil_enabled",
+    "iter_object_items",
+    "measured",
+    "read_jsonl",
+    "read_member",
+    "snapshot_items",
+    "type_adapter",
+    "validate_chunk",
+    "worker_pool",
+    "write_jsonl",
+]
@@ -0,0 +1,100 @@
+import os
+import stat
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+
+from pydantic_storage.types import Durability
+
+
+def fsync_directory(directory: Path) -> None:
+    """Flush a directory entry to disk so a rename in it survives a crash"""
+    if os.name == "nt":
+        # Directories cannot be opened for fsync on Windows
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(
+    path: Path, data: bytes | Iterable[bytes], durability: Durability = "flush"
+) -> int:
+    """
+    Replace the contents of a file atomically.
+
+    The data is written to a temporary file in the same directory which
+    is then renamed over the target, so readers only ever see the old or
+    the new document, never a truncated one. Data given as chunks is
+    written as it is produced, without joining it in memory first.
+
+    Args:
+        path (Path): The file to replace.
+        data (bytes | Iterable[bytes]): The new contents of the file, or
+            the chunks that make them up in order.
+        durability (Durability): "none" leaves buffering to Python and
+            the OS, "flush" flushes Python's buffer to the OS before the
+            rename, and "fsync" also syncs the file and its directory so
+            both the contents and the rename survive a crash.
+
+    Returns:
+        int: The size of the new file in bytes.
+
+    """
+    fd, temp_name = tempfile.mkstemp(
+        dir=path.parent,
+        prefix=f".{path.name}.",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            if isinstance(data, bytes):
+                file.write(data)
+            else:
+                file.writelines(data)
+            size = file.tell()
+            if durability != "none":
+                file.flush()
+            if durability == "fsync":
+                os.fsync(file.fileno())
+
+        # Keep the permissions of the file being replaced
+        if path.exists():
+            os.chmod(temp_name, stat.S_IMODE(path.stat().st_mode))
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+    if durability == "fsync":
+        fsync_directory(path.parent)
+    return size
+
+
+def append_bytes(path: Path, data: bytes, durability: Durability = "flush") -> None:
+    """
+    Append data to a file, creating it if needed.
+
+    Args:
+        path (Path): The file to append to.
+        data (bytes): The bytes to append.
+        durability (Durability): "none" leaves buffering to Python and
+            the OS, "flush" flushes Python's buffer to the OS, and "fsync"
+            also syncs the file, plus its directory when it is new.
+
+    Returns:
+        None
+
+    """
+    created = not path.exists()
+    with path.open("ab") as file:
+        file.write(data)
+        if durability != "none":
+            file.flush()
+        if durability == "fsync":
+            os.fsync(file.fileno())
+
+    if created and durability == "fsync":
+        fsync_directory(path.parent)
@@ -0,0 +1,141 @@
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableMapping
+from operator import itemgetter
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+_object_setattr = object.__setattr__
+
+
+class CompactRecords(MutableMapping[int, M], Generic[M]):
+    """
+    Records kept as tuples of their field values, built into models on access.
+
+    A validated model carries an instance dict, a fields-set and the
+    slots pydantic adds, several hundred bytes per record before any of
+    its values. A row is a single tuple pointing at the same values. The
+    rows hold trusted data that was validated on its way in, so records
+    are rebuilt without validation, and every access returns a new
+    model: treat them as read-only, and store changes through the
+    mapping.
+    """
+
+    __slots__ = ("model_class", "fields", "rows", "_plain", "_row")
+
+    def __init__(
+        self,
+        model_class: type[M],
+        records: Iterable[tuple[int, M]] = (),
+    ) -> None:
+        """
+        Initialize the records of a model.
+
+        Args:
+            model_class (type[M]): The model the records are built as.
+            records (Iterable[tuple[int, M]]): Ids and validated records
+                to store, consumed one at a time.
+
+        Raises:
+            ValueError: If the model keeps extra fields, which rows
+                cannot hold.
+
+        """
+        if model_class.model_config.get("extra") == "allow":
+            raise ValueError("Compact records cannot hold models with extra fields.")
+        self.model_class: type[M] = model_class
+        self.fields: tuple[str, ...] = tuple(model_class.model_fields)
+        self.rows: dict[int, tuple[Any, ...]] = {}
+
+        # Private attributes need model_construct to get their defaults
+        self._plain: bool = not model_class.__private_attributes__
+
+        # Picks the row out of a model's instance dict
+        self._row: Callable[[dict[str, Any]], tuple[Any, ...]]
+        if len(self.fields) < 2:
+            self._row = lambda values: tuple([values[f] for f in self.fields])
+        else:
+            self._row = itemgetter(*self.fields)  # type: ignore[assignment]
+
+        rows, row = self.rows, self._row
+        for record_id, record in records:
+            rows[record_id] = row(record.__dict__)
+
+    def build(self, row: tuple[Any, ...]) -> M:
+        """Build the model stored as a row, without validating it"""
+        values = dict(zip(self.fields, row))
+        if not self._plain:
+            return self.model_class.model_construct(**values)
+
+        # What model_construct does, minus default handling: rows hold
+        # every field
+        record = self.model_class.__new__(self.model_class)
+        _object_setattr(record, "__dict__", values)
+        _object_setattr(record, "__pydantic_fields_set__", set(self.fields))
+        _object_setattr(record, "__pydantic_extra__", None)
+        _object_setattr(record, "__pydantic_private__", None)
+        return record
+
+    def __getitem__(self, record_id: int) -> M:
+        return self.build(self.rows[record_id])
+
+    def __setitem__(self, record_id: int, record: M) -> None:
+        self.rows[record_id] = self._row(record.__dict__)
+
+    def __delitem__(self, record_id: int) -> None:
+        del self.rows[record_id]
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self.rows
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.rows)
+
+    def __reversed__(self) -> Iterator[int]:
+        return reversed(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __repr__(self) -> str:
+        return f"CompactRecords({self.model_class.__name__}, {len(self)} records)"
+
+    def copy(self) -> "CompactRecords[M]":
+        """Return a shallow copy, sharing the rows"""
+        copied: CompactRecords[M] = CompactRecords(self.model_class)
+        copied.rows = dict(self.rows)
+        return copied
+
+
+def snapshot_items(records: Mapping[int, M]) -> Iterator[tuple[int, M]]:
+    """
+    Yield the items records had when called, even if it changes meanwhile.
+
+    Compact records only copy their rows up front and build each model
+    as it is yielded, so iterating never holds every model at once.
+    """
+    if isinstance(records, CompactRecords):
+        rows = list(records.rows.items())
+        return ((record_id, records.build(row)) for record_id, row in rows)
+    return iter(list(records.items()))
+
+
+def changed_records(
+    original: Mapping[int, M], current: Mapping[int, M]
+) -> Iterator[tuple[int, M]]:
+    """
+    Yield the records of current that are not the ones stored in original.
+
+    Unchanged records are the same objects in both, or the same rows
+    when both are compact, so nothing is compared field by field.
+    """
+    if isinstance(current, CompactRecords) and isinstance(original, CompactRecords):
+        rows = original.rows
+        for record_id, row in current.rows.items():
+            if rows.get(record_id) is not row:
+                yield record_id, current.build(row)
+        return
+    for record_id, record in current.items():
+        if original.get(record_id) is not record:
+            yield record_id, record
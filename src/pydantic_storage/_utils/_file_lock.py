@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from pydantic_storage.exceptions import LockTimeoutError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - fcntl is unavailable on Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+class FileLock:
+    """
+    An advisory inter-process lock held on a sidecar lock file.
+
+    Shared holders may read concurrently while an exclusive holder runs a
+    read-modify-write cycle. Acquisitions nest within a process, and a
+    shared lock is upgraded while an exclusive section is nested in it.
+    Concurrent shared holders from several threads share one flock. On
+    platforms without fcntl the lock is a no-op.
+    """
+
+    def __init__(
+        self,
+        lock_path: Path | str,
+        timeout: float | None = 10.0,
+        backoff: float = 0.001,
+        max_backoff: float = 0.05,
+    ) -> None:
+        """
+        Initialize the lock.
+
+        Args:
+            lock_path (Path | str): The sidecar file to lock.
+            timeout (float | None): Seconds to wait before raising
+                LockTimeoutError, or None to block indefinitely.
+            backoff (float): First delay between non-blocking attempts.
+            max_backoff (float): Upper bound of the doubling delay.
+
+        """
+        self.lock_path: Path = Path(lock_path)
+        self.timeout: float | None = timeout
+        self.backoff: float = backoff
+        self.max_backoff: float = max_backoff
+        self._fd: int | None = None
+        self._modes: list[bool] = []
+        self._mutex = threading.Lock()
+
+    @property
+    def is_locked(self) -> bool:
+        """Check whether this process currently holds the lock"""
+        return bool(self._modes)
+
+    def acquire(self, exclusive: bool = True) -> None:
+        """Acquire the lock in shared or exclusive mode"""
+        with self._mutex:
+            if not self._modes or (exclusive and not any(self._modes)):
+                self._flock(exclusive)
+            self._modes.append(exclusive)
+
+    def release(self) -> None:
+        """Release one level of the lock"""
+        with self._mutex:
+            was_exclusive = any(self._modes)
+            self._modes.pop()
+            if fcntl is None or self._fd is None:
+                return
+            if not self._modes:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            elif was_exclusive and not any(self._modes):
+                fcntl.flock(self._fd, fcntl.LOCK_SH)
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        """Hold the lock in shared mode for the duration of the block"""
+        self.acquire(exclusive=False)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """Hold the lock in exclusive mode for the duration of the block"""
+        self.acquire(exclusive=True)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _flock(self, exclusive: bool) -> None:
+        if fcntl is None:
+            return
+        if self._fd is None:
+            self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        if self.timeout is None:
+            fcntl.flock(self._fd, operation)
+            return
+
+        deadline = time.monotonic() + self.timeout
+        delay = self.backoff
+        while True:
+            try:
+                fcntl.flock(self._fd, operation | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LockTimeoutError(str(self.lock_path), self.timeout)
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, self.max_backoff)
+
+    def close(self) -> None:
+        """Close the lock file, dropping any lock still held"""
+        with self._mutex:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            self._modes.clear()
+
+    def __del__(self) -> None:
+        """Close the lock file when the lock is garbage collected"""
+        if getattr(self, "_fd", None) is not None:
+            os.close(self._fd)  # type: ignore[arg-type]
+            self._fd = None
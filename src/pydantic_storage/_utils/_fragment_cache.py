@@ -0,0 +1,81 @@
+from collections.abc import Callable, Iterator, Mapping
+from itertools import compress
+from operator import is_not
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+
+from pydantic_storage._utils._compact_records import CompactRecords
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class FragmentCache(Generic[M]):
+    """
+    The encoded form of each record, reused while the record is unchanged.
+
+    Records are copied on write, so a record that is still the same
+    object as when it was encoded, or the same row of compact records,
+    encodes to the same bytes. Finding the changed ones is an identity
+    check per record done in C, which leaves encoding the changed
+    records as the only per-record work in Python. Records changed in
+    place would keep their old encoding: treat stored records as
+    read-only, as the cache requires anyway.
+    """
+
+    __slots__ = ("_sources", "_fragments")
+
+    def __init__(self) -> None:
+        # The record or row each fragment was encoded from
+        self._sources: dict[int, Any] = {}
+        self._fragments: dict[int, bytes] = {}
+
+    def fragments(
+        self,
+        records: Mapping[int, M],
+        encode: Callable[[int, M], bytes],
+    ) -> Iterator[bytes]:
+        """
+        Return the fragments of records in order, encoding changed ones.
+
+        The changed records are encoded before this returns; the
+        fragments are only collected as the iterator is consumed.
+
+        Args:
+            records (Mapping[int, M]): The records to encode.
+            encode (Callable[[int, M], bytes]): Encodes one record.
+
+        Returns:
+            Iterator[bytes]: The fragment of every record.
+
+        """
+        sources, fragments = self._sources, self._fragments
+        build: Callable[[Any], M] | None = None
+        current: Mapping[int, Any] = records
+        if isinstance(records, CompactRecords):
+            current, build = records.rows, records.build
+
+        changed = compress(
+            current, map(is_not, map(sources.get, current), current.values())
+        )
+        for record_id in list(changed):
+            source = current[record_id]
+            record = source if build is None else build(source)
+            fragments[record_id] = encode(record_id, record)
+            sources[record_id] = source
+
+        # Forget removed records
+        if len(sources) > len(current):
+            for record_id in sources.keys() - current.keys():
+                del sources[record_id]
+                del fragments[record_id]
+
+        return map(fragments.__getitem__, current)
+
+    def clear(self) -> None:
+        """Drop every fragment, e.g. when the records were reloaded"""
+        self._sources.clear()
+        self._fragments.clear()
+
+    def __len__(self) -> int:
+        return len(self._fragments)
@@ -0,0 +1,162 @@
+from collections.abc import Iterator
+from json import JSONDecodeError, JSONDecoder
+from typing import Any, TextIO
+
+_WHITESPACE = " \t\n\r"
+_decoder = JSONDecoder()
+
+
+class _JsonReader:
+    """A cursor over a JSON text that is read from a stream chunk by chunk."""
+
+    def __init__(self, stream: TextIO, chunk_size: int) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer: str = ""
+        self.pos: int = 0
+        self.eof: bool = False
+
+    def fill(self) -> bool:
+        """Drop the consumed text and read the next chunk; False at the end."""
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise JSONDecodeError("Unexpected end of data", self.buffer, self.pos)
+
+    def expect(self, char: str) -> None:
+        """Consume the next character, which must be char."""
+        if self.peek() != char:
+            raise JSONDecodeError(f"Expecting '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self) -> tuple[Any, str]:
+        """Consume the next JSON value and return it with its raw text."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except JSONDecodeError:
+                # The value may simply run past the end of the buffer
+                if self.fill():
+                    continue
+                raise
+            # A number at the very end of the buffer may still go on
+            if end == len(self.buffer) and not self.eof and self.fill():
+                continue
+            raw = self.buffer[self.pos : end]
+            self.pos = end
+            return value, raw
+
+    def key(self) -> str:
+        """Consume an object key and the colon after it."""
+        name, _ = self.value()
+        if not isinstance(name, str):
+            raise JSONDecodeError("Expecting property name", self.buffer, self.pos)
+        self.expect(":")
+        return name
+
+    def next_member(self) -> bool:
+        """Consume the separator after a member; False if the object ended."""
+        if self.peek() == ",":
+            self.pos += 1
+            return True
+        self.expect("}")
+        return False
+
+
+def iter_object_items(
+    stream: TextIO,
+    key: str,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[tuple[str, str]]:
+    """
+    Stream the members of one object nested in a JSON document.
+
+    The document is read chunk by chunk, and the object stored under key
+    in the top-level object is yielded one member at a time. Memory use
+    is bounded by the largest member rather than the size of the file.
+
+    Args:
+        stream (TextIO): The text stream positioned at the document start.
+        key (str): The top-level key of the object to stream.
+        chunk_size (int): The number of characters read at once.
+
+    Yields:
+        tuple[str, str]: The member name and the raw JSON text of its value.
+
+    Raises:
+        JSONDecodeError: If the document is not valid JSON.
+
+    """
+    reader = _JsonReader(stream, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        if reader.key() != key:
+            reader.value()
+        else:
+            reader.expect("{")
+            if reader.peek() == "}":
+                return
+            while True:
+                name = reader.key()
+                _, raw = reader.value()
+                yield name, raw
+                if not reader.next_member():
+                    return
+        if not reader.next_member():
+            return
+
+
+def read_member(
+    stream: TextIO,
+    key: str,
+    chunk_size: int = 64 * 1024,
+) -> str | None:
+    """
+    Read one member of the top-level object of a JSON document.
+
+    Members are read in order and the document is only read up to the
+    end of the member asked for, so a small member stored before a large
+    one is read without parsing the large one.
+
+    Args:
+        stream (TextIO): The text stream positioned at the document start.
+        key (str): The top-level key of the member.
+        chunk_size (int): The number of characters read at once.
+
+    Returns:
+        str | None: The raw JSON text of the member's value, or None if
+        the object has no such member.
+
+    Raises:
+        JSONDecodeError: If the document is not valid JSON.
+
+    """
+    reader = _JsonReader(stream, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return None
+
+    while True:
+        name = reader.key()
+        _, raw = reader.value()
+        if name == key:
+            return raw
+        if not reader.next_member():
+            return None
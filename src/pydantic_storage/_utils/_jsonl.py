@@ -0,0 +1,95 @@
+import os
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from itertools import batched
+from typing import BinaryIO, Literal, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+M = TypeVar("M", bound=BaseModel)
+
+# A path to open, or an open binary stream left open afterwards
+JsonlTarget = str | os.PathLike[str] | BinaryIO
+
+# Lines validated, or items encoded, at a time
+JSONL_CHUNK_SIZE = 10_000
+
+
+@contextmanager
+def binary_stream(
+    target: JsonlTarget, mode: Literal["rb", "wb"]
+) -> Iterator[BinaryIO]:
+    """Open a path, or pass an open binary stream through without closing it"""
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, mode) as stream:
+            yield stream
+    else:
+        yield target
+
+
+def write_jsonl(
+    target: JsonlTarget,
+    items: Iterable[M],
+    model_class: type[M],
+    chunk_size: int = JSONL_CHUNK_SIZE,
+) -> int:
+    """
+    Write items as JSON Lines, one compact JSON object per line.
+
+    Items are encoded and written chunk_size at a time, so only one
+    chunk is held in memory whatever the number of items.
+
+    Args:
+        target (JsonlTarget): The file to (over)write, or a binary
+            stream to write to.
+        items (Iterable[M]): The items to write, consumed as written.
+        model_class (type[M]): The model whose serializer encodes them.
+        chunk_size (int): The number of items written at a time.
+
+    Returns:
+        int: The number of items written.
+
+    """
+    to_json = model_class.__pydantic_serializer__.to_json
+    count = 0
+    with binary_stream(target, "wb") as stream:
+        for chunk in batched(items, chunk_size):
+            stream.write(b"\n".join(map(to_json, chunk)) + b"\n")
+            count += len(chunk)
+    return count
+
+
+def read_jsonl(
+    source: JsonlTarget,
+    adapter: TypeAdapter[list[M]],
+    chunk_size: int = JSONL_CHUNK_SIZE,
+) -> Iterator[list[M]]:
+    """
+    Read JSON Lines as chunks of validated items.
+
+    Every chunk_size lines are joined into one JSON array and validated
+    with a single call, which costs far less than validating the lines
+    one by one. Blank lines are skipped.
+
+    Args:
+        source (JsonlTarget): The file to read, or a binary stream.
+        adapter (TypeAdapter[list[M]]): Validates a chunk of lines.
+        chunk_size (int): The number of lines validated at a time.
+
+    Raises:
+        ValidationError: If a line is not a valid item; the location
+            starts with the index of the line within its chunk.
+        ValueError: If the lines of a chunk do not hold one JSON value
+            each.
+
+    Yields:
+        list[M]: The items of the next chunk of lines.
+
+    """
+    with binary_stream(source, "rb") as stream:
+        lines = (line for line in stream if not line.isspace())
+        for chunk in batched(lines, chunk_size):
+            items = adapter.validate_json(b"[%s]" % b",".join(chunk))
+            if len(items) != len(chunk):
+                raise ValueError("JSON Lines must hold one JSON value per line.")
+            yield items
@@ -0,0 +1,218 @@
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Concatenate, ParamSpec, Protocol, TypeVar
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+)
+
+# What the managers count, per operation and in total
+COUNTERS: tuple[str, ...] = (
+    "bytes_read",
+    "bytes_written",
+    "cache_hits",
+    "cache_misses",
+    "loads",
+    "rewrites",
+    "appends",
+)
+
+# Called after every storage operation with its name, duration in
+# seconds and what it counted; failed operations count an error
+Listener = Callable[[str, float, dict[str, int]], None]
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class Histogram:
+    """Latency observations counted into fixed buckets."""
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+        # One more bucket for what exceeds the last bound
+        self.buckets: list[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        """Count one observation"""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Export the histogram; buckets are keyed by their upper bound"""
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "max_seconds": self.max,
+            "buckets": dict(zip(bounds, self.buckets)),
+        }
+
+
+class StorageMetrics:
+    """
+    Opt-in call counts, latency histograms and I/O counters of storages.
+
+    Every public storage operation is timed as a whole, and the work its
+    file manager does on the same thread is counted against it: bytes
+    read and written, cache hits and misses, loads, full-file rewrites
+    and log appends. The phases of that work (read_file, decode, encode
+    and write_file) get latency histograms of their own, whatever
+    operation ran them. Operations called by another one are part of
+    it, not counted again.
+
+    Nothing here depends on a metrics library: listeners receive every
+    finished operation, which is where logging or an OpenTelemetry
+    meter plugs in, and as_dict() exports the totals for polling. One
+    instance may be shared by several storages.
+    """
+
+    def __init__(self, listeners: Iterable[Listener] = ()) -> None:
+        """
+        Initialize empty metrics.
+
+        Args:
+            listeners (Iterable[Listener]): Called after every operation
+                with its name, duration and counters. They run on the
+                thread of the operation, so keep them quick.
+
+        """
+        self.listeners: list[Listener] = list(listeners)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop everything recorded so far"""
+        with self._lock:
+            self._operations: dict[str, Histogram] = {}
+            self._errors: dict[str, int] = {}
+            self._operation_counters: dict[str, dict[str, int]] = {}
+            self._phases: dict[str, Histogram] = {}
+            self._totals: dict[str, int] = dict.fromkeys(COUNTERS, 0)
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """Add to a counter, and to the operation running on this thread"""
+        with self._lock:
+            self._totals[counter] += amount
+        counts: dict[str, int] | None = getattr(self._local, "counts", None)
+        if counts is not None:
+            counts[counter] = counts.get(counter, 0) + amount
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase of the work of an operation"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self._phases.setdefault(name, Histogram()).observe(seconds)
+
+    @contextmanager
+    def operation(self, name: str) -> Iterator[None]:
+        """
+        Time a storage operation and collect what it counts.
+
+        Inside another operation on the same thread this does nothing,
+        so operations built on others are recorded once.
+        """
+        if getattr(self._local, "counts", None) is not None:
+            yield
+            return
+
+        counts: dict[str, int] = {}
+        self._local.counts = counts
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            counts["errors"] = 1
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            self._local.counts = None
+            with self._lock:
+                self._operations.setdefault(name, Histogram()).observe(seconds)
+                self._errors[name] = self._errors.get(name, 0) + counts.get(
+                    "errors", 0
+                )
+                totals = self._operation_counters.setdefault(
+                    name, dict.fromkeys(COUNTERS, 0)
+                )
+                for counter, amount in counts.items():
+                    if counter != "errors":
+                        totals[counter] += amount
+            for listener in self.listeners:
+                listener(name, seconds, counts)
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Export everything recorded as plain data.
+
+        Returns:
+            dict[str, Any]: Per-operation latency histograms with their
+                error counts and counters, the phase histograms and the
+                counter totals.
+
+        """
+        with self._lock:
+            return {
+                "operations": {
+                    name: {
+                        **histogram.as_dict(),
+                        "errors": self._errors[name],
+                        **self._operation_counters[name],
+                    }
+                    for name, histogram in self._operations.items()
+                },
+                "phases": {
+                    name: histogram.as_dict()
+                    for name, histogram in self._phases.items()
+                },
+                "totals": dict(self._totals),
+            }
+
+
+class Measured(Protocol):
+    metrics: StorageMetrics | None
+
+
+S = TypeVar("S", bound=Measured)
+
+
+def measured(
+    method: Callable[Concatenate[S, P], R],
+) -> Callable[Concatenate[S, P], R]:
+    """Record calls to a storage method as an operation named after it"""
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self: S, *args: P.args, **kwargs: P.kwargs) -> R:
+        if self.metrics is None:
+            return method(self, *args, **kwargs)
+        with self.metrics.operation(name):
+            return method(self, *args, **kwargs)
+
+    return wrapper
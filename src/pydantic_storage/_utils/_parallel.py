@@ -0,0 +1,71 @@
+import sys
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, TypeVar
+
+S = TypeVar("S")
+
+
+def gil_enabled() -> bool:
+    """Check whether the interpreter runs with the global interpreter lock"""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def worker_pool(workers: int) -> Executor:
+    """
+    Return a pool for CPU-bound work.
+
+    Free-threaded builds run validation on threads, which share the
+    results without copying them. With the GIL only processes run
+    Python code in parallel, and their results are pickled back.
+
+    Args:
+        workers (int): The number of threads or processes.
+
+    Returns:
+        Executor: A thread pool without the GIL, a process pool otherwise.
+
+    """
+    if gil_enabled():
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pydantic-storage")
+
+
+def chunked(items: list[S], count: int) -> list[list[S]]:
+    """Split items into at most count contiguous chunks of similar size"""
+    size = -(-len(items) // max(count, 1))
+    return [items[start : start + size] for start in range(0, len(items), size or 1)]
+
+
+@lru_cache(maxsize=None)
+def _backend(backend_class: type[Any], model_class: type[Any]) -> Any:
+    """Build one backend per worker and model instead of one per chunk"""
+    return backend_class(model_class)
+
+
+def validate_chunk(
+    backend_class: type[Any],
+    model_class: type[Any],
+    payloads: list[tuple[int, Any]],
+    predicate: Callable[[Any], bool] | None = None,
+) -> list[tuple[int, Any]]:
+    """
+    Validate a chunk of record payloads in a worker.
+
+    Args:
+        backend_class (type[Any]): The backend that split the payloads.
+        model_class (type[Any]): The model the records are validated as.
+        payloads (list[tuple[int, Any]]): Ids and unvalidated records.
+        predicate (Callable[[Any], bool] | None): If given, only the
+            records it accepts are returned, so less is sent back.
+
+    Returns:
+        list[tuple[int, Any]]: The ids and validated records.
+
+    """
+    records = _backend(backend_class, model_class).validate_records(payloads)
+    if predicate is None:
+        return records
+    return [(record_id, record) for record_id, record in records if predicate(record)]
@@ -0,0 +1,101 @@
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """
+    A writer-preferring reader/writer lock for threads.
+
+    Any number of threads may hold the read side at once while the write
+    side is exclusive. Both sides are reentrant, and a thread holding the
+    write side may also take the read side. Upgrading a held read lock to
+    a write lock is refused, since two upgrading readers would deadlock.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an unlocked lock."""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers: int = 0
+        self._writer: int | None = None
+        self._writer_depth: int = 0
+        self._waiting_writers: int = 0
+        self._local = threading.local()
+
+    def _read_depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    def acquire_read(self) -> None:
+        """Acquire the lock for reading"""
+        if self._writer == threading.get_ident():
+            self._writer_depth += 1
+            return
+        if self._read_depth():
+            self._local.depth += 1
+            return
+
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        self._local.depth = 1
+
+    def release_read(self) -> None:
+        """Release one level of a read acquisition"""
+        if self._writer == threading.get_ident():
+            self._writer_depth -= 1
+            return
+
+        self._local.depth -= 1
+        if self._local.depth:
+            return
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """Acquire the lock for writing"""
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writer_depth += 1
+            return
+        if self._read_depth():
+            raise RuntimeError("Cannot upgrade a read lock to a write lock.")
+
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self) -> None:
+        """Release one level of a write acquisition"""
+        self._writer_depth -= 1
+        if self._writer_depth:
+            return
+        with self._condition:
+            self._writer = None
+            self._condition.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold the read side for the duration of the block"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the write side for the duration of the block"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -0,0 +1,30 @@
+from functools import lru_cache
+from typing import Any
+
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _cached_type_adapter(annotation: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(annotation)
+
+
+def type_adapter(annotation: Any) -> TypeAdapter[Any]:
+    """
+    Return a shared TypeAdapter for an annotation.
+
+    Building an adapter compiles its core schema, which costs far more
+    than the validation it is used for, so adapters are built once per
+    annotation and reused. Unhashable annotations get a fresh adapter.
+
+    Args:
+        annotation (Any): The type to validate against.
+
+    Returns:
+        TypeAdapter[Any]: The adapter for the annotation.
+
+    """
+    try:
+        return _cached_type_adapter(annotation)
+    except TypeError:
+        return TypeAdapter(annotation)
@@ -1,4 +1,11 @@
+from ._backends._base_backend import BaseBackend
 from ._managers._base_file_manager import BaseFileManager
+from ._storages._base_async_file_storage import BaseAsyncFileStorage
 from ._storages._base_file_storage import BaseFileStorage
 
-__all__ = ["BaseFileManager", "BaseFileStorage"]
+__all__ = [
+    "BaseAsyncFileStorage",
+    "BaseBackend",
+    "BaseFileManager",
+    "BaseFileStorage",
+]
@@ -0,0 +1,81 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from typing import Any, BinaryIO, ClassVar, Generic
+
+from pydantic_storage._utils import FragmentCache
+from pydantic_storage.models import FileData, FileMetaData
+from pydantic_storage.types import T
+
+
+class BaseBackend(ABC, Generic[T]):
+    """Abstract base class for the on-disk format of a storage file."""
+
+    # Whether record_spans can locate single records in a stored file
+    random_access: ClassVar[bool] = False
+
+    def __init__(self, model_class: type[T]) -> None:
+        """Initialize the backend for the given model."""
+        self.model_class: type[T] = model_class
+
+    @abstractmethod
+    def encode(self, data: FileData[T]) -> bytes:
+        """Serialize the whole file data to bytes."""
+        raise NotImplementedError
+
+    def iter_encode(
+        self, data: FileData[T], fragments: FragmentCache[T] | None = None
+    ) -> Iterator[bytes]:
+        """
+        Serialize the file data as chunks to be written in order.
+
+        Backends that encode records one at a time keep the encoding of
+        each record in fragments, when given, and only encode the records
+        that changed since the last call; the unchanged ones are reused
+        as they are. This default encodes the file whole.
+        """
+        return iter((self.encode(data),))
+
+    @abstractmethod
+    def decode(self, raw: bytes) -> FileData[T]:
+        """Parse bytes written by encode back into file data."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_records(self, stream: BinaryIO) -> Iterator[tuple[int, T]]:
+        """Yield (id, record) pairs from an open file one at a time."""
+        raise NotImplementedError
+
+    def read_metadata(self, stream: BinaryIO) -> FileMetaData:
+        """
+        Read and validate the metadata of an open file.
+
+        Opening a store only checks its metadata, so backends override
+        this to stop reading before the records. This default decodes
+        the whole file.
+        """
+        return self.decode(stream.read()).metadata
+
+    def split_records(self, raw: bytes) -> tuple[FileMetaData, list[tuple[int, Any]]]:
+        """
+        Split bytes written by encode into metadata and record payloads.
+
+        Parallel loads validate the payloads in chunks on a worker pool
+        with validate_records. This default validates everything here,
+        so backends override both to leave the records unvalidated.
+        """
+        data = self.decode(raw)
+        return data.metadata, list(data.records.items())
+
+    def validate_records(self, payloads: list[tuple[int, Any]]) -> list[tuple[int, T]]:
+        """Validate record payloads returned by split_records."""
+        return payloads
+
+    def record_spans(self, buffer: bytes) -> Iterator[tuple[int, int, int]]:
+        """
+        Locate every record in bytes written by encode.
+
+        Backends that set random_access yield (id, offset, length) of
+        each record's payload, so one record can be read and validated
+        with validate_records without parsing the others.
+        """
+        raise NotImplementedError
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Generic
 
@@ -30,6 +31,11 @@ class BaseFileManager(ABC, Generic[T]):
         """Check wheather a file size zero or not"""
         raise NotImplementedError
 
+    @abstractmethod
+    def invalidate_cache(self) -> None:
+        """Drop any cached file data"""
+        raise NotImplementedError
+
     @abstractmethod
     def file_initializer(self) -> None:
         """Initialize file with default content"""
@@ -45,11 +51,21 @@ class BaseFileManager(ABC, Generic[T]):
         """Read data from a JSON file and return it."""
         raise NotImplementedError
 
+    @abstractmethod
+    def iter_records(self) -> Iterator[tuple[int, T]]:
+        """Yield stored records one at a time."""
+        raise NotImplementedError
+
     @abstractmethod
     def write(self, data: RecordsDict[T]) -> None:
         """Write data to a JSON file."""
         raise NotImplementedError
 
+    @abstractmethod
+    def remove(self, ids: Iterable[int]) -> None:
+        """Remove records from the JSON file by id."""
+        raise NotImplementedError
+
     @abstractmethod
     def update_timestamps(self, timestamps: Timestamp | None) -> Timestamp:
         """Return updated timestamp"""
@@ -59,3 +75,8 @@ class BaseFileManager(ABC, Generic[T]):
     def delete(self) -> None:
         """Delete the JSON file."""
         raise NotImplementedError
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release the resources held by the manager."""
+        raise NotImplementedError
@@ -0,0 +1,112 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Generic
+
+from pydantic_storage.types import BaseMetaDataDict, T
+
+
+class BaseAsyncFileStorage(ABC, Generic[T]):
+    """Abstract base class for asynchronous file storage."""
+
+    def __init__(
+        self,
+        file_path: str,
+        model_class: type[T],
+        metadata: BaseMetaDataDict,
+        unique_fields: list[str] | None = None,
+    ) -> None:
+        """Initialize the AbstractAsyncFileStorage."""
+        self.file_path: Path = Path(file_path)
+        self.model_class: type[T] = model_class
+        self.metadata: BaseMetaDataDict = metadata
+        self.unique_fields: list[str] = unique_fields or []
+
+    @abstractmethod
+    async def all(self) -> list[T]:
+        """Retrieve all items from the storage."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(self, **kwargs: Any) -> T | None:
+        """Retrieve an item by key and value."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_id(self, record_id: int) -> T | None:
+        """Retrieve an item by its record id."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def first(self) -> T | None:
+        """Retrieve the first item from the storage."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def last(self) -> T | None:
+        """Retrieve the last item from the storage."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count(self) -> int:
+        """Count the number of items in the storage."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def exists(self, **kwargs: Any) -> bool:
+        """Check if an item exists by key and value."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def next_id(self) -> int:
+        """Return next id as for previous recods"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def reserve_ids(self, count: int) -> range:
+        """Reserve a block of ids for records created later."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create(self, items: list[T]) -> list[T]:
+        """Create a new item in the storage."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update(self, items: T, **kwargs: Any) -> T:
+        """Update item with provided kwargs"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_by_id(self, record_id: int, **kwargs: Any) -> T | None:
+        """Update the item with the given record id."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_where(self, changes: dict[str, Any], **kwargs: Any) -> list[T]:
+        """Apply changes to every item matching key-value pairs."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def filter(self, **kwargs: Any) -> list[T]:
+        """Filter items based on kwargs"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, **kwargs: Any) -> list[T] | None:
+        """Delete an items based on kwargs"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_by_id(self, record_id: int) -> T | None:
+        """Delete the item with the given record id."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_where(self, **kwargs: Any) -> list[T]:
+        """Delete every item matching key-value pairs."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def clear(self) -> bool:
+        """Clear all items from the storage."""
+        raise NotImplementedError
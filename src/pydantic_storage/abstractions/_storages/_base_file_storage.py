@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any, Generic
 
+from pydantic_storage._utils import (
+    JsonlTarget,
+    read_jsonl,
+    type_adapter,
+    write_jsonl,
+)
 from pydantic_storage.types import BaseMetaDataDict, T
 
 
@@ -26,11 +33,26 @@ class BaseFileStorage(ABC, Generic[T]):
         """Retrieve all items from the storage."""
         raise NotImplementedError
 
+    @abstractmethod
+    def iter(self) -> Iterator[T]:
+        """Yield items from the storage one at a time."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_filter(self, **kwargs: Any) -> Iterator[T]:
+        """Yield items matching key-value pairs one at a time."""
+        raise NotImplementedError
+
     @abstractmethod
     def get(self, **kwargs: Any) -> T | None:
         """Retrieve an item by key and value."""
         raise NotImplementedError
 
+    @abstractmethod
+    def get_by_id(self, record_id: int) -> T | None:
+        """Retrieve an item by its record id."""
+        raise NotImplementedError
+
     @abstractmethod
     def first(self) -> T | None:
         """Retrieve the first item from the storage."""
@@ -56,6 +78,11 @@ class BaseFileStorage(ABC, Generic[T]):
         """Return next id as for previous recods"""
         raise NotImplementedError
 
+    @abstractmethod
+    def reserve_ids(self, count: int) -> range:
+        """Reserve a block of ids for records created later."""
+        raise NotImplementedError
+
     @abstractmethod
     def create(self, items: list[T]) -> list[T]:
         """Create a new item in the storage."""
@@ -66,6 +93,16 @@ class BaseFileStorage(ABC, Generic[T]):
         """Update item with provided kwargs"""
         raise NotImplementedError
 
+    @abstractmethod
+    def update_by_id(self, record_id: int, **kwargs: Any) -> T | None:
+        """Update the item with the given record id."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_where(self, changes: dict[str, Any], **kwargs: Any) -> list[T]:
+        """Apply changes to every item matching key-value pairs."""
+        raise NotImplementedError
+
     @abstractmethod
     def filter(self, **kwargs: Any) -> list[T]:
         """Filter items based on kwargs"""
@@ -76,7 +113,74 @@ class BaseFileStorage(ABC, Generic[T]):
         """Delete an items based on kwargs"""
         raise NotImplementedError
 
+    @abstractmethod
+    def delete_by_id(self, record_id: int) -> T | None:
+        """Delete the item with the given record id."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_where(self, **kwargs: Any) -> list[T]:
+        """Delete every item matching key-value pairs."""
+        raise NotImplementedError
+
     @abstractmethod
     def clear(self) -> bool:
         """Clear all items from the storage."""
         raise NotImplementedError
+
+    def export_jsonl(self, target: JsonlTarget) -> int:
+        """
+        Write every item as one line of JSON, in storage order.
+
+        Items are streamed from iter() and written a chunk at a time, so
+        memory does not grow with the number of items exported.
+
+        Args:
+            target (JsonlTarget): The file to (over)write, or a binary
+                stream to write to, which is left open.
+
+        Returns:
+            int: The number of items written.
+
+        """
+        return write_jsonl(target, self.iter(), self.model_class)
+
+    def import_jsonl(
+        self,
+        source: JsonlTarget,
+        chunk_size: int = 10_000,
+        check_duplicates: bool = True,
+    ) -> int:
+        """
+        Create the items read from JSON Lines, such as export_jsonl writes.
+
+        Lines are validated chunk_size at a time with one cached
+        TypeAdapter(list[T]), and each chunk is created with one call.
+        Items identical to a stored or earlier one are skipped, as
+        create() does. With check_duplicates=False the caller asserts
+        there are none, and storages that can skip looking for them do;
+        unique fields are still enforced.
+
+        Args:
+            source (JsonlTarget): The file to read, or a binary stream.
+            chunk_size (int): The number of lines handled at a time.
+            check_duplicates (bool): Whether to skip items identical to
+                one already stored.
+
+        Raises:
+            ValidationError: If a line is not a valid item.
+            DuplicateEntryError: If an item clashes on a unique field.
+
+        Returns:
+            int: The number of items created.
+
+        """
+        adapter = type_adapter(list[self.model_class])
+        created = 0
+        for items in read_jsonl(source, adapter, chunk_size):
+            created += len(self._import_chunk(items, check_duplicates))
+        return created
+
+    def _import_chunk(self, items: list[T], check_duplicates: bool) -> list[T]:
+        """Create one chunk of imported items; this default always checks."""
+        return self.create(items)
@@ -1,3 +1,12 @@
+from pydantic_storage._services import BinaryBackend, JsonBackend, SqliteStorage
+
+from ._file_backends._binary_file_storage import BinaryFileStorage
 from ._file_backends._json_file_storage import JsonFileStorage
 
-__all__ = ["JsonFileStorage"]
+__all__ = [
+    "BinaryBackend",
+    "BinaryFileStorage",
+    "JsonBackend",
+    "JsonFileStorage",
+    "SqliteStorage",
+]
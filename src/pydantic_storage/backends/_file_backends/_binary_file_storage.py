@@ -0,0 +1,11 @@
+from typing import Any
+
+from pydantic_storage._services import BinaryBackend, FileStorage
+from pydantic_storage.abstractions import BaseBackend
+from pydantic_storage.types import T
+
+
+class BinaryFileStorage(FileStorage[T]):
+    """A file storage that keeps its records as length-prefixed blobs."""
+
+    default_backend: type[BaseBackend[Any]] = BinaryBackend
@@ -1,4 +1,11 @@
-class JsonFileStorage:
-    """A backend for storing data in JSON files."""
+from typing import Any
 
-    ...
+from pydantic_storage._services import FileStorage, JsonBackend
+from pydantic_storage.abstractions import BaseBackend
+from pydantic_storage.types import T
+
+
+class JsonFileStorage(FileStorage[T]):
+    """A file storage that keeps its records in a JSON document."""
+
+    default_backend: type[BaseBackend[Any]] = JsonBackend
@@ -1,5 +1,7 @@
 from ._duplicate_entry_error import DuplicateEntryError
+from ._lock_timeout_error import LockTimeoutError
 
 __all__ = [
     "DuplicateEntryError",
+    "LockTimeoutError",
 ]
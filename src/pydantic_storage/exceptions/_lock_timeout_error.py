@@ -0,0 +1,5 @@
+class LockTimeoutError(TimeoutError):
+    """Raised when a storage file lock cannot be acquired in time."""
+
+    def __init__(self, lock_path: str, timeout: float) -> None:
+        super().__init__(f"Timed out after {timeout}s waiting for lock: {lock_path}")
@@ -2,6 +2,8 @@ from ._models import (
     BaseMetaData,
     FileData,
     FileMetaData,
+    LogEntry,
+    ShardManifest,
     Storage,
     T,
     Timestamp,
@@ -12,6 +14,8 @@ __all__ = [
     "BaseMetaData",
     "FileData",
     "FileMetaData",
+    "LogEntry",
+    "ShardManifest",
     "Storage",
     "T",
     "Timestamp",
@@ -1,9 +1,9 @@
 from datetime import datetime, timezone
-from typing import Any, ClassVar, Generic
+from typing import Any, ClassVar, Generic, Literal
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
-from ..types import T
+from ..types import ShardPartition, T
 
 
 def now_utc() -> datetime:
@@ -48,6 +48,11 @@ class BaseMetaData(BaseModel):
 class FileMetaData(BaseMetaData):
     storage: Storage
     timestamps: Timestamp | None = None
+    last_id: int = Field(
+        default=0,
+        ge=0,
+        description="Highest record id ever handed out; ids are never reused",
+    )
 
 
 class FileData(BaseModel, Generic[T]):
@@ -76,3 +81,42 @@ class FileData(BaseModel, Generic[T]):
             }
         ]
     }
+
+
+class LogEntry(BaseModel, Generic[T]):
+    op: Literal["put", "del", "reserve"] = Field(..., description="Logged mutation")
+    id: int = Field(..., description="Id of the affected record")
+    record: T | None = Field(default=None, description="Record stored by a put")
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class ShardManifest(BaseModel):
+    shard_key: str | None = Field(
+        default=None,
+        description="Field records are partitioned by; None for the record id",
+    )
+    partition: ShardPartition = Field(
+        default="hash",
+        description="How shard keys are mapped to shards",
+    )
+    bounds: list[Any] = Field(
+        default_factory=list,
+        description="First shard key of every range shard after the first",
+    )
+    backend: str = Field(..., description="Name of the backend of the shard files")
+    shards: list[str] = Field(
+        ...,
+        min_length=1,
+        description="Shard file names, relative to the manifest",
+    )
+
+    model_config = ConfigDict(extra="forbid")
+
+    @model_validator(mode="after")
+    def check_bounds(self) -> "ShardManifest":
+        if self.partition == "range" and len(self.bounds) != len(self.shards) - 1:
+            raise ValueError("A range partition needs one bound less than shards.")
+        if self.partition == "hash" and self.bounds:
+            raise ValueError("Only range partitions take bounds.")
+        return self
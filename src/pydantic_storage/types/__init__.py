@@ -1,4 +1,5 @@
 from ._generic_types import T
+from ._literal_types import Durability, ShardPartition, StorageMode
 from ._model_dict_types import (
     BaseMetaDataDict,
     FileDataDict,
@@ -7,9 +8,12 @@ from ._model_dict_types import (
 )
 
 __all__ = [
+    "Durability",
     "FileDataDict",
     "BaseMetaDataDict",
     "FileMetaDataDict",
     "RecordsDict",
+    "ShardPartition",
+    "StorageMode",
     "T",
 ]
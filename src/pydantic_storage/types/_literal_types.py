@@ -0,0 +1,5 @@
+from typing import Literal, TypeAlias
+
+Durability: TypeAlias = Literal["none", "flush", "fsync"]
+StorageMode: TypeAlias = Literal["snapshot", "wal"]
+ShardPartition: TypeAlias = Literal["hash", "range"]
@@ -1,3 +1,8 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
 from pytest import fixture
 
 from pydantic_storage._services import FileManager, FileStorage
@@ -31,3 +36,41 @@ def storage() -> FileStorage[FakeUser]:
         },
         unique_fields=["id", "email"],
     )
+
+
+# Fixture to create a FileStorage backed by a fresh temporary file
+# ----------------------------------------------------------------
+@fixture
+def tmp_storage(tmp_path: Path) -> FileStorage[FakeUser]:
+    return FileStorage[FakeUser](
+        file_path=str(tmp_path / "users.json"),
+        model_class=FakeUser,
+        metadata={
+            "version": "1.0.0",
+            "title": "User records",
+            "description": "User record descriptions",
+        },
+        unique_fields=["id", "email"],
+    )
+
+
+# Fixture to open FileStorages on files of a temporary directory
+# ---------------------------------------------------------------
+StorageFactory = Callable[..., FileStorage[Any]]
+
+
+@fixture
+def storage_factory(tmp_path: Path) -> StorageFactory:
+    def open_storage(
+        model_class: type[BaseModel] = FakeUser,
+        file_name: str = "records.json",
+        **options: Any,
+    ) -> FileStorage[Any]:
+        return FileStorage[Any](
+            file_path=str(tmp_path / file_name),
+            model_class=model_class,
+            metadata={"version": "1.0.0", "title": "Records", "description": ""},
+            **options,
+        )
+
+    return open_storage
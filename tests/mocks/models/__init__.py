@@ -1,3 +1,4 @@
+from .fake_profile import FakeProfile, make_profile
 from .fake_user import FakeUser
 
-__all__ = ["FakeUser"]
+__all__ = ["FakeProfile", "FakeUser", "make_profile"]
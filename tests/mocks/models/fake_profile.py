@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class FakeProfile(BaseModel):
+    id: int
+    name: str
+    email: str
+    age: int | None = None
+    tags: list[str] = []
+
+
+def make_profile(number: int) -> FakeProfile:
+    """Build the profile numbered number, its name shared by every third one"""
+    return FakeProfile(
+        id=number, name=f"user{number % 3}", email=f"u{number}@x.io", age=number
+    )
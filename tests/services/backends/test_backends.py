@@ -0,0 +1,151 @@
+import io
+from pathlib import Path
+
+from pytest import mark, raises
+
+from pydantic_storage._services import BinaryBackend, JsonBackend
+from pydantic_storage._utils import CompactRecords, FragmentCache
+from pydantic_storage.abstractions import BaseBackend
+from pydantic_storage.backends import BinaryFileStorage, JsonFileStorage
+from pydantic_storage.models import FileData, FileMetaData, Storage
+from pydantic_storage.types import StorageMode
+from tests.mocks.models import FakeProfile
+
+BACKENDS: list[type[BaseBackend[FakeProfile]]] = [JsonBackend, BinaryBackend]
+
+
+def make_data() -> FileData[FakeProfile]:
+    return FileData[FakeProfile](
+        metadata=FileMetaData(
+            title="Profiles",
+            description="Profile records",
+            storage=Storage(type="file", encryption="none"),
+        ),
+        records={
+            i: FakeProfile(id=i, name=f"Ünïcode {i}", email=f"u{i}@x.io", tags=["a"])
+            for i in (1, 2, 300, 2**40)
+        },
+    )
+
+
+@mark.parametrize("backend_class", BACKENDS)
+def test_round_trip(backend_class: type[BaseBackend[FakeProfile]]) -> None:
+    """Decoding what was encoded gives back the same data"""
+    backend = backend_class(FakeProfile)
+    data = make_data()
+    raw = backend.encode(data)
+
+    decoded = backend.decode(raw)
+    assert decoded.metadata == data.metadata
+    assert decoded.records == data.records
+    assert list(backend.iter_records(io.BytesIO(raw))) == list(data.records.items())
+
+    metadata, payloads = backend.split_records(raw)
+    assert metadata == data.metadata
+    assert backend.validate_records(payloads) == list(data.records.items())
+
+
+@mark.parametrize(
+    "backend",
+    [
+        JsonBackend(FakeProfile),
+        JsonBackend(FakeProfile, indent=None),
+        BinaryBackend(FakeProfile),
+    ],
+)
+def test_compact_records_encode_like_a_dict(backend: BaseBackend[FakeProfile]) -> None:
+    """Records held as rows are written exactly as a dict of models is."""
+    data = make_data()
+    for records in [data.records, {}]:
+        compact = data.model_copy(
+            update={"records": CompactRecords(FakeProfile, records.items())}
+        )
+        plain = data.model_copy(update={"records": records})
+        assert backend.encode(compact) == backend.encode(plain)
+
+
+@mark.parametrize(
+    "backend",
+    [
+        JsonBackend(FakeProfile),
+        JsonBackend(FakeProfile, indent=None),
+        BinaryBackend(FakeProfile),
+    ],
+)
+def test_chunks_reuse_unchanged_records(backend: BaseBackend[FakeProfile]) -> None:
+    """Chunked encoding writes what encode does, re-encoding changed records only"""
+    data = make_data()
+    fragments: FragmentCache[FakeProfile] = FragmentCache()
+    assert b"".join(backend.iter_encode(data, fragments)) == backend.encode(data)
+    assert len(fragments) == 4
+
+    records = dict(data.records)
+    records[2] = records[2].model_copy(update={"name": "changed"})
+    del records[300]
+    changed = data.model_copy(update={"records": records})
+
+    chunks = b"".join(backend.iter_encode(changed, fragments))
+    assert chunks == backend.encode(changed)
+    assert backend.decode(chunks).records == records
+    assert len(fragments) == 3
+
+    empty = data.model_copy(update={"records": {}})
+    assert b"".join(backend.iter_encode(empty, fragments)) == backend.encode(empty)
+    assert len(fragments) == 0
+
+
+def test_binary_is_smaller_than_indented_json() -> None:
+    """Length-prefixed records take less space than pretty-printed JSON"""
+    data = make_data()
+    binary = BinaryBackend(FakeProfile).encode(data)
+    assert len(binary) < len(JsonBackend(FakeProfile).encode(data))
+
+
+def test_binary_rejects_foreign_and_truncated_files() -> None:
+    """A missing magic tag or a cut-off record is an error"""
+    backend = BinaryBackend(FakeProfile)
+    raw = backend.encode(make_data())
+
+    with raises(ValueError):
+        backend.decode(b'{"metadata": {}}')
+    with raises(ValueError):
+        backend.decode(raw[:-3])
+    with raises(ValueError):
+        list(backend.iter_records(io.BytesIO(raw[:-3])))
+
+
+@mark.parametrize("storage_class", [JsonFileStorage, BinaryFileStorage])
+@mark.parametrize(("cache", "mode"), [(True, "snapshot"), (False, "wal")])
+def test_storages_per_backend(
+    tmp_path: Path,
+    storage_class: type[JsonFileStorage[FakeProfile]],
+    cache: bool,
+    mode: StorageMode,
+) -> None:
+    """Every backend supports the full storage API and survives a reopen"""
+
+    def open_storage() -> JsonFileStorage[FakeProfile]:
+        return storage_class(
+            file_path=str(tmp_path / "profiles.db"),
+            model_class=FakeProfile,
+            metadata={"version": "1.0.0", "title": "Profiles", "description": ""},
+            unique_fields=["email"],
+            cache=cache,
+            mode=mode,
+        )
+
+    with open_storage() as storage:
+        profiles = [
+            FakeProfile(id=i, name=f"user{i}", email=f"u{i}@x.io", age=i)
+            for i in range(1, 11)
+        ]
+        storage.create(profiles)
+        storage.update(profiles[0], name="first")
+        storage.delete(email="u2@x.io")
+
+    with open_storage() as storage:
+        assert storage.count() == 9
+        assert storage.first() == profiles[0].model_copy(update={"name": "first"})
+        assert [p.id for p in storage.filter(age__gt=8)] == [9, 10]
+        assert storage.get_by_id(5) == profiles[4]
+        assert storage.get_by_id(2) is None
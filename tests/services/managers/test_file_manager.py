@@ -1,5 +1,19 @@
-from pydantic_storage._services import FileManager
+import errno
+from pathlib import Path
+
+from pytest import MonkeyPatch, mark, raises
+
+from pydantic_storage._services import (
+    BinaryBackend,
+    FileManager,
+    JsonBackend,
+    Query,
+)
+from pydantic_storage._services._managers import _file_manager
+from pydantic_storage.exceptions import LockTimeoutError
+from pydantic_storage.abstractions import BaseBackend
 from pydantic_storage.models import FileData
+from pydantic_storage.types import BaseMetaDataDict
 from tests.mocks.models import FakeUser
 
 # ================
@@ -48,3 +62,271 @@ def test_write_and_read_users(
     assert data.records[1].name == "Alice"
     assert data.records[2].name == "Bob"
     assert data.records[3].name == "Charlie"
+
+
+METADATA: BaseMetaDataDict = {
+    "version": "1.0.0",
+    "title": "User records",
+    "description": "User record descriptions",
+}
+
+
+def make_manager(file_path: str, cache: bool = True) -> FileManager[FakeUser]:
+    return FileManager[FakeUser](
+        file_path=file_path,
+        model_class=FakeUser,
+        metadata=METADATA,
+        cache=cache,
+    )
+
+
+def test_read_is_served_from_cache(tmp_path: Path) -> None:
+    """Repeated reads reuse the parsed data until the file changes"""
+    manager = make_manager(str(tmp_path / "users.json"))
+    manager.write({1: FakeUser(id=1, name="Alice", email="alice@gmail.com")})
+
+    assert manager.read() is manager.read()
+
+    # Explicit invalidation forces a reload
+    cached = manager.read()
+    manager.invalidate_cache()
+    assert manager.read() is not cached
+
+
+def test_cache_reloads_after_external_write(tmp_path: Path) -> None:
+    """A write made through another manager is picked up on next read"""
+    file_path = str(tmp_path / "users.json")
+    manager = make_manager(file_path)
+    other = make_manager(file_path)
+
+    assert len(manager.read().records) == 0
+    other.write({1: FakeUser(id=1, name="Alice", email="alice@gmail.com")})
+    assert len(manager.read().records) == 1
+
+
+def test_read_without_cache(tmp_path: Path) -> None:
+    """Disabling the cache parses the file on every read"""
+    manager = make_manager(str(tmp_path / "users.json"), cache=False)
+    assert manager.read() is not manager.read()
+
+
+def test_write_replaces_file_atomically(tmp_path: Path) -> None:
+    """Writes go through a temporary file that is renamed into place"""
+    manager = make_manager(str(tmp_path / "users.json"))
+    inode = manager.file_path.stat().st_ino
+    manager.write({1: FakeUser(id=1, name="Alice", email="alice@gmail.com")})
+
+    assert manager.file_path.stat().st_ino != inode
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_reopen_keeps_records(tmp_path: Path) -> None:
+    """Opening an existing file does not drop its records"""
+    file_path = str(tmp_path / "users.json")
+    make_manager(file_path).write(
+        {1: FakeUser(id=1, name="Alice", email="alice@gmail.com")},
+    )
+    assert len(make_manager(file_path).read().records) == 1
+
+
+@mark.parametrize("backend", [JsonBackend, BinaryBackend])
+def test_open_reads_metadata_only(
+    tmp_path: Path, monkeypatch: MonkeyPatch, backend: type[BaseBackend[FakeUser]]
+) -> None:
+    """Opening an existing store neither loads its records nor writes it"""
+    file_path = tmp_path / "users.json"
+    with FileManager[FakeUser](
+        str(file_path), FakeUser, METADATA, backend=backend
+    ) as manager:
+        manager.write({1: FakeUser(id=1, name="Alice", email="alice@gmail.com")})
+    stat, raw = file_path.stat(), file_path.read_bytes()
+    renamed: BaseMetaDataDict = {**METADATA, "title": "Renamed"}
+
+    def no_load(*args: object) -> None:
+        raise AssertionError("records were loaded on open")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(FileManager, "load", no_load)
+        with FileManager[FakeUser](
+            str(file_path), FakeUser, renamed, backend=backend
+        ) as manager:
+            assert manager.read_metadata().title == METADATA["title"]
+    assert file_path.read_bytes() == raw
+    assert file_path.stat().st_mtime_ns == stat.st_mtime_ns
+
+    # The configured metadata is applied by the next write
+    with FileManager[FakeUser](
+        str(file_path), FakeUser, renamed, backend=backend
+    ) as manager:
+        assert len(manager.read().records) == 1
+        manager.remove([1])
+        assert manager.read_metadata().title == "Renamed"
+
+    file_path.write_bytes(b"not a store")
+    with raises(ValueError):
+        FileManager[FakeUser](str(file_path), FakeUser, METADATA, backend=backend)
+
+
+def test_lock_times_out_while_held_elsewhere(tmp_path: Path) -> None:
+    """A second holder of the file lock gives up after the timeout"""
+    file_path = str(tmp_path / "users.json")
+    manager = make_manager(file_path)
+    other = make_manager(file_path)
+    other.lock.timeout = 0.05
+
+    with manager.locked():
+        with raises(LockTimeoutError):
+            other.write({1: FakeUser(id=1, name="Alice", email="alice@gmail.com")})
+
+        # Shared readers are blocked by the writer too
+        with raises(LockTimeoutError):
+            other.invalidate_cache()
+            other.read()
+
+    other.write({1: FakeUser(id=1, name="Alice", email="alice@gmail.com")})
+    assert len(manager.read().records) == 1
+
+
+def test_failed_write_leaves_cache_untouched(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """A write that fails on disk is not visible through the cache"""
+    manager = make_manager(str(tmp_path / "users.json"))
+    manager.write({1: FakeUser(id=1, name="Alice", email="alice@gmail.com")})
+
+    def no_space(*args: object) -> None:
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(_file_manager, "atomic_write", no_space)
+    with raises(OSError):
+        manager.write({2: FakeUser(id=2, name="Bob", email="bob@gmail.com")})
+    with raises(OSError):
+        manager.remove([1])
+
+    assert list(manager.read().records) == [1]
+
+
+def test_close_and_delete_release_the_lock_file(tmp_path: Path) -> None:
+    """Closing frees the lock descriptor and delete removes the lock file"""
+    with make_manager(str(tmp_path / "users.json")) as manager:
+        manager.read()
+        assert manager.lock._fd is not None
+    assert manager.lock._fd is None
+
+    manager.delete()
+    assert not list(tmp_path.iterdir())
+
+
+@mark.parametrize("backend", [JsonBackend, BinaryBackend])
+def test_parallel_load_and_scan(
+    tmp_path: Path, backend: type[BaseBackend[FakeUser]]
+) -> None:
+    """Records validated on the worker pool equal a serial load"""
+    users = {
+        i: FakeUser(id=i, name=f"User {i}", email=f"user{i}@gmail.com")
+        for i in range(1, 101)
+    }
+    metadata = {"version": "1.0.0", "title": "Users", "description": ""}
+    with FileManager[FakeUser](
+        str(tmp_path / "users"), FakeUser, metadata, backend=backend
+    ) as manager:
+        manager.write(users)
+
+    with FileManager[FakeUser](
+        str(tmp_path / "users"),
+        FakeUser,
+        metadata,
+        cache=False,
+        backend=backend,
+        workers=2,
+    ) as manager:
+        # Loads are parallel on free-threaded builds only; force the path
+        manager.parallel_load = True
+        assert manager.read().records == users
+        assert manager.read().metadata.last_id == 100
+        query: Query[FakeUser] = Query({"id__in": range(10, 101, 10)})
+        matches = manager.scan_parallel(query.matches)
+        assert matches == [(i, users[i]) for i in range(10, 101, 10)]
+
+
+def test_read_record_through_the_offset_index(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    """Binary files serve single records from the mmap without a full load"""
+    path = tmp_path / "users.bin"
+    users = {
+        i: FakeUser(id=i, name=f"User {i}", email=f"user{i}@gmail.com")
+        for i in range(1, 101)
+    }
+    metadata = {"version": "1.0.0", "title": "Users", "description": ""}
+    with FileManager[FakeUser](
+        str(path), FakeUser, metadata, cache=False, backend=BinaryBackend
+    ) as manager:
+        manager.write(users)
+
+        def no_full_load(raw: bytes) -> None:
+            raise AssertionError("the whole file was decoded")
+
+        monkeypatch.setattr(manager.backend, "decode", no_full_load)
+        assert manager.read_record(57) == users[57]
+        assert manager.read_record(1000) is None
+        assert manager.offsets is not None
+        assert manager.offsets.index_path.exists()
+        monkeypatch.undo()
+
+        # Writes keep an index in use current
+        renamed = users[57].model_copy(update={"name": "Renamed"})
+        manager.write({57: renamed, 101: users[1]})
+        assert manager.read_record(57) == renamed
+        assert manager.read_record(101) == users[1]
+
+        # An index that does not match the data file is rebuilt
+        manager.offsets.close()
+        manager.offsets.index_path.write_bytes(b"stale")
+        assert manager.read_record(2) == users[2]
+        manager.remove([2])
+        assert manager.read_record(2) is None
+
+
+@mark.parametrize("backend", [JsonBackend, BinaryBackend])
+def test_cached_writes_encode_changed_records_only(
+    tmp_path: Path, monkeypatch: MonkeyPatch, backend: type[BaseBackend[FakeUser]]
+) -> None:
+    """Writes reuse the encoding of unchanged records and stream the file"""
+    path = tmp_path / "users.data"
+    users = {
+        i: FakeUser(id=i, name=f"User {i}", email=f"user{i}@gmail.com")
+        for i in range(1, 51)
+    }
+    with (
+        FileManager[FakeUser](
+            str(path), FakeUser, METADATA, backend=backend
+        ) as manager,
+        FileManager[FakeUser](
+            str(path), FakeUser, METADATA, cache=False, backend=backend
+        ) as reader,
+    ):
+        manager.write(users)
+        # Builds the offset index of binary files, which writes keep current
+        assert reader.read_record(7) == users[7]
+
+        encoded: list[int] = []
+        to_json = manager.backend._to_json  # type: ignore[attr-defined]
+
+        def counting_to_json(record: FakeUser, **kwargs: object) -> bytes:
+            encoded.append(record.id)
+            return to_json(record, **kwargs)
+
+        monkeypatch.setattr(manager.backend, "_to_json", counting_to_json)
+        renamed = users[7].model_copy(update={"name": "Renamed"})
+        manager.write({7: renamed})
+        manager.remove([8])
+        assert encoded == [7]
+
+        expected = {**users, 7: renamed}
+        del expected[8]
+        assert manager.backend.decode(path.read_bytes()).records == expected
+        assert path.read_bytes() == manager.backend.encode(manager.read())
+        assert reader.read_record(7) == renamed
+        assert reader.read_record(8) is None
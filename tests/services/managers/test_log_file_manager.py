@@ -0,0 +1,129 @@
+import errno
+from pathlib import Path
+
+from pytest import MonkeyPatch, raises
+
+from pydantic_storage._services import BinaryBackend, LogFileManager
+from pydantic_storage._services._managers import _log_file_manager
+from tests.mocks.models import FakeUser
+
+# ====================
+# LogFileManager Tests
+# ====================
+
+
+def make_manager(file_path: Path, **kwargs: float) -> LogFileManager[FakeUser]:
+    return LogFileManager[FakeUser](
+        file_path=str(file_path),
+        model_class=FakeUser,
+        metadata={
+            "version": "1.0.0",
+            "title": "User records",
+            "description": "User record descriptions",
+        },
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+def test_mutations_are_appended_to_log(tmp_path: Path) -> None:
+    """Writes and removes append to the log instead of the snapshot"""
+    manager = make_manager(tmp_path / "users.json")
+    snapshot = manager.file_path.read_bytes()
+
+    manager.write({1: FakeUser(id=1, name="Alice", email="alice@gmail.com")})
+    manager.write({2: FakeUser(id=2, name="Bob", email="bob@gmail.com")})
+    manager.remove([1])
+
+    assert manager.file_path.read_bytes() == snapshot
+    assert len(manager.log_path.read_text().splitlines()) == 3
+
+    # A fresh reader replays the log over the snapshot
+    manager.invalidate_cache()
+    assert list(manager.read().records) == [2]
+
+
+def test_torn_trailing_line_is_ignored(tmp_path: Path) -> None:
+    """A partially written last entry does not break replay"""
+    manager = make_manager(tmp_path / "users.json")
+    manager.write({1: FakeUser(id=1, name="Alice", email="alice@gmail.com")})
+    with manager.log_path.open("a") as log:
+        log.write('{"op": "put", "id": 2, "rec')
+
+    manager.invalidate_cache()
+    assert list(manager.read().records) == [1]
+
+
+def test_log_is_compacted_into_snapshot(tmp_path: Path) -> None:
+    """The log is folded into the snapshot once it passes the threshold"""
+    manager = make_manager(tmp_path / "users.json", compact_min_bytes=512)
+    for i in range(1, 21):
+        manager.write({i: FakeUser(id=i, name=f"user{i}", email=f"u{i}@gmail.com")})
+
+    assert manager.log_size() < 512
+    manager.invalidate_cache()
+    assert len(manager.read().records) == 20
+    assert len(manager.load().records) == 20
+
+
+def test_append_after_torn_line_is_kept(tmp_path: Path) -> None:
+    """Appends after a torn line are not merged into it and lost"""
+    file_path = tmp_path / "users.json"
+    manager = make_manager(file_path)
+    manager.write({1: FakeUser(id=1, name="Alice", email="alice@gmail.com")})
+    with manager.log_path.open("a") as log:
+        log.write('{"op": "put", "id": 2, "rec')
+
+    reopened = make_manager(file_path)
+    reopened.write({3: FakeUser(id=3, name="Carol", email="carol@gmail.com")})
+    reopened.write({4: FakeUser(id=4, name="Dave", email="dave@gmail.com")})
+
+    assert list(make_manager(file_path).read().records) == [1, 3, 4]
+
+
+def test_failed_append_leaves_cache_untouched(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """An append that fails on disk is not visible through the cache"""
+    manager = make_manager(tmp_path / "users.json")
+    manager.write({1: FakeUser(id=1, name="Alice", email="alice@gmail.com")})
+
+    def no_space(*args: object) -> None:
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(_log_file_manager, "append_bytes", no_space)
+    with raises(OSError):
+        manager.write({2: FakeUser(id=2, name="Bob", email="bob@gmail.com")})
+    with raises(OSError):
+        manager.remove([1])
+
+    assert list(manager.read().records) == [1]
+
+
+def test_delete_removes_snapshot_log_and_lock(tmp_path: Path) -> None:
+    """Deleting a log manager leaves no file behind"""
+    manager = make_manager(tmp_path / "users.json")
+    manager.write({1: FakeUser(id=1, name="Alice", email="alice@gmail.com")})
+    manager.delete()
+    assert not list(tmp_path.iterdir())
+
+
+def test_read_record_sees_logged_writes(tmp_path: Path) -> None:
+    """Records are read from the snapshot until the log has entries"""
+    with LogFileManager[FakeUser](
+        str(tmp_path / "users.bin"),
+        FakeUser,
+        {"version": "1.0.0", "title": "Users", "description": ""},
+        cache=False,
+        backend=BinaryBackend,
+    ) as manager:
+        alice = FakeUser(id=1, name="Alice", email="alice@gmail.com")
+        manager.write({1: alice})
+        manager.compact()
+        assert manager.read_record(1) == alice
+
+        renamed = alice.model_copy(update={"name": "Renamed"})
+        manager.write({1: renamed})
+        assert manager.read_record(1) == renamed
+        manager.remove([1])
+        assert manager.read_record(1) is None
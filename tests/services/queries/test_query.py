@@ -0,0 +1,97 @@
+import pickle
+
+from pytest import mark, raises
+
+from pydantic_storage._services import HashIndex, Query, QueryCompiler
+from tests.mocks.models import FakeProfile
+
+PROFILES = {
+    1: FakeProfile(id=1, name="Alice", email="alice@gmail.com", age=31, tags=["admin"]),
+    2: FakeProfile(id=2, name="bob", email="bob@yahoo.com", age=17, tags=[]),
+    3: FakeProfile(id=3, name="Carol", email="carol@gmail.com", tags=["dev", "ops"]),
+    4: FakeProfile(id=4, name="Dave", email="dave@gmail.com", age=45, tags=["dev"]),
+}
+
+
+def ids(query: Query[FakeProfile]) -> list[int]:
+    matches = (profile for profile in PROFILES.values() if query.matches(profile))
+    return [profile.id for profile in query.results(matches)]
+
+
+@mark.parametrize(
+    ("lookups", "expected"),
+    [
+        ({"name": "Alice"}, [1]),
+        ({"name__exact": "Alice"}, [1]),
+        ({"name__ne": "Alice"}, [2, 3, 4]),
+        ({"age__gt": 17}, [1, 4]),
+        ({"age__gte": 17}, [1, 2, 4]),
+        ({"age__lt": 31}, [2]),
+        ({"age__lte": 31}, [1, 2]),
+        ({"age__isnull": True}, [3]),
+        ({"name__in": ["Alice", "Dave"]}, [1, 4]),
+        ({"email__startswith": "carol"}, [3]),
+        ({"email__endswith": "@gmail.com", "age__gt": 40}, [4]),
+        ({"name__icontains": "B"}, [2]),
+        ({"tags__contains": "dev"}, [3, 4]),
+    ],
+)
+def test_lookups(lookups: dict[str, object], expected: list[int]) -> None:
+    """Each lookup operator selects the expected records"""
+    assert ids(Query(lookups)) == expected
+
+
+def test_ordering_and_paging() -> None:
+    """Results are sorted by several keys, with None last, then paged"""
+    assert ids(Query({}, order_by="-age")) == [4, 1, 2, 3]
+    assert ids(Query({}, order_by=["age"])) == [2, 1, 4, 3]
+    assert ids(Query({}, order_by=["email", "-id"], offset=1, limit=2)) == [2, 3]
+    assert ids(Query({"age__isnull": False}, limit=2)) == [1, 2]
+    assert ids(Query({}, offset=10)) == []
+
+
+def test_projection() -> None:
+    """only reduces records to the listed fields"""
+    query: Query[FakeProfile] = Query({"id": 1}, only=["name", "age"])
+    matches = (profile for profile in PROFILES.values() if query.matches(profile))
+    assert query.project(query.results(matches)) == [
+        {"name": "Alice", "age": 31}
+    ]
+
+
+def test_index_plan() -> None:
+    """Equality and in lookups are narrowed by indexes, other lookups are not"""
+    index: HashIndex[FakeProfile] = HashIndex("name")
+    index.build(PROFILES)
+    indexes = {"name": index}
+
+    assert Query({"name": "bob"}).candidate_ids(indexes) == {2}
+    assert Query({"name__in": ["bob", "Dave"]}).candidate_ids(indexes) == {2, 4}
+    assert Query({"name__startswith": "b"}).candidate_ids(indexes) is None
+    assert Query({"age": 17}).candidate_ids(indexes) is None
+
+
+def test_invalid_options() -> None:
+    """Negative paging is rejected"""
+    with raises(ValueError):
+        Query({}, limit=-1)
+    with raises(ValueError):
+        Query({}, offset=-1)
+
+
+def test_queries_can_be_pickled() -> None:
+    """Queries travel to worker processes for parallel scans"""
+    query: Query[FakeProfile] = Query(
+        {"name__in": ["Alice", "bob"], "age__gt": 20, "tags__contains": "admin"}
+    )
+    copy = pickle.loads(pickle.dumps(query))
+    assert ids(copy) == ids(query) == [1]
+
+
+@mark.parametrize("lookup", ["name__icontains", "name__startswith", "email__endswith"])
+def test_string_lookups_need_strings(lookup: str) -> None:
+    """String lookups are rejected at compile time unless given a string"""
+    compiler: QueryCompiler[FakeProfile] = QueryCompiler(FakeProfile)
+    assert ids(compiler.compile({lookup: "o"})) == ids(Query({lookup: "o"}))
+    with raises(ValueError, match="must be a string"):
+        compiler.compile({lookup: 1})
@@ -0,0 +1,157 @@
+import asyncio
+import errno
+from pathlib import Path
+
+from pytest import MonkeyPatch, mark, raises
+
+from pydantic_storage._services import AsyncFileStorage, FileStorage
+from pydantic_storage._services._managers import _file_manager, _log_file_manager
+from pydantic_storage.exceptions import DuplicateEntryError
+from pydantic_storage.types import StorageMode
+from tests.mocks.models import FakeUser
+
+
+def make_storage(
+    tmp_path: Path, mode: StorageMode = "snapshot"
+) -> AsyncFileStorage[FakeUser]:
+    return AsyncFileStorage[FakeUser](
+        file_path=str(tmp_path / "users.json"),
+        model_class=FakeUser,
+        metadata={
+            "version": "1.0.0",
+            "title": "User records",
+            "description": "User record descriptions",
+        },
+        unique_fields=["id", "email"],
+        mode=mode,
+    )
+
+
+def make_user(number: int) -> FakeUser:
+    return FakeUser(id=number, name=f"User {number}", email=f"user{number}@gmail.com")
+
+
+@mark.parametrize("mode", ["snapshot", "wal"])
+def test_async_crud(tmp_path: Path, mode: StorageMode) -> None:
+    """The async storage mirrors the synchronous API."""
+
+    async def scenario() -> None:
+        async with make_storage(tmp_path, mode) as storage:
+            alice, bob = make_user(1), make_user(2)
+            assert await storage.create([alice, bob]) == [alice, bob]
+            assert await storage.count() == 2
+            assert await storage.get(email=bob.email) == bob
+            assert await storage.get_by_id(2) == bob
+            assert await storage.exists(name="User 1")
+
+            updated = await storage.update(alice, name="Alice")
+            assert updated.name == "Alice"
+            assert await storage.filter(name="Alice") == [updated]
+
+            renamed = bob.model_copy(update={"name": "Bob"})
+            assert await storage.update_where({"name": "Bob"}, name="User 2") == [
+                renamed
+            ]
+            assert await storage.update_by_id(9, name="None") is None
+            assert await storage.delete_where(name="Missing") == []
+            assert await storage.delete_by_id(2) == renamed
+            assert await storage.all() == [updated]
+            assert await storage.clear() is True
+            assert await storage.first() is None
+
+    asyncio.run(scenario())
+
+
+@mark.parametrize("mode", ["snapshot", "wal"])
+def test_writes_in_one_tick_are_coalesced(
+    tmp_path: Path, mode: StorageMode, monkeypatch: MonkeyPatch
+) -> None:
+    """A burst of concurrent creates reaches the disk with a single write."""
+    writes: list[Path] = []
+    module = _log_file_manager if mode == "wal" else _file_manager
+    name = "append_bytes" if mode == "wal" else "atomic_write"
+    write = getattr(module, name)
+
+    def counting_write(path: Path, data: bytes, durability: str = "flush") -> None:
+        writes.append(path)
+        write(path, data, durability)
+
+    users = [make_user(number) for number in range(1, 51)]
+
+    async def scenario() -> list[list[FakeUser]]:
+        async with make_storage(tmp_path, mode) as storage:
+            monkeypatch.setattr(module, name, counting_write)
+            return await asyncio.gather(*(storage.create([user]) for user in users))
+
+    results = asyncio.run(scenario())
+    monkeypatch.undo()
+
+    assert results == [[user] for user in users]
+    assert len(writes) == 1
+
+    with FileStorage[FakeUser](
+        file_path=str(tmp_path / "users.json"),
+        model_class=FakeUser,
+        metadata={"version": "1.0.0", "title": "", "description": ""},
+        mode=mode,
+    ) as reopened:
+        assert reopened.all() == users
+
+
+def test_failing_write_only_fails_its_caller(tmp_path: Path) -> None:
+    """A rejected create in a batch does not affect the others."""
+
+    async def scenario() -> None:
+        async with make_storage(tmp_path) as storage:
+            alice = make_user(1)
+            clash = FakeUser(id=2, name="Clash", email=alice.email)
+            results = await asyncio.gather(
+                storage.create([alice]),
+                storage.create([clash]),
+                storage.create([make_user(3)]),
+                return_exceptions=True,
+            )
+            assert results[0] == [alice]
+            assert isinstance(results[1], DuplicateEntryError)
+            assert results[2] == [make_user(3)]
+            assert await storage.count() == 2
+
+    asyncio.run(scenario())
+
+
+def test_failed_flush_fails_every_caller(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    """If the coalesced write fails, nothing is stored and all callers see it."""
+
+    def no_space(*args: object, **kwargs: object) -> None:
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    async def scenario() -> None:
+        async with make_storage(tmp_path) as storage:
+            monkeypatch.setattr(_file_manager, "atomic_write", no_space)
+            results = await asyncio.gather(
+                storage.create([make_user(1)]),
+                storage.create([make_user(2)]),
+                return_exceptions=True,
+            )
+            monkeypatch.undo()
+            assert all(isinstance(result, OSError) for result in results)
+            assert await storage.count() == 0
+
+            # The indexes were reset, so the same records can be created now
+            assert await storage.create([make_user(1)]) == [make_user(1)]
+
+    asyncio.run(scenario())
+
+
+def test_closed_storage_rejects_calls(tmp_path: Path) -> None:
+    """The thread pool is shut down on close."""
+
+    async def scenario() -> None:
+        storage = make_storage(tmp_path)
+        await storage.aclose()
+        with raises(RuntimeError):
+            await storage.all()
+
+    asyncio.run(scenario())
@@ -1,10 +1,21 @@
+import errno
+import io
+from functools import partial
 from pathlib import Path
+from threading import Thread
+from types import SimpleNamespace
+from typing import Any
 
 from pydantic import ValidationError
-from pytest import mark, raises
+from pytest import MonkeyPatch, mark, raises
 
 from pydantic_storage._services import FileStorage
-from tests.mocks.models import FakeUser
+from pydantic_storage._services._managers import _file_manager
+from pydantic_storage._utils import CompactRecords, StorageMetrics
+from pydantic_storage.exceptions import DuplicateEntryError
+from pydantic_storage.types import StorageMode
+from tests.conftest import StorageFactory
+from tests.mocks.models import FakeProfile, FakeUser, make_profile
 
 
 def test_json_file_storage_initialization(storage: FileStorage[FakeUser]) -> None:
@@ -155,3 +166,626 @@ def test_filter_records(storage: FileStorage[FakeUser]) -> None:
     )
     assert filtered_users[0].id == 1
     assert filtered_users[0].name == "Alice"
+
+
+def test_bulk_create_records(tmp_storage: FileStorage[FakeUser]) -> None:
+    """Bulk create assigns sequential ids and skips duplicates."""
+    storage = tmp_storage
+    users = [
+        FakeUser(id=i, name=f"user{i}", email=f"user{i}@gmail.com")
+        for i in range(1, 501)
+    ]
+
+    records = storage.create([*users, users[0]])
+    assert len(records) == 500
+    assert storage.count() == 500
+
+    # Existing records are skipped on a second insert
+    assert storage.create(users[:10]) == []
+    assert storage.manager.read().records[500].name == "user500"
+
+
+def test_unique_fields_are_enforced(tmp_storage: FileStorage[FakeUser]) -> None:
+    """Records clashing on a unique field are rejected."""
+    alice = FakeUser(id=1, name="Alice", email="alice@gmail.com")
+    bob = FakeUser(id=2, name="Bob", email="bob@gmail.com")
+    tmp_storage.create([alice, bob])
+
+    with raises(DuplicateEntryError):
+        tmp_storage.create([FakeUser(id=3, name="Eve", email="alice@gmail.com")])
+    with raises(DuplicateEntryError):
+        tmp_storage.update(bob, email="alice@gmail.com")
+
+    # A rejected batch leaves nothing behind
+    assert tmp_storage.count() == 2
+    assert tmp_storage.get(email="bob@gmail.com") == bob
+
+
+def test_indexed_lookups_follow_updates(tmp_storage: FileStorage[FakeUser]) -> None:
+    """Index lookups reflect updates made through the storage."""
+    tmp_storage.create([FakeUser(id=1, name="Alice", email="alice@gmail.com")])
+    user = tmp_storage.get(email="alice@gmail.com")
+    assert user is not None
+
+    updated = tmp_storage.update(user, email="alice@example.com")
+    assert not tmp_storage.exists(email="alice@gmail.com")
+    assert tmp_storage.filter(email="alice@example.com", name="Alice") == [updated]
+
+    # Updates are copy-on-write, earlier results keep their values
+    assert user.email == "alice@gmail.com"
+    assert tmp_storage.indexes["email"].lookup("alice@example.com") == {1}
+
+
+def test_delete_and_clear_records(tmp_storage: FileStorage[FakeUser]) -> None:
+    """Deleted records are removed from the file and never reuse ids."""
+    tmp_storage.create(
+        [
+            FakeUser(id=1, name="Alice", email="alice@gmail.com"),
+            FakeUser(id=2, name="Bob", email="bob@gmail.com"),
+        ]
+    )
+
+    deleted = tmp_storage.delete(name="Alice")
+    assert deleted is not None and deleted[0].name == "Alice"
+    assert not tmp_storage.exists(name="Alice")
+    assert tmp_storage.delete(name="Alice") is None
+    assert tmp_storage.next_id() == 3
+
+    tmp_storage.invalidate_cache()
+    assert [user.name for user in tmp_storage.all()] == ["Bob"]
+
+    assert tmp_storage.clear()
+    assert tmp_storage.count() == 0
+
+
+def test_wal_mode_storage(tmp_path: Path) -> None:
+    """A storage in wal mode round-trips through its log."""
+    storage = FileStorage[FakeUser](
+        file_path=str(tmp_path / "users.json"),
+        model_class=FakeUser,
+        metadata={
+            "version": "1.0.0",
+            "title": "User records",
+            "description": "User record descriptions",
+        },
+        mode="wal",
+    )
+    storage.create([FakeUser(id=1, name="Alice", email="alice@gmail.com")])
+    user = storage.get(name="Alice")
+    assert user is not None
+    storage.update(user, email="alice@example.com")
+
+    storage.invalidate_cache()
+    assert storage.get(email="alice@example.com") is not None
+    assert (tmp_path / "users.json.wal").exists()
+
+
+def test_concurrent_threads_share_storage(tmp_storage: FileStorage[FakeUser]) -> None:
+    """Creates from many threads are all kept while readers run alongside."""
+
+    def insert(worker: int) -> None:
+        for seq in range(20):
+            user = FakeUser(
+                id=worker * 100 + seq,
+                name=f"w{worker}",
+                email=f"{worker}-{seq}@gmail.com",
+            )
+            tmp_storage.create([user])
+            tmp_storage.filter(name=f"w{worker}")
+
+    threads = [Thread(target=insert, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tmp_storage.count() == 160
+    assert sorted(tmp_storage.manager.read().records) == list(range(1, 161))
+
+
+def test_failed_write_rolls_back_indexes(
+    tmp_storage: FileStorage[FakeUser],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """A create or update that fails to write leaves no trace in the indexes."""
+    alice = FakeUser(id=1, name="Alice", email="alice@gmail.com")
+    bob = FakeUser(id=2, name="Bob", email="bob@gmail.com")
+    tmp_storage.create([alice])
+
+    def no_space(*args: object) -> None:
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(_file_manager, "atomic_write", no_space)
+        with raises(OSError):
+            tmp_storage.create([bob])
+        with raises(OSError):
+            tmp_storage.update(alice, email="alice@example.com")
+
+    assert tmp_storage.get(email="bob@gmail.com") is None
+    assert tmp_storage.get(email="alice@gmail.com") == alice
+    assert tmp_storage.create([bob]) == [bob]
+    assert tmp_storage.get(email="bob@gmail.com") == bob
+
+
+def test_uncached_storage_lookups(tmp_path: Path) -> None:
+    """Without the cache lookups scan and unique checks still apply."""
+    storage = FileStorage[FakeUser](
+        file_path=str(tmp_path / "users.json"),
+        model_class=FakeUser,
+        metadata={
+            "version": "1.0.0",
+            "title": "User records",
+            "description": "User record descriptions",
+        },
+        unique_fields=["email"],
+        cache=False,
+    )
+    storage.create([FakeUser(id=1, name="Alice", email="alice@gmail.com")])
+    storage.create([FakeUser(id=2, name="Bob", email="bob@gmail.com")])
+
+    assert storage.get(email="bob@gmail.com") is not None
+    assert storage.filter(name="Alice")[0].id == 1
+    with raises(DuplicateEntryError):
+        storage.create([FakeUser(id=3, name="Eve", email="bob@gmail.com")])
+
+
+@mark.parametrize(
+    ("cache", "mode"), [(True, "snapshot"), (False, "snapshot"), (False, "wal")]
+)
+def test_iteration_yields_records_lazily(
+    tmp_path: Path, cache: bool, mode: StorageMode
+) -> None:
+    """iter() and iter_filter() yield records one at a time and stop early."""
+    storage = FileStorage[FakeUser](
+        file_path=str(tmp_path / "users.json"),
+        model_class=FakeUser,
+        metadata={
+            "version": "1.0.0",
+            "title": "User records",
+            "description": "User record descriptions",
+        },
+        unique_fields=["email"],
+        cache=cache,
+        mode=mode,
+    )
+    users = [
+        FakeUser(id=i, name=f"User {i % 3}", email=f"user{i}@gmail.com")
+        for i in range(1, 31)
+    ]
+    storage.create(users)
+
+    assert list(storage.iter()) == users
+    assert list(storage.iter_filter(name="User 1")) == [
+        user for user in users if user.name == "User 1"
+    ]
+    assert storage.first() == users[0]
+    assert storage.last() == users[-1]
+    assert storage.count() == len(users)
+
+    # Stopping after the first match leaves the other records unparsed
+    parsed: list[str] = []
+    validate_json = storage.manager.backend.record_adapter.validate_json
+    storage.manager.backend.record_adapter = SimpleNamespace(  # type: ignore[assignment]
+        validate_json=lambda raw: parsed.append(raw) or validate_json(raw)
+    )
+    assert storage.get(email="user2@gmail.com") == users[1]
+    if not cache and mode == "snapshot":
+        assert len(parsed) == 2
+
+
+@mark.parametrize("compact_records", [False, True])
+def test_count_and_last_use_records_in_memory(
+    storage_factory: StorageFactory, monkeypatch: MonkeyPatch, compact_records: bool
+) -> None:
+    """count() and last() of cached records neither iterate nor build them all."""
+    storage = storage_factory(FakeProfile, compact_records=compact_records)
+    profiles = [make_profile(i) for i in range(1, 21)]
+    storage.create(profiles)
+
+    built: list[int] = []
+    build = CompactRecords.build
+    monkeypatch.setattr(
+        CompactRecords, "build", lambda self, row: built.append(1) or build(self, row)
+    )
+    monkeypatch.setattr(storage.manager, "iter_records", None)
+    assert storage.count() == 20
+    assert storage.last() == profiles[-1]
+    assert len(built) == (1 if compact_records else 0)
+
+    storage.delete_where(id__gt=0)
+    assert storage.count() == 0
+    assert storage.last() is None
+
+
+def test_filter_query_engine(tmp_path: Path) -> None:
+    """filter() supports lookups, ordering, paging and projections."""
+    storage = FileStorage[FakeProfile](
+        file_path=str(tmp_path / "profiles.json"),
+        model_class=FakeProfile,
+        metadata={
+            "version": "1.0.0",
+            "title": "Profiles",
+            "description": "Profile records",
+        },
+        unique_fields=["email"],
+        indexed_fields=["name"],
+    )
+    storage.create(
+        [
+            FakeProfile(id=i, name=f"user{i % 4}", email=f"u{i}@gmail.com", age=i)
+            for i in range(1, 21)
+        ]
+    )
+
+    adults = storage.filter(age__gte=18, order_by="-age")
+    assert [profile.age for profile in adults] == [20, 19, 18]
+    page = storage.filter(
+        name__in=["user1", "user2"], order_by="age", offset=2, limit=3
+    )
+    assert [profile.age for profile in page] == [5, 6, 9]
+    assert storage.filter(name="user3", only=["id", "age"], limit=2) == [
+        {"id": 3, "age": 3},
+        {"id": 7, "age": 7},
+    ]
+    last = storage.get(email__endswith="20@gmail.com")
+    assert last is not None and last.age == 20
+    assert not storage.exists(age__gt=20)
+
+    with raises(ValueError):
+        storage.filter(order_by="missing")
+    with raises(ValueError):
+        storage.filter(name__startswith=1)
+
+
+@mark.parametrize(("cache", "mode"), [(True, "snapshot"), (False, "wal")])
+def test_ids_are_never_reused(
+    storage_factory: StorageFactory, cache: bool, mode: StorageMode
+) -> None:
+    """The persisted sequence survives deletes, reservations and reopening."""
+    open_storage = partial(storage_factory, cache=cache, mode=mode)
+
+    users = [FakeUser(id=i, name=f"User {i}", email=f"u{i}@x.io") for i in range(5)]
+    with open_storage() as storage:
+        storage.create(users[:3])
+        storage.delete(name="User 2")
+        assert storage.next_id() == 4
+        storage.create([users[3]])
+        assert list(storage.manager.read().records) == [1, 2, 4]
+
+        assert storage.reserve_ids(3) == range(5, 8)
+        with raises(RuntimeError), storage.batch():
+            storage.reserve_ids(10)
+            raise RuntimeError
+
+    with open_storage() as storage:
+        assert storage.next_id() == 8
+        storage.create([users[4]])
+        assert list(storage.manager.read().records) == [1, 2, 4, 8]
+
+
+def test_sequence_of_files_without_one(tmp_path: Path) -> None:
+    """Files written before the sequence existed continue after their max id."""
+    file_path = tmp_path / "users.json"
+    file_path.write_text(
+        '{"metadata": {"version": "1.0.0", "title": "Users", "description": "",'
+        ' "storage": {"type": "file", "encryption": "none"}},'
+        ' "records": {"3": {"id": 3, "name": "Old", "email": "old@x.io"}}}'
+    )
+    with FileStorage[FakeUser](
+        file_path=str(file_path),
+        model_class=FakeUser,
+        metadata={"version": "1.0.0", "title": "Users", "description": ""},
+    ) as storage:
+        assert storage.next_id() == 4
+
+
+def test_parallel_filter(tmp_path: Path) -> None:
+    """Uncached filters validate and match chunks on the worker pool"""
+    with FileStorage[FakeUser](
+        file_path=str(tmp_path / "users.json"),
+        model_class=FakeUser,
+        metadata={"version": "1.0.0", "title": "Users", "description": ""},
+        cache=False,
+        workers=2,
+    ) as storage:
+        users = [
+            FakeUser(id=i, name=f"User {i % 4}", email=f"{i}@x.io") for i in range(40)
+        ]
+        storage.create(users)
+        assert storage.filter(name="User 1", order_by="-id", limit=3) == [
+            users[37],
+            users[33],
+            users[29],
+        ]
+        assert storage.all() == users
+
+
+@mark.parametrize("mode", ["snapshot", "wal"])
+def test_bulk_updates_and_deletes(
+    tmp_path: Path, monkeypatch: MonkeyPatch, mode: StorageMode
+) -> None:
+    """Bulk and id-addressed writes store only the affected records, once."""
+    storage = FileStorage[FakeUser](
+        file_path=str(tmp_path / "users.json"),
+        model_class=FakeUser,
+        metadata={"version": "1.0.0", "title": "Users", "description": ""},
+        unique_fields=["email"],
+        indexed_fields=["name"],
+        mode=mode,
+    )
+    users = [FakeUser(id=i, name=f"w{i % 2}", email=f"u{i}@x.io") for i in range(1, 7)]
+    storage.create(users)
+
+    writes: list[dict[int, FakeUser]] = []
+    write = storage.manager.write
+
+    def counting_write(records: dict[int, FakeUser]) -> None:
+        writes.append(records)
+        write(records)
+
+    monkeypatch.setattr(storage.manager, "write", counting_write)
+
+    updated = storage.update_where({"name": "odd"}, name="w1")
+    assert [user.id for user in updated] == [1, 3, 5]
+    assert [sorted(records) for records in writes] == [[1, 3, 5]]
+    assert storage.filter(name="odd") == updated
+
+    # Records that would not change are not written
+    writes.clear()
+    assert storage.update_where({"name": "odd"}, name="odd") == updated
+    assert storage.update_by_id(2, email="u2@x.io") == users[1]
+    assert writes == []
+
+    with raises(DuplicateEntryError):
+        storage.update_where({"email": "same@x.io"}, name="odd")
+    assert storage.filter(name="odd") == updated
+
+    assert storage.update_by_id(2, name="two") == users[1].model_copy(
+        update={"name": "two"}
+    )
+    assert storage.update_by_id(99, name="none") is None
+
+    assert storage.delete_by_id(4) == users[3]
+    assert storage.delete_by_id(4) is None
+    assert storage.delete_where(name="odd") == updated
+    assert storage.delete_where(name="odd") == []
+
+    storage.invalidate_cache()
+    assert [user.id for user in storage.all()] == [2, 6]
+    assert storage.get(name="two") is not None
+
+
+def test_transaction_is_one_write(
+    tmp_storage: FileStorage[FakeUser], monkeypatch: MonkeyPatch
+) -> None:
+    """A transaction stores all its mutations at once, or none of them."""
+    writes: list[Path] = []
+    atomic_write = _file_manager.atomic_write
+
+    def counting_write(path: Path, *args: object) -> None:
+        writes.append(path)
+        atomic_write(path, *args)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(_file_manager, "atomic_write", counting_write)
+    with tmp_storage.transaction():
+        for i in range(1, 11):
+            tmp_storage.create([FakeUser(id=i, name="T", email=f"u{i}@x.io")])
+        tmp_storage.update_where({"name": "U"}, id__lte=5)
+        tmp_storage.delete_by_id(10)
+        assert tmp_storage.count() == 9
+    assert len(writes) == 1
+
+    with raises(RuntimeError), tmp_storage.transaction():
+        tmp_storage.delete_where(name="U")
+        tmp_storage.create([FakeUser(id=11, name="T", email="u11@x.io")])
+        assert tmp_storage.count() == 5
+        raise RuntimeError
+    assert len(writes) == 1
+
+    tmp_storage.invalidate_cache()
+    assert [user.id for user in tmp_storage.filter(name="U")] == [1, 2, 3, 4, 5]
+    assert tmp_storage.get(email="u11@x.io") is None
+    assert tmp_storage.next_id() == 11
+
+
+@mark.parametrize("mode", ["snapshot", "wal"])
+def test_write_behind_batches_mutations(
+    storage_factory: StorageFactory, mode: StorageMode
+) -> None:
+    """Write-behind stores staged mutations after N operations or on close."""
+    open_storage = partial(storage_factory, unique_fields=["email"], mode=mode)
+
+    def on_disk() -> list[str]:
+        with open_storage(cache=False) as other:
+            return [user.name for user in other.all()]
+
+    storage = open_storage(flush_every=3)
+    storage.create([FakeUser(id=1, name="a", email="a@x.io")])
+    storage.create([FakeUser(id=2, name="b", email="b@x.io")])
+    assert [user.name for user in storage.all()] == ["a", "b"]
+    assert storage.get_by_id(2) is not None
+    assert on_disk() == []
+
+    storage.update_by_id(1, name="A")
+    timer = storage.manager._flush_timer
+    assert timer is not None
+    timer.join()
+    assert on_disk() == ["A", "b"]
+
+    # Changes made by another process meanwhile are kept by the flush
+    storage.delete_by_id(2)
+    with open_storage() as other:
+        other.create([FakeUser(id=3, name="c", email="c@x.io")])
+    storage.close()
+    assert on_disk() == ["A", "c"]
+
+    with open_storage(flush_interval=0.01) as storage:
+        storage.create([FakeUser(id=4, name="d", email="d@x.io")])
+        timer = storage.manager._flush_timer
+        assert timer is not None
+        timer.join()
+        assert on_disk() == ["A", "c", "d"]
+        assert storage.next_id() == 5
+
+
+@mark.parametrize("mode", ["snapshot", "wal"])
+def test_write_behind_rebases_onto_other_writers(
+    storage_factory: StorageFactory, mode: StorageMode
+) -> None:
+    """A flush moves its new records past ids used meanwhile and checks uniques."""
+    open_storage = partial(storage_factory, unique_fields=["email"], mode=mode)
+
+    def on_disk() -> dict[int, str]:
+        with open_storage(cache=False) as other:
+            return {i: user.name for i, user in other.manager.read().records.items()}
+
+    storage = open_storage(flush_every=100)
+    storage.create([FakeUser(id=1, name="a1", email="a1@x.io")])
+    storage.create([FakeUser(id=2, name="a2", email="a2@x.io")])
+    with open_storage() as other:
+        other.create([FakeUser(id=3, name="b1", email="b1@x.io")])
+    storage.close()
+    assert on_disk() == {1: "b1", 2: "a1", 3: "a2"}
+    assert storage.next_id() == 4
+
+    # Both processes take id 4, and the other one the email as well
+    storage = open_storage(flush_every=100)
+    storage.create([FakeUser(id=4, name="a3", email="a3@x.io")])
+    with open_storage() as other:
+        other.create([FakeUser(id=4, name="b2", email="a3@x.io")])
+    with raises(DuplicateEntryError):
+        storage.close()
+    storage.close()
+    assert on_disk() == {1: "b1", 2: "a1", 3: "a2", 4: "b2"}
+    assert [user.name for user in storage.filter(email="a3@x.io")] == ["b2"]
+
+
+@mark.parametrize("mode", ["snapshot", "wal"])
+def test_compact_records(
+    tmp_path: Path, storage_factory: StorageFactory, mode: StorageMode
+) -> None:
+    """A storage holding compact records behaves like one holding models."""
+    open_storage = partial(
+        storage_factory,
+        FakeProfile,
+        "profiles.json",
+        unique_fields=["email"],
+        indexed_fields=["name"],
+        mode=mode,
+        compact_records=True,
+    )
+
+    profiles = [
+        FakeProfile(id=i, name=f"n{i % 3}", email=f"u{i}@x.io", age=i)
+        for i in range(1, 31)
+    ]
+    with open_storage() as storage:
+        storage.create(profiles)
+        with storage.transaction():
+            storage.update_where({"age": 0}, name="n0")
+            storage.delete_by_id(1)
+    if mode == "wal":
+        # The transaction logged the 10 updated records and the delete only
+        log_path = tmp_path / "profiles.json.wal"
+        assert len(log_path.read_bytes().splitlines()) == 30 + 11
+
+    with open_storage() as storage:
+        assert isinstance(storage.manager.read().records, CompactRecords)
+        assert storage.count() == 29
+        assert storage.get_by_id(2) == profiles[1]
+        assert [p.id for p in storage.filter(name="n0")] == list(range(3, 31, 3))
+        assert {p.age for p in storage.filter(name="n0")} == {0}
+        assert [p.id for p in storage.iter_filter(age__gt=28)] == [29]
+        with raises(DuplicateEntryError):
+            storage.update_by_id(2, email="u3@x.io")
+        assert storage.all()[0] == profiles[1]
+
+
+@mark.parametrize("mode", ["snapshot", "wal"])
+def test_metrics(tmp_path: Path, mode: StorageMode) -> None:
+    """Operations are timed and charged with the I/O they cause."""
+    metrics = StorageMetrics()
+    storage = FileStorage[FakeProfile](
+        file_path=str(tmp_path / "profiles.json"),
+        model_class=FakeProfile,
+        metadata={"version": "1.0.0", "title": "Profiles", "description": ""},
+        unique_fields=["email"],
+        mode=mode,
+        metrics=metrics,
+    )
+    with storage:
+        storage.create([FakeProfile(id=1, name="a", email="a@x.io")])
+        storage.get(name="a")
+        storage.get(name="b")
+        storage.update_by_id(1, age=3)
+
+    operations = metrics.as_dict()["operations"]
+    assert set(operations) == {"create", "get", "update_by_id"}
+    create, get = operations["create"], operations["get"]
+    assert create["count"] == 1
+    assert create["loads"] == 1 and create["cache_misses"] == 1
+    assert create["bytes_read"] > 0 and create["bytes_written"] > 0
+    assert get["count"] == 2
+    assert get["cache_hits"] == 2 and get["loads"] == 0
+    assert get["bytes_read"] == 0 and get["bytes_written"] == 0
+
+    write = "rewrites" if mode == "snapshot" else "appends"
+    assert create[write] == 1 and operations["update_by_id"][write] == 1
+    totals = metrics.as_dict()["totals"]
+    assert totals[write] == 2
+    phases = metrics.as_dict()["phases"]
+    assert {"read_file", "decode", "encode", "write_file"} <= set(phases)
+
+
+@mark.parametrize("mode", ["snapshot", "wal"])
+def test_jsonl_export_and_import(
+    tmp_path: Path, storage_factory: StorageFactory, mode: StorageMode
+) -> None:
+    """Records move between stores as JSON Lines, imported in one write."""
+    open_storage = partial(
+        storage_factory, FakeProfile, unique_fields=["email"], mode=mode
+    )
+
+    profiles = [
+        FakeProfile(id=i, name=f"n{i % 3}", email=f"u{i}@x.io", age=i)
+        for i in range(1, 11)
+    ]
+    export_path = tmp_path / "profiles.jsonl"
+    with open_storage("source.json") as source:
+        source.create(profiles)
+        assert source.export_jsonl(export_path) == 10
+
+    with open_storage("target.json") as target:
+        writes: list[int] = []
+        save = target.manager.save if mode == "snapshot" else target.manager.append
+
+        def counting_save(*args: Any, **kwargs: Any) -> None:
+            writes.append(1)
+            save(*args, **kwargs)
+
+        target.manager.save = counting_save  # type: ignore[method-assign]
+        target.manager.append = counting_save  # type: ignore[method-assign]
+        assert target.import_jsonl(export_path, chunk_size=3) == 10
+        assert len(writes) == 1
+        assert target.all() == profiles
+
+        # Identical items are skipped unless the caller vouches there are none
+        assert target.import_jsonl(export_path, chunk_size=4) == 0
+        assert target.count() == 10
+
+        # A clash or an invalid line stores nothing
+        with raises(DuplicateEntryError):
+            target.import_jsonl(export_path, check_duplicates=False)
+        with export_path.open("ab") as stream:
+            stream.write(b'{"id": 11}\n')
+        with open_storage("other.json") as other:
+            with raises(ValidationError):
+                other.import_jsonl(export_path, chunk_size=3)
+            assert other.count() == 0
+
+    with open_storage("fast.json") as fast:
+        lines = export_path.read_bytes().splitlines()[:-1]
+        stream = io.BytesIO(b"\n".join(lines))
+        assert fast.import_jsonl(stream, check_duplicates=False) == 10
+        assert fast.all() == profiles
@@ -0,0 +1,191 @@
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+from pytest import MonkeyPatch, mark, raises
+
+from pydantic_storage._services import FileManager, ShardedFileStorage
+from pydantic_storage.exceptions import DuplicateEntryError
+from pydantic_storage.types import StorageMode
+from tests.mocks.models import FakeProfile, make_profile
+
+
+def open_storage(
+    directory: Path, mode: StorageMode = "snapshot", **layout: Any
+) -> ShardedFileStorage[FakeProfile]:
+    return ShardedFileStorage[FakeProfile](
+        file_path=str(directory),
+        model_class=FakeProfile,
+        metadata={
+            "version": "1.0.0",
+            "title": "Profiles",
+            "description": "Profile records",
+        },
+        unique_fields=["email"],
+        indexed_fields=["name"],
+        mode=mode,
+        **layout,
+    )
+
+
+@mark.parametrize("mode", ["snapshot", "wal"])
+@mark.parametrize(
+    "layout",
+    [
+        {"shards": 4},
+        {"shards": 3, "shard_key": "name"},
+        {"shard_key": "age", "partition": "range", "bounds": [4, 8]},
+    ],
+)
+def test_sharded_crud(
+    tmp_path: Path, mode: StorageMode, layout: dict[str, Any]
+) -> None:
+    """The sharded storage behaves like FileStorage whatever the layout."""
+    profiles = [make_profile(i) for i in range(1, 11)]
+    with open_storage(tmp_path, mode, **layout) as storage:
+        assert storage.create([*profiles, profiles[0]]) == profiles
+        assert storage.all() == profiles
+        assert storage.count() == 10
+        assert storage.next_id() == 11
+        assert storage.first() == profiles[0]
+        assert storage.last() == profiles[-1]
+        assert storage.get(email="u4@x.io") == profiles[3]
+        assert storage.get_by_id(4) == profiles[3]
+        assert storage.get_by_id(99) is None
+        assert storage.exists(name__in=["user1"])
+        assert [p.id for p in storage.filter(name="user1", age__gt=4)] == [7, 10]
+        assert storage.filter(order_by="-age", limit=2, only=["id"]) == [
+            {"id": 10},
+            {"id": 9},
+        ]
+        assert sorted(p.id for p in storage.iter_filter(age__lt=4)) == [1, 2, 3]
+
+        # Changing the shard key moves the record to its new shard
+        updated = storage.update(profiles[1], name="user0", age=9)
+        assert storage.get(email="u2@x.io") == updated
+        assert storage.filter(name="user0", age=9) == [updated, profiles[8]]
+        assert storage.delete(email="u2@x.io", age=9) == [updated]
+
+    with open_storage(tmp_path, mode, **layout) as storage:
+        assert sorted(p.id for p in storage.iter()) == [1, 3, 4, 5, 6, 7, 8, 9, 10]
+        assert storage.all() == [p for p in profiles if p.id != 2]
+        assert storage.create([make_profile(11)]) == [make_profile(11)]
+        assert storage.clear() is True
+        assert storage.all() == []
+        assert storage.next_id() == 12
+
+
+def test_records_are_spread_over_shards(tmp_path: Path) -> None:
+    """Every shard file holds its share and a manifest describes the layout."""
+    with open_storage(tmp_path, shards=4) as storage:
+        storage.create([make_profile(i) for i in range(1, 41)])
+        sizes = [len(shard.manager.read().records) for shard in storage.shards]
+
+    assert sum(sizes) == 40
+    assert all(sizes)
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["shards"] == [f"shard-000{i}.json" for i in range(4)]
+    assert all((tmp_path / name).exists() for name in manifest["shards"])
+
+
+def test_point_operations_touch_one_shard(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    """Lookups and writes pinned by the shard key read and write one shard."""
+    with open_storage(tmp_path, shards=4, shard_key="name", cache=False) as storage:
+        storage.create([make_profile(i) for i in range(1, 13)])
+
+        reads: list[Path] = []
+        iter_records = FileManager.iter_records
+
+        def counting_iter_records(manager: FileManager[Any]) -> Any:
+            reads.append(manager.file_path)
+            return iter_records(manager)
+
+        monkeypatch.setattr(FileManager, "iter_records", counting_iter_records)
+        assert [p.id for p in storage.filter(name="user2")] == [2, 5, 8, 11]
+        assert len(set(reads)) == 1
+
+        reads.clear()
+        assert storage.filter(name__in=["user1", "user2"])
+        assert len(set(reads)) <= 2
+
+        reads.clear()
+        assert storage.count() == 12
+        assert len(set(reads)) == 4
+
+
+def test_unique_fields_span_shards(tmp_path: Path) -> None:
+    """A unique field that is not the shard key is checked in every shard."""
+    with open_storage(tmp_path, shards=4, shard_key="name") as storage:
+        alice, bob = make_profile(1), make_profile(2)
+        storage.create([alice, bob])
+
+        with raises(DuplicateEntryError, match="email"):
+            storage.create([alice.model_copy(update={"name": "other"})])
+        with raises(DuplicateEntryError, match="email"):
+            storage.update(bob, name="user1", email=alice.email)
+        assert storage.all() == [alice, bob]
+
+
+def test_ids_are_never_reused_across_shards(tmp_path: Path) -> None:
+    """Reserved and deleted ids are skipped by later creates in any shard."""
+    with open_storage(tmp_path, shards=4) as storage:
+        storage.create([make_profile(1), make_profile(2)])
+        storage.delete(email="u2@x.io")
+        assert storage.reserve_ids(3) == range(3, 6)
+
+    with open_storage(tmp_path, shards=4) as storage:
+        assert storage.next_id() == 6
+
+
+def test_layout_is_checked_against_the_manifest(tmp_path: Path) -> None:
+    """A directory cannot be reopened with another layout."""
+    open_storage(tmp_path, shards=4).close()
+    with raises(ValueError, match="resharding"):
+        open_storage(tmp_path, shards=2)
+    with raises(ValueError, match="bounds"):
+        open_storage(tmp_path / "range", shard_key="age", partition="range")
+
+
+@mark.parametrize("layout", [{"shards": 4}, {"shards": 3, "shard_key": "name"}])
+def test_bulk_updates_and_deletes(tmp_path: Path, layout: dict[str, Any]) -> None:
+    """Bulk writes span shards and move records whose shard key changes."""
+    profiles = [make_profile(i) for i in range(1, 13)]
+    with open_storage(tmp_path, **layout) as storage:
+        storage.create(profiles)
+
+        updated = storage.update_where({"name": "moved"}, name="user1", age__gt=4)
+        assert [p.id for p in updated] == [7, 10]
+        assert storage.filter(name="moved") == updated
+        assert storage.update_by_id(7, age=70) == updated[0].model_copy(
+            update={"age": 70}
+        )
+        assert storage.update_by_id(99, age=1) is None
+
+        with raises(DuplicateEntryError, match="email"):
+            storage.update_where({"email": "same@x.io"}, name="user2")
+        assert storage.count() == 12
+
+        assert storage.delete_by_id(10) == updated[1]
+        assert storage.delete_by_id(10) is None
+        assert [p.id for p in storage.delete_where(name="user0")] == [3, 6, 9, 12]
+
+    with open_storage(tmp_path, **layout) as storage:
+        assert [p.id for p in storage.all()] == [1, 2, 4, 5, 7, 8, 11]
+        assert storage.get(name="moved", age=70) is not None
+
+
+def test_jsonl_export_and_import(tmp_path: Path) -> None:
+    """JSON Lines round-trip through the chunked import of the base class."""
+    profiles = [make_profile(i) for i in range(1, 11)]
+    stream = io.BytesIO()
+    with open_storage(tmp_path / "source", shards=4) as source:
+        source.create(profiles)
+        assert source.export_jsonl(stream) == 10
+
+    stream.seek(0)
+    with open_storage(tmp_path / "target", shards=3, shard_key="name") as target:
+        assert target.import_jsonl(stream, chunk_size=4) == 10
+        assert sorted(target.all(), key=lambda p: p.id) == profiles
@@ -0,0 +1,151 @@
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+from threading import Thread
+
+from pytest import fixture, raises
+
+from pydantic_storage._services import SqliteStorage
+from pydantic_storage.exceptions import DuplicateEntryError
+from tests.mocks.models import FakeProfile, make_profile
+
+
+def open_storage(file_path: Path) -> SqliteStorage[FakeProfile]:
+    return SqliteStorage[FakeProfile](
+        file_path=str(file_path),
+        model_class=FakeProfile,
+        metadata={
+            "version": "1.0.0",
+            "title": "Profiles",
+            "description": "Profile records",
+        },
+        unique_fields=["email"],
+        indexed_fields=["name"],
+    )
+
+
+@fixture
+def sqlite_storage(tmp_path: Path) -> Iterator[SqliteStorage[FakeProfile]]:
+    with open_storage(tmp_path / "profiles.db") as storage:
+        yield storage
+
+
+def test_sqlite_crud(sqlite_storage: SqliteStorage[FakeProfile]) -> None:
+    """The SQLite engine behaves like FileStorage."""
+    profiles = [make_profile(i) for i in range(1, 11)]
+    assert sqlite_storage.create([*profiles, profiles[0]]) == profiles
+    assert sqlite_storage.count() == 10
+    assert sqlite_storage.next_id() == 11
+    assert sqlite_storage.first() == profiles[0]
+    assert sqlite_storage.last() == profiles[-1]
+    assert sqlite_storage.get(email="u4@x.io") == profiles[3]
+    assert sqlite_storage.get_by_id(4) == profiles[3]
+    assert sqlite_storage.get_by_id(99) is None
+    assert sqlite_storage.exists(name__in=["user1"])
+    assert [p.id for p in sqlite_storage.filter(name="user1", age__gt=4)] == [7, 10]
+    assert sqlite_storage.filter(order_by="-age", limit=2, only=["id"]) == [
+        {"id": 10},
+        {"id": 9},
+    ]
+
+    updated = sqlite_storage.update(profiles[0], name="first")
+    assert sqlite_storage.get(name="first") == updated
+    assert sqlite_storage.delete(email="u2@x.io") == [profiles[1]]
+    assert list(sqlite_storage.iter_filter(email="u2@x.io")) == []
+    assert sqlite_storage.clear() is True
+    assert sqlite_storage.all() == []
+
+
+def test_sqlite_unique_fields(sqlite_storage: SqliteStorage[FakeProfile]) -> None:
+    """Unique indexes reject clashes and leave the data as it was."""
+    alice, bob = make_profile(1), make_profile(2)
+    sqlite_storage.create([alice, bob])
+
+    with raises(DuplicateEntryError, match="email"):
+        sqlite_storage.create([make_profile(3), alice.model_copy(update={"id": 9})])
+    with raises(DuplicateEntryError, match="email"):
+        sqlite_storage.update(bob, email=alice.email)
+    assert sqlite_storage.all() == [alice, bob]
+
+
+def test_sqlite_bulk_updates_and_deletes(
+    sqlite_storage: SqliteStorage[FakeProfile],
+) -> None:
+    """Bulk and id-addressed writes change only the matching rows."""
+    profiles = [make_profile(i) for i in range(1, 7)]
+    sqlite_storage.create(profiles)
+
+    updated = sqlite_storage.update_where({"name": "odd"}, name="user1")
+    assert [p.id for p in updated] == [1, 4]
+    assert sqlite_storage.filter(name="odd") == updated
+    assert sqlite_storage.update_by_id(2, age=20) == profiles[1].model_copy(
+        update={"age": 20}
+    )
+    assert sqlite_storage.update_by_id(99, age=1) is None
+
+    with raises(DuplicateEntryError, match="email"):
+        sqlite_storage.update_where({"email": "same@x.io"}, name="odd")
+    assert sqlite_storage.filter(name="odd") == updated
+
+    assert sqlite_storage.delete_by_id(3) == profiles[2]
+    assert sqlite_storage.delete_by_id(3) is None
+    assert sqlite_storage.delete_where(name="odd") == updated
+    assert [p.id for p in sqlite_storage.all()] == [2, 5, 6]
+
+
+def test_sqlite_lookups_use_indexes(
+    sqlite_storage: SqliteStorage[FakeProfile],
+) -> None:
+    """Lookups on indexed fields are answered by an index, not a scan."""
+    query = sqlite_storage.queries.compile({"name": "a"})
+    where, params = sqlite_storage._where(query)
+    plan = sqlite_storage._connection().execute(
+        f"EXPLAIN QUERY PLAN SELECT id, data FROM records{where}", params
+    )
+    assert any("records_field_name" in row[-1] for row in plan)
+
+
+def test_sqlite_persists_and_runs_in_wal_mode(tmp_path: Path) -> None:
+    """Records survive a reopen and the journal is a write-ahead log."""
+    with open_storage(tmp_path / "profiles.db") as storage:
+        storage.create([make_profile(1)])
+
+    with open_storage(tmp_path / "profiles.db") as storage:
+        assert storage.all() == [make_profile(1)]
+        mode = storage._connection().execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    with sqlite3.connect(tmp_path / "profiles.db") as connection:
+        (metadata,) = connection.execute("SELECT value FROM metadata").fetchone()
+    assert '"type":"sqlite"' in metadata
+
+
+def test_sqlite_concurrent_threads(
+    sqlite_storage: SqliteStorage[FakeProfile],
+) -> None:
+    """Threads write through their own connections without losing records."""
+
+    def worker(offset: int) -> None:
+        for i in range(offset, offset + 20):
+            sqlite_storage.create([make_profile(i)])
+
+    threads = [Thread(target=worker, args=(i * 100,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sqlite_storage.count() == 80
+
+
+def test_sqlite_ids_are_never_reused(
+    sqlite_storage: SqliteStorage[FakeProfile],
+) -> None:
+    """Deleted ids and reserved blocks are skipped by later creates."""
+    sqlite_storage.create([make_profile(1), make_profile(2)])
+    sqlite_storage.delete(email="u2@x.io")
+    assert sqlite_storage.next_id() == 3
+    assert sqlite_storage.reserve_ids(2) == range(3, 5)
+    sqlite_storage.create([make_profile(3)])
+    rows = sqlite_storage._connection().execute("SELECT id FROM records ORDER BY id")
+    assert [record_id for (record_id,) in rows] == [1, 5]
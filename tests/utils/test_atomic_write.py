@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from pytest import MonkeyPatch, mark
+
+from pydantic_storage._utils import _atomic_write, append_bytes, atomic_write
+from pydantic_storage.types import Durability
+
+# =================
+# Atomic Write Test
+# =================
+
+
+@mark.parametrize(
+    ("durability", "file_syncs", "directory_syncs"),
+    [("none", 0, 0), ("flush", 0, 0), ("fsync", 1, 1)],
+)
+def test_durability_levels(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    durability: Durability,
+    file_syncs: int,
+    directory_syncs: int,
+) -> None:
+    """Only the fsync level syncs the file and its directory"""
+    calls: list[str] = []
+    monkeypatch.setattr(_atomic_write.os, "fsync", lambda fd: calls.append("file"))
+    monkeypatch.setattr(
+        _atomic_write, "fsync_directory", lambda path: calls.append("directory")
+    )
+
+    path = tmp_path / "data.json"
+    path.write_bytes(b"old")
+    atomic_write(path, b"new", durability)
+
+    assert path.read_bytes() == b"new"
+    assert calls.count("file") == file_syncs
+    assert calls.count("directory") == directory_syncs
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@mark.parametrize(
+    ("durability", "file_syncs", "directory_syncs"),
+    [("none", 0, 0), ("flush", 0, 0), ("fsync", 2, 1)],
+)
+def test_append_durability_levels(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    durability: Durability,
+    file_syncs: int,
+    directory_syncs: int,
+) -> None:
+    """Appends sync per level and sync the directory only on creation"""
+    calls: list[str] = []
+    monkeypatch.setattr(_atomic_write.os, "fsync", lambda fd: calls.append("file"))
+    monkeypatch.setattr(
+        _atomic_write, "fsync_directory", lambda path: calls.append("directory")
+    )
+
+    path = tmp_path / "data.log"
+    append_bytes(path, b"a\n", durability)
+    append_bytes(path, b"b\n", durability)
+
+    assert path.read_bytes() == b"a\nb\n"
+    assert calls.count("file") == file_syncs
+    assert calls.count("directory") == directory_syncs
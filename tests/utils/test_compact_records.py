@@ -0,0 +1,64 @@
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+from pytest import raises
+
+from pydantic_storage._utils import CompactRecords, changed_records, snapshot_items
+from tests.mocks.models import FakeProfile, make_profile
+
+
+def test_records_round_trip_through_rows() -> None:
+    """Stored records come back equal, as fresh models with every field set"""
+    profiles = {i: make_profile(i) for i in range(1, 4)}
+    records = CompactRecords(FakeProfile, profiles.items())
+    assert records.rows[1] == (1, "user1", "u1@x.io", 1, [])
+    assert dict(records) == profiles
+    assert records[2] is not records[2]
+    assert records[2].model_fields_set == set(FakeProfile.model_fields)
+
+    records[2] = records[2].model_copy(update={"age": 30})
+    del records[3]
+    assert records.get(2) == profiles[2].model_copy(update={"age": 30})
+    assert 3 not in records and len(records) == 2
+
+    copied = records.copy()
+    copied.pop(1)
+    assert list(records) == [1, 2]
+    assert copied.rows[2] is records.rows[2]
+    assert list(reversed(records)) == [2, 1]
+
+
+def test_models_with_private_or_extra_attributes() -> None:
+    """Private attributes get their defaults; extra fields are refused"""
+
+    class Private(BaseModel):
+        id: int
+        _seen: int = PrivateAttr(default=7)
+
+    class Extra(BaseModel):
+        model_config = ConfigDict(extra="allow")
+        id: int
+
+    records = CompactRecords(Private, [(1, Private(id=1))])
+    assert records[1].id == 1 and records[1]._seen == 7
+    with raises(ValueError, match="extra"):
+        CompactRecords(Extra)
+
+
+def test_changed_records_compares_rows() -> None:
+    """Only records stored since the copy count as changed"""
+    records = CompactRecords(FakeProfile, [(i, make_profile(i)) for i in range(1, 4)])
+    staged = records.copy()
+    staged[2] = make_profile(20)
+    staged[4] = make_profile(4)
+    assert [record_id for record_id, _ in changed_records(records, staged)] == [2, 4]
+
+    plain = dict(records)
+    assert list(changed_records(plain, {**plain})) == []
+
+
+def test_snapshot_items_ignore_later_changes() -> None:
+    """Iteration sees the records as they were when it started"""
+    records = CompactRecords(FakeProfile, [(i, make_profile(i)) for i in range(1, 4)])
+    items = snapshot_items(records)
+    del records[2]
+    records[9] = make_profile(9)
+    assert [record_id for record_id, _ in items] == [1, 2, 3]
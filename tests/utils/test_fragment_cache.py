@@ -0,0 +1,61 @@
+from pydantic_storage._utils import CompactRecords, FragmentCache
+from tests.mocks.models import FakeProfile, make_profile
+
+
+def test_only_changed_records_are_encoded() -> None:
+    """Records that are still the same objects keep their fragments"""
+    encoded: list[int] = []
+
+    def encode(record_id: int, record: FakeProfile) -> bytes:
+        encoded.append(record_id)
+        return record.email.encode()
+
+    fragments: FragmentCache[FakeProfile] = FragmentCache()
+    records = {i: make_profile(i) for i in range(1, 5)}
+    assert list(fragments.fragments(records, encode)) == [
+        b"u1@x.io",
+        b"u2@x.io",
+        b"u3@x.io",
+        b"u4@x.io",
+    ]
+    assert encoded == [1, 2, 3, 4]
+
+    encoded.clear()
+    records[2] = records[2].model_copy(update={"email": "two@x.io"})
+    records[5] = make_profile(5)
+    del records[3]
+    assert list(fragments.fragments(records, encode)) == [
+        b"u1@x.io",
+        b"two@x.io",
+        b"u4@x.io",
+        b"u5@x.io",
+    ]
+    assert encoded == [2, 5]
+    assert len(fragments) == 4
+
+    # Equal records that are other objects are encoded again
+    encoded.clear()
+    records[1] = make_profile(1)
+    list(fragments.fragments(records, encode))
+    assert encoded == [1]
+
+    fragments.clear()
+    assert len(fragments) == 0
+
+
+def test_compact_records_are_compared_by_row() -> None:
+    """Rows stand in for records, which compact records build anew each time"""
+    encoded: list[int] = []
+
+    def encode(record_id: int, record: FakeProfile) -> bytes:
+        encoded.append(record_id)
+        return record.email.encode()
+
+    fragments: FragmentCache[FakeProfile] = FragmentCache()
+    records = CompactRecords(FakeProfile, ((i, make_profile(i)) for i in (1, 2)))
+    assert list(fragments.fragments(records, encode)) == [b"u1@x.io", b"u2@x.io"]
+
+    copied = records.copy()
+    copied[2] = make_profile(2).model_copy(update={"email": "new@x.io"})
+    assert list(fragments.fragments(copied, encode)) == [b"u1@x.io", b"new@x.io"]
+    assert encoded == [1, 2, 2]
@@ -0,0 +1,75 @@
+import io
+import json
+from json import JSONDecodeError
+
+from pytest import mark, raises
+
+from pydantic_storage._utils import iter_object_items, read_member
+
+# ================
+# JSON Stream Test
+# ================
+
+DOCUMENT = {
+    "metadata": {"version": "1.0.0", "tags": ["a", "}", "{"], "size": 12345},
+    "records": {
+        "1": {"id": 1, "name": 'Al "ice" \\ ü', "score": 1.5e3},
+        "2": {"id": 2, "name": "Bob", "nested": {"list": [1, 2, {"x": None}]}},
+        "10": {"id": 10, "name": "", "flag": True},
+    },
+    "trailer": 123456789,
+}
+
+
+@mark.parametrize("chunk_size", [1, 2, 7, 64, 64 * 1024])
+@mark.parametrize("indent", [None, 2])
+def test_streams_members_of_the_nested_object(
+    chunk_size: int, indent: int | None
+) -> None:
+    """Members come out in order whatever the chunk boundaries"""
+    stream = io.StringIO(json.dumps(DOCUMENT, indent=indent, ensure_ascii=False))
+    items = [
+        (name, json.loads(raw))
+        for name, raw in iter_object_items(stream, "records", chunk_size=chunk_size)
+    ]
+    assert items == list(DOCUMENT["records"].items())
+
+
+def test_missing_or_empty_object_yields_nothing() -> None:
+    """A document without the key, or with an empty object, yields no members"""
+    assert list(iter_object_items(io.StringIO('{"metadata": {}}'), "records")) == []
+    assert list(iter_object_items(io.StringIO('{"records": {}}'), "records")) == []
+    assert list(iter_object_items(io.StringIO("{}"), "records")) == []
+
+
+def test_stops_reading_when_the_consumer_stops() -> None:
+    """Taking the first member does not read the rest of the document"""
+    text = json.dumps({"records": {str(i): {"id": i} for i in range(10_000)}})
+    stream = io.StringIO(text)
+    first = next(iter_object_items(stream, "records", chunk_size=256))
+    assert first == ("0", '{"id": 0}')
+    assert stream.tell() < len(text) // 10
+
+
+@mark.parametrize("text", ['{"records": {"1": {"id": 1}', '{"records": [1]}', "[]"])
+def test_malformed_documents_raise(text: str) -> None:
+    """Truncated or unexpected documents raise JSONDecodeError"""
+    with raises(JSONDecodeError):
+        list(iter_object_items(io.StringIO(text), "records", chunk_size=4))
+
+
+@mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_read_member_stops_after_it(chunk_size: int) -> None:
+    """A member is read without reading the members after it"""
+    text = json.dumps(DOCUMENT, indent=2)
+    stream = io.StringIO(text)
+    raw = read_member(stream, "metadata", chunk_size=chunk_size)
+    assert raw is not None and json.loads(raw) == DOCUMENT["metadata"]
+    if chunk_size < 64:
+        assert stream.tell() < len(text) // 2
+
+    assert read_member(io.StringIO(text), "trailer") == "123456789"
+    assert read_member(io.StringIO(text), "missing") is None
+    assert read_member(io.StringIO("{}"), "metadata") is None
+    with raises(JSONDecodeError):
+        read_member(io.StringIO("[1]"), "metadata")
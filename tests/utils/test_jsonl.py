@@ -0,0 +1,48 @@
+import io
+from pathlib import Path
+
+from pydantic import ValidationError
+from pytest import raises
+
+from pydantic_storage._utils import read_jsonl, type_adapter, write_jsonl
+from tests.mocks.models import FakeProfile, make_profile
+
+ADAPTER = type_adapter(list[FakeProfile])
+
+
+def test_round_trip_in_chunks(tmp_path: Path) -> None:
+    """Items written to a path come back in chunks of the given size"""
+    profiles = [make_profile(i) for i in range(1, 8)]
+    path = tmp_path / "profiles.jsonl"
+    assert write_jsonl(path, iter(profiles), FakeProfile, chunk_size=3) == 7
+
+    lines = path.read_bytes().splitlines()
+    assert len(lines) == 7
+    assert lines[0] == profiles[0].model_dump_json().encode()
+
+    chunks = list(read_jsonl(str(path), ADAPTER, chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert [item for chunk in chunks for item in chunk] == profiles
+
+
+def test_streams_are_left_open() -> None:
+    """Streams are read and written as given; blank lines are skipped"""
+    stream = io.BytesIO()
+    assert write_jsonl(stream, [], FakeProfile) == 0
+    write_jsonl(stream, [make_profile(1)], FakeProfile)
+    stream.write(b"\n  \n")
+    write_jsonl(stream, [make_profile(2)], FakeProfile)
+
+    stream.seek(0)
+    assert list(read_jsonl(stream, ADAPTER)) == [[make_profile(1), make_profile(2)]]
+    assert not stream.closed
+
+
+def test_invalid_lines_are_rejected() -> None:
+    """Lines must be valid items, one JSON value each"""
+    with raises(ValidationError):
+        list(read_jsonl(io.BytesIO(b'{"id": 1}\n'), ADAPTER))
+
+    line = make_profile(1).model_dump_json().encode()
+    with raises(ValueError, match="one JSON value per line"):
+        list(read_jsonl(io.BytesIO(line + b"," + line + b"\n"), ADAPTER))
@@ -0,0 +1,81 @@
+from pytest import raises
+
+from pydantic_storage._utils import StorageMetrics, measured
+
+
+class Service:
+    def __init__(self, metrics: StorageMetrics | None) -> None:
+        self.metrics = metrics
+
+    @measured
+    def read(self) -> int:
+        if self.metrics is not None:
+            self.metrics.count("bytes_read", 10)
+        return 1
+
+    @measured
+    def read_twice(self) -> int:
+        return self.read() + self.read()
+
+    @measured
+    def fail(self) -> None:
+        raise RuntimeError("boom")
+
+
+def test_operations_collect_their_counters() -> None:
+    """Nested operations and their counters are recorded by the outermost"""
+    events: list[tuple[str, dict[str, int]]] = []
+    metrics = StorageMetrics([lambda name, _, counts: events.append((name, counts))])
+    service = Service(metrics)
+
+    assert service.read_twice() == 2
+    with raises(RuntimeError):
+        service.fail()
+    metrics.count("cache_hits")
+
+    assert events == [("read_twice", {"bytes_read": 20}), ("fail", {"errors": 1})]
+    exported = metrics.as_dict()
+    assert set(exported["operations"]) == {"read_twice", "fail"}
+    read_twice = exported["operations"]["read_twice"]
+    assert read_twice["count"] == 1
+    assert read_twice["errors"] == 0
+    assert read_twice["bytes_read"] == 20
+    assert sum(read_twice["buckets"].values()) == 1
+    assert exported["operations"]["fail"]["errors"] == 1
+    assert exported["totals"]["bytes_read"] == 20
+    assert exported["totals"]["cache_hits"] == 1
+
+
+def test_phases_and_reset() -> None:
+    """Phases get histograms of their own and reset drops everything"""
+    metrics = StorageMetrics()
+    with metrics.phase("decode"):
+        pass
+    with metrics.phase("decode"):
+        pass
+    decode = metrics.as_dict()["phases"]["decode"]
+    assert decode["count"] == 2
+    assert list(decode["buckets"])[-1] == "+Inf"
+
+    metrics.reset()
+    assert metrics.as_dict() == {
+        "operations": {},
+        "phases": {},
+        "totals": dict.fromkeys(
+            [
+                "bytes_read",
+                "bytes_written",
+                "cache_hits",
+                "cache_misses",
+                "loads",
+                "rewrites",
+                "appends",
+            ],
+            0,
+        ),
+    }
+
+
+def test_methods_run_unmeasured_without_metrics() -> None:
+    """A service without metrics just calls the method"""
+    assert Service(None).read_twice() == 2
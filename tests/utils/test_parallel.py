@@ -0,0 +1,22 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from pydantic_storage._utils import chunked, gil_enabled, worker_pool
+
+
+def test_chunked_keeps_order_and_balances() -> None:
+    """Chunks are contiguous and cover every item in order"""
+    chunks = chunked(list(range(10)), 4)
+    assert [item for chunk in chunks for item in chunk] == list(range(10))
+    assert len(chunks) == 4
+    assert chunked([], 4) == []
+    assert chunked([1, 2], 8) == [[1], [2]]
+
+
+def test_worker_pool_matches_the_interpreter() -> None:
+    """Processes are used under the GIL and threads without it"""
+    pool = worker_pool(2)
+    try:
+        expected = ProcessPoolExecutor if gil_enabled() else ThreadPoolExecutor
+        assert isinstance(pool, expected)
+    finally:
+        pool.shutdown()
@@ -0,0 +1,52 @@
+from threading import Event, Thread
+
+from pytest import raises
+
+from pydantic_storage._utils import ReadWriteLock
+
+# ===================
+# ReadWriteLock Tests
+# ===================
+
+
+def test_readers_share_and_writer_waits() -> None:
+    """Readers overlap while a writer waits for them to finish"""
+    lock = ReadWriteLock()
+    reader_in, release_reader, written = Event(), Event(), Event()
+
+    def reader() -> None:
+        with lock.read():
+            reader_in.set()
+            release_reader.wait(timeout=1)
+
+    def writer() -> None:
+        with lock.write():
+            written.set()
+
+    with lock.read():
+        # A second reader gets in while the first still holds the lock
+        reader_thread = Thread(target=reader)
+        reader_thread.start()
+        assert reader_in.wait(timeout=1)
+
+        writer_thread = Thread(target=writer)
+        writer_thread.start()
+        assert not written.wait(timeout=0.05)
+
+    assert not written.wait(timeout=0.05)
+    release_reader.set()
+    reader_thread.join(timeout=1)
+    writer_thread.join(timeout=1)
+    assert written.is_set()
+
+
+def test_lock_is_reentrant_and_refuses_upgrades() -> None:
+    """Nested acquisitions succeed, upgrading a read lock does not"""
+    lock = ReadWriteLock()
+    with lock.write():
+        with lock.write(), lock.read():
+            pass
+
+    with lock.read(), lock.read():
+        with raises(RuntimeError):
+            lock.acquire_write()
@@ -0,0 +1,24 @@
+from typing import Annotated
+
+from pydantic import Field
+
+from pydantic_storage._utils import type_adapter
+from pydantic_storage.models import FileData
+from tests.mocks.models import FakeUser
+
+# =================
+# Type Adapter Test
+# =================
+
+
+def test_adapters_are_reused() -> None:
+    """The same annotation always yields the same adapter"""
+    assert type_adapter(int) is type_adapter(int)
+    assert type_adapter(FileData[FakeUser]) is type_adapter(FileData[FakeUser])
+    assert type_adapter(int | None) is type_adapter(int | None)
+
+
+def test_unhashable_annotations_still_validate() -> None:
+    """Annotations that cannot be cached get a fresh adapter"""
+    annotation = Annotated[list[int], Field(min_length=1), {"unhashable": []}]
+    assert type_adapter(annotation).validate_python(["1"]) == [1]